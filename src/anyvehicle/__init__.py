@@ -66,6 +66,12 @@ if bInBlenderContext is True:
             from . import anim
         # endif
 
+        if "av_index" in locals():
+            importlib.reload(av_index)
+        else:
+            from . import av_index
+        # endif
+
         if "av_ui_vehicle" in locals():
             importlib.reload(av_ui_vehicle)
         else:
@@ -100,6 +106,7 @@ if bInBlenderContext is True:
 # Register function
 def register():
     try:
+        av_index.register()
         av_ui_vehicle.register()
         av_props_vehicle_2w.register()
         av_props_vehicle_4w.register()
@@ -121,6 +128,7 @@ def unregister():
     av_props_vehicle_2w.unregister()
     av_props_vehicle_4w.unregister()
     av_ui_vehicle.unregister()
+    av_index.unregister()
 
 
 # enddef
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \annotation.py
+# Created Date: Tuesday, October 20th 2026, 2:41:09 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Generation of oriented 3D bounding box labels of vehicles from
+# their evaluated trajectories, without playing back the scene.
+
+import os
+import json
+import numpy as np
+
+# Corners of the unit cube about the origin
+aUnitBoxCorners = np.array([[x, y, z] for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)])
+
+
+###############################################################################
+def NormalizeRows(_aA):
+
+    aLen = np.linalg.norm(_aA, axis=1)[:, np.newaxis]
+    return np.divide(_aA, aLen, out=np.zeros_like(_aA), where=aLen > 0.0)
+
+
+# enddef
+
+
+###############################################################################
+# Returns the center and size of the box in the frame of the fixed axis
+# center object, which contains the bounding boxes of all meshes in its
+# hierarchy, or None, if there are no meshes.
+def GetRigExtents(_objFAC):
+
+    mWorldToFAC = np.array(_objFAC.matrix_world.inverted())
+
+    lCorners = []
+    for objX in _objFAC.children_recursive:
+        if objX.type != "MESH":
+            continue
+        # endif
+
+        mX = mWorldToFAC @ np.array(objX.matrix_world)
+        aBox = np.array([tuple(x) for x in objX.bound_box])
+        lCorners.append(aBox @ mX[0:3, 0:3].T + mX[0:3, 3])
+    # endfor
+
+    if len(lCorners) == 0:
+        return None
+    # endif
+
+    aCorners = np.concatenate(lCorners)
+    aMin = aCorners.min(axis=0)
+    aMax = aCorners.max(axis=0)
+
+    return (0.5 * (aMin + aMax), aMax - aMin)
+
+
+# enddef
+
+
+###############################################################################
+# Returns the world space corners of the oriented boxes as (M, 8, 3) array,
+# for the (M, 4, 4) world matrices of the fixed axis center.
+def GetBoxCorners(_aWorldMatrix, _tExtents):
+
+    aCenter, aSize = _tExtents
+    aLocal = aUnitBoxCorners * aSize + aCenter
+
+    aRot = _aWorldMatrix[:, 0:3, 0:3]
+    aPos = _aWorldMatrix[:, 0:3, 3]
+    return np.einsum("mij,kj->mki", aRot, aLocal) + aPos[:, np.newaxis, :]
+
+
+# enddef
+
+
+###############################################################################
+# Returns the matrix that projects world coordinates to clip coordinates
+# of the camera object, and the image size in pixels.
+def GetCameraProjection(_objCam, _xScene, _xDepsGraph):
+
+    xRender = _xScene.render
+    dScale = xRender.resolution_percentage / 100.0
+    iWidth = int(xRender.resolution_x * dScale)
+    iHeight = int(xRender.resolution_y * dScale)
+
+    mProj = _objCam.calc_matrix_camera(
+        _xDepsGraph, x=iWidth, y=iHeight, scale_x=xRender.pixel_aspect_x, scale_y=xRender.pixel_aspect_y
+    )
+    mProj = np.array(mProj) @ np.array(_objCam.matrix_world.inverted())
+
+    return mProj, (iWidth, iHeight)
+
+
+# enddef
+
+
+###############################################################################
+# Projects box corners into an image. The projection is either a single
+# (4, 4) matrix or one matrix per box as (M, 4, 4) array. Returns the
+# (M, 4) array of 2D boxes (x min, y min, x max, y max) in pixels with the
+# origin at the top left, clipped to the image, and a boolean array that
+# is true for boxes that are in front of the camera and overlap the image.
+def ProjectBoxes(_aCorners, _aProj, _tImageSize):
+
+    iWidth, iHeight = _tImageSize
+    aCornersH = np.concatenate([_aCorners, np.ones(_aCorners.shape[0:2] + (1,))], axis=2)
+    if _aProj.ndim == 2:
+        aClip = aCornersH @ _aProj.T
+    else:
+        aClip = np.einsum("mij,mkj->mki", _aProj, aCornersH)
+    # endif
+
+    aW = aClip[:, :, 3]
+    aInFront = np.all(aW > 1e-6, axis=1)
+    aW = np.where(aW > 1e-6, aW, 1.0)
+
+    aX = (aClip[:, :, 0] / aW + 1.0) * 0.5 * iWidth
+    aY = (1.0 - aClip[:, :, 1] / aW) * 0.5 * iHeight
+
+    aBox2d = np.stack(
+        [
+            np.clip(aX.min(axis=1), 0, iWidth),
+            np.clip(aY.min(axis=1), 0, iHeight),
+            np.clip(aX.max(axis=1), 0, iWidth),
+            np.clip(aY.max(axis=1), 0, iHeight),
+        ],
+        axis=1,
+    )
+    aVisible = aInFront & (aBox2d[:, 2] > aBox2d[:, 0]) & (aBox2d[:, 3] > aBox2d[:, 1])
+
+    return aBox2d, aVisible
+
+
+# enddef
+
+
+###############################################################################
+# Writes one JSON label file per frame with the oriented 3D boxes of
+# all vehicles, and optionally their 2D boxes in a number of cameras.
+#   _lVehicles: list of tuples (vehicle name, vehicle model)
+#   _lFrames: frame range as (first frame, last frame)
+#   _dFps: frames per second used to convert frames to model time
+#   dicCameras: dictionary of tuples (projection, image size) by camera name,
+#       where the projection is a (4, 4) matrix or a (frames, 4, 4) array.
+# Returns the number of label files written.
+def WriteBoxLabels(_sPath, _lVehicles, _lFrames, _dFps, *, dicCameras=None):
+
+    iFrameFirst, iFrameLast = int(_lFrames[0]), int(_lFrames[1])
+    aFrames = np.arange(iFrameFirst, iFrameLast + 1)
+    aTimes = aFrames / _dFps
+
+    if dicCameras is None:
+        dicCameras = {}
+    # endif
+
+    # Evaluate the boxes of each vehicle for all frames at once
+    lBoxes = []
+    for sName, xModel in _lVehicles:
+        tExtents = GetRigExtents(xModel.objFAC)
+        if tExtents is None:
+            continue
+        # endif
+
+        aWorldMatrix = xModel.GetWorldMatrices(xModel.EvaluatePoses(aTimes))
+        aCorners = GetBoxCorners(aWorldMatrix, tExtents)
+        aRot = aWorldMatrix[:, 0:3, 0:3]
+
+        dicBox = {
+            "sName": sName,
+            "aCenter": aCorners.mean(axis=1),
+            "aSize": tExtents[1],
+            "aRotation": aRot.reshape(-1, 9),
+            "aYaw": np.arctan2(aRot[:, 1, 0], aRot[:, 0, 0]),
+            "dicCameras": {},
+        }
+
+        for sCam, (aProj, tImageSize) in dicCameras.items():
+            dicBox["dicCameras"][sCam] = ProjectBoxes(aCorners, np.asarray(aProj, dtype=np.float64), tImageSize)
+        # endfor
+
+        lBoxes.append(dicBox)
+    # endfor
+
+    os.makedirs(_sPath, exist_ok=True)
+
+    for iIdx, iFrame in enumerate(aFrames):
+        lLabels = []
+        for dicBox in lBoxes:
+            dicLabel = {
+                "sName": dicBox["sName"],
+                "lCenter": np.round(dicBox["aCenter"][iIdx], 4).tolist(),
+                "lSize": np.round(dicBox["aSize"], 4).tolist(),
+                "lRotation": np.round(dicBox["aRotation"][iIdx], 6).tolist(),
+                "fYaw": round(float(dicBox["aYaw"][iIdx]), 6),
+            }
+
+            dicLabelCams = {}
+            for sCam, (aBox2d, aVisible) in dicBox["dicCameras"].items():
+                if aVisible[iIdx]:
+                    dicLabelCams[sCam] = np.round(aBox2d[iIdx], 2).tolist()
+                # endif
+            # endfor
+            if len(dicLabelCams) > 0:
+                dicLabel["dicBox2d"] = dicLabelCams
+            # endif
+
+            lLabels.append(dicLabel)
+        # endfor
+
+        sFile = os.path.join(_sPath, "Frame_{0:04d}.json".format(iFrame))
+        with open(sFile, "w") as xFile:
+            json.dump({"iFrame": int(iFrame), "lVehicles": lLabels}, xFile, separators=(",", ":"))
+        # endwith
+    # endfor
+
+    return len(aFrames)
+
+
+# enddef
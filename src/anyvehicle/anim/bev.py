@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \bev.py
+# Created Date: Tuesday, October 20th 2026, 4:27:55 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Rasterization of vehicle footprints into bird's-eye-view occupancy
+# and velocity grids, from the evaluated vehicle trajectories.
+#
+# A grid covers the extent (x min, y min, x max, y max) in world
+# coordinates. Row i of a grid is at y = y max - (i + 0.5) * cell size,
+# and column j at x = x min + (j + 0.5) * cell size.
+
+import os
+import json
+import math
+import numpy as np
+
+from . import annotation
+
+
+###############################################################################
+# Returns the footprints of a vehicle for all times as arrays of the
+# world positions (M, 2) of the footprint center, the unit axes (M, 2)
+# of the footprint in world coordinates, the velocity vectors (M, 2),
+# and the half size (2,) of the footprint.
+def GetFootprints(_xModel, _aTimes, _tExtents):
+
+    dicPoses = _xModel.EvaluatePoses(_aTimes)
+    aWorldMatrix = _xModel.GetWorldMatrices(dicPoses)
+
+    aCenter, aSize = _tExtents
+    aPos = aWorldMatrix[:, 0:3, 0:3] @ aCenter + aWorldMatrix[:, 0:3, 3]
+
+    aAxisX = annotation.NormalizeRows(aWorldMatrix[:, 0:2, 0])
+    aAxisY = annotation.NormalizeRows(aWorldMatrix[:, 0:2, 1])
+    aVel = aAxisX * dicPoses["aSpeed"][:, np.newaxis]
+
+    return aPos[:, 0:2], aAxisX, aAxisY, aVel, 0.5 * aSize[0:2]
+
+
+# enddef
+
+
+###############################################################################
+# Rasterizes a single footprint into the occupancy and velocity grids
+# of a frame, by testing the cell centers within its bounding box.
+def _RasterizeFootprint(_aOcc, _aVel, _tExtent, _dCellSize, _aPos, _aAxisX, _aAxisY, _aVelVec, _aHalf):
+
+    dMinX, dMinY, dMaxX, dMaxY = _tExtent
+    iRows, iCols = _aOcc.shape
+
+    dRadX = abs(_aAxisX[0]) * _aHalf[0] + abs(_aAxisY[0]) * _aHalf[1]
+    dRadY = abs(_aAxisX[1]) * _aHalf[0] + abs(_aAxisY[1]) * _aHalf[1]
+
+    iCol0 = max(0, int(math.floor((_aPos[0] - dRadX - dMinX) / _dCellSize)))
+    iCol1 = min(iCols, int(math.ceil((_aPos[0] + dRadX - dMinX) / _dCellSize)))
+    iRow0 = max(0, int(math.floor((dMaxY - _aPos[1] - dRadY) / _dCellSize)))
+    iRow1 = min(iRows, int(math.ceil((dMaxY - _aPos[1] + dRadY) / _dCellSize)))
+    if iCol0 >= iCol1 or iRow0 >= iRow1:
+        return
+    # endif
+
+    aDx = dMinX + (np.arange(iCol0, iCol1) + 0.5) * _dCellSize - _aPos[0]
+    aDy = dMaxY - (np.arange(iRow0, iRow1) + 0.5) * _dCellSize - _aPos[1]
+    aDx = aDx[np.newaxis, :]
+    aDy = aDy[:, np.newaxis]
+
+    aU = aDx * _aAxisX[0] + aDy * _aAxisX[1]
+    aV = aDx * _aAxisY[0] + aDy * _aAxisY[1]
+    aMask = (np.abs(aU) <= _aHalf[0]) & (np.abs(aV) <= _aHalf[1])
+
+    _aOcc[iRow0:iRow1, iCol0:iCol1] |= aMask
+    _aVel[iRow0:iRow1, iCol0:iCol1][aMask] = _aVelVec
+
+
+# enddef
+
+
+###############################################################################
+# Returns the extent of the positions of all vehicles over all times,
+# enlarged by a margin.
+def GetTrackExtent(_lVehicles, _aTimes, _dMargin):
+
+    aMin = np.full(2, np.inf)
+    aMax = np.full(2, -np.inf)
+    for sName, xModel in _lVehicles:
+        dicPoses = xModel.EvaluatePoses(_aTimes)
+        aPos = xModel.GetWorldMatrices(dicPoses)[:, 0:2, 3]
+        aMin = np.minimum(aMin, aPos.min(axis=0))
+        aMax = np.maximum(aMax, aPos.max(axis=0))
+    # endfor
+
+    if not np.all(np.isfinite(aMin)):
+        raise Exception("No vehicle tracks available to derive the BEV extent.")
+    # endif
+
+    return (float(aMin[0] - _dMargin), float(aMin[1] - _dMargin), float(aMax[0] + _dMargin), float(aMax[1] + _dMargin))
+
+
+# enddef
+
+
+###############################################################################
+# Writes the BEV occupancy and velocity grids of all frames to the folder
+# _sPath as numpy files, which are written frame by frame through memory
+# maps:
+#   Occupancy.npy: (frames, rows, cols) uint8 array
+#   Velocity.npy: (frames, rows, cols, 2) float32 array of velocities in m/s
+#   Bev.json: the frame range, extent and cell size
+#   _lVehicles: list of tuples (vehicle name, vehicle model)
+#   _lFrames: frame range as (first frame, last frame)
+#   _dFps: frames per second used to convert frames to model time
+#   _tExtent: grid extent (x min, y min, x max, y max) in world coordinates
+#   _dCellSize: size of a grid cell in meters
+# Returns the shape of the occupancy grids.
+def WriteBevRasters(_sPath, _lVehicles, _lFrames, _dFps, _tExtent, _dCellSize):
+
+    iFrameFirst, iFrameLast = int(_lFrames[0]), int(_lFrames[1])
+    aTimes = np.arange(iFrameFirst, iFrameLast + 1) / _dFps
+
+    dMinX, dMinY, dMaxX, dMaxY = _tExtent
+    iCols = int(math.ceil((dMaxX - dMinX) / _dCellSize))
+    iRows = int(math.ceil((dMaxY - dMinY) / _dCellSize))
+    if iCols <= 0 or iRows <= 0:
+        raise Exception("Invalid BEV raster extent.")
+    # endif
+
+    # Evaluate the footprints of each vehicle for all frames at once
+    lFootprints = []
+    for sName, xModel in _lVehicles:
+        tExtents = annotation.GetRigExtents(xModel.objFAC)
+        if tExtents is not None:
+            lFootprints.append(GetFootprints(xModel, aTimes, tExtents))
+        # endif
+    # endfor
+
+    os.makedirs(_sPath, exist_ok=True)
+
+    tShape = (len(aTimes), iRows, iCols)
+    aOccAll = np.lib.format.open_memmap(os.path.join(_sPath, "Occupancy.npy"), mode="w+", dtype=np.uint8, shape=tShape)
+    aVelAll = np.lib.format.open_memmap(
+        os.path.join(_sPath, "Velocity.npy"), mode="w+", dtype=np.float32, shape=tShape + (2,)
+    )
+
+    # Rasterize frame by frame into buffers, which are then written to disk
+    aOcc = np.zeros((iRows, iCols), dtype=bool)
+    aVel = np.zeros((iRows, iCols, 2), dtype=np.float32)
+    for iIdx in range(len(aTimes)):
+        aOcc[:] = False
+        aVel[:] = 0.0
+        for aPos, aAxisX, aAxisY, aVelVec, aHalf in lFootprints:
+            _RasterizeFootprint(
+                aOcc, aVel, _tExtent, _dCellSize, aPos[iIdx], aAxisX[iIdx], aAxisY[iIdx], aVelVec[iIdx], aHalf
+            )
+        # endfor
+        aOccAll[iIdx] = aOcc
+        aVelAll[iIdx] = aVel
+    # endfor
+
+    aOccAll.flush()
+    aVelAll.flush()
+    del aOccAll, aVelAll
+
+    with open(os.path.join(_sPath, "Bev.json"), "w") as xFile:
+        json.dump(
+            {"iFrameFirst": iFrameFirst, "iFrameLast": iFrameLast, "lExtent": list(_tExtent), "fCellSize": _dCellSize},
+            xFile,
+            indent=4,
+        )
+    # endwith
+
+    return tShape
+
+
+# enddef
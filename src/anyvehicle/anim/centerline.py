@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \centerline.py
+# Created Date: Wednesday, October 21st 2026, 6:24:05 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Evaluated path curves, which are shared by all vehicles driving along the
+# same curve. Each curve is tessellated once per resolution. Vehicles with a
+# lateral offset follow the offset curve of the shared centerline, e.g. to
+# drive in different lanes of a road, which is also evaluated only once per
+# offset. The curves are kept in the curve's local frame.
+
+import bpy
+import hashlib
+import numpy as np
+
+from . import offset_curve
+
+# Tables of the evaluated curves by curve name, as tuples of the curve hash,
+# the centerline tables and the dictionary of offset curves.
+dicCenterlines = {}
+
+
+# Modifier properties that only change the user interface
+setModifierUiProps = {"show_expanded", "is_active", "is_override_data_local", "use_pin_to_last"}
+
+
+###############################################################################
+# Adds the value of a modifier property or input to a hash. Referenced
+# objects are hashed by name and world matrix, other data blocks by name.
+def _UpdateValueHash(_xHash, _xValue):
+
+    if isinstance(_xValue, bpy.types.Object):
+        _xHash.update(_xValue.name.encode("utf-8"))
+        _xHash.update(np.array(_xValue.matrix_world, dtype=np.float64).tobytes())
+    elif isinstance(_xValue, bpy.types.ID):
+        _xHash.update(_xValue.name.encode("utf-8"))
+    elif isinstance(_xValue, (bool, int, float)):
+        _xHash.update(np.float64(_xValue).tobytes())
+    elif isinstance(_xValue, (str, set)) or _xValue is None:
+        _xHash.update(str(sorted(_xValue) if isinstance(_xValue, set) else _xValue).encode("utf-8"))
+    else:
+        try:
+            _xHash.update(np.asarray(_xValue, dtype=np.float64).tobytes())
+        except Exception:
+            _xHash.update(str(_xValue).encode("utf-8"))
+        # endtry
+    # endif
+
+
+# enddef
+
+
+###############################################################################
+# Adds the parameters of a curve's modifier stack to a hash, including the
+# inputs of geometry node modifiers. Changes of the geometry of referenced
+# objects are not detected, only changes of their world matrices.
+def UpdateModifierHash(_xHash, _xCurve):
+
+    for xModifier in _xCurve.modifiers:
+        for xProp in xModifier.bl_rna.properties:
+            sId = xProp.identifier
+            if xProp.is_readonly or xProp.type == "COLLECTION" or sId in setModifierUiProps:
+                continue
+            # endif
+
+            _xHash.update(sId.encode("utf-8"))
+            _UpdateValueHash(_xHash, getattr(xModifier, sId))
+        # endfor
+
+        for sKey in xModifier.keys():
+            xValue = xModifier[sKey]
+            if hasattr(xValue, "to_list"):
+                xValue = xValue.to_list()
+            elif hasattr(xValue, "to_dict"):
+                xValue = str(xValue.to_dict())
+            # endif
+
+            _xHash.update(sKey.encode("utf-8"))
+            _UpdateValueHash(_xHash, xValue)
+        # endfor
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+# Adds the curve's control points, its modifier stack and the resolution to a hash
+def UpdateCurveHash(_xHash, _xCurve, _iResolution):
+
+    _xHash.update(np.int64(_iResolution).tobytes())
+
+    for xSpline in _xCurve.data.splines:
+        aCo = np.empty(len(xSpline.points) * 4, dtype=np.float32)
+        xSpline.points.foreach_get("co", aCo)
+        _xHash.update(aCo.tobytes())
+        _xHash.update(
+            np.array(
+                [xSpline.order_u, xSpline.use_endpoint_u, xSpline.use_cyclic_u, xSpline.use_bezier_u], dtype=np.int64
+            ).tobytes()
+        )
+    # endfor
+
+    UpdateModifierHash(_xHash, _xCurve)
+
+
+# enddef
+
+
+###############################################################################
+# Removes the evaluated tables of a curve, e.g. after its geometry changed.
+def InvalidateCurve(_sCurve):
+    dicCenterlines.pop(_sCurve, None)
+
+
+# enddef
+
+
+###############################################################################
+def ClearCenterlines():
+    dicCenterlines.clear()
+
+
+# enddef
+
+
+###############################################################################
+# Returns the centerline tables of a curve at the given resolution.
+# The curve is only converted to a mesh, if its tables are not cached.
+# The curve's resolution must already be set. The tables are shared,
+# so they are read-only.
+def GetCenterline(_xCurve, _iResolution, _aUp):
+
+    xHash = hashlib.sha1()
+    UpdateCurveHash(xHash, _xCurve, _iResolution)
+    xHash.update(np.asarray(_aUp, dtype=np.float64).tobytes())
+    sHash = xHash.hexdigest()
+
+    tCache = dicCenterlines.get(_xCurve.name)
+    if tCache is not None and tCache[0] == sHash:
+        return tCache[1]
+    # endif
+
+    # we need to transform the curve to a mesh with all modifiers applied
+    xDepsGraph = bpy.context.evaluated_depsgraph_get()
+    xCurveEval = _xCurve.evaluated_get(xDepsGraph)
+    meshCurve = xCurveEval.to_mesh()
+
+    # IMPORTANT: the vertex data becomes invalid after the call "to_mesh_clear()",
+    # so it is copied to an array first.
+    # Do not apply world matrix of curve at this point, because
+    # the following calculations assume that the curve is in XY-plane,
+    # with Z-axis pointing up.
+    aCo = np.empty(len(meshCurve.vertices) * 3, dtype=np.float32)
+    meshCurve.vertices.foreach_get("co", aCo)
+    xCurveEval.to_mesh_clear()
+
+    aPos = aCo.reshape(-1, 3).astype(np.float64)
+    if len(aPos) >= 3:
+        dicCenterline = offset_curve.EvalCenterlineTables(aPos, _aUp)
+    else:
+        dicCenterline = {"aPos": aPos}
+    # endif
+
+    for aTable in dicCenterline.values():
+        aTable.flags.writeable = False
+    # endfor
+
+    dicCenterlines[_xCurve.name] = (sHash, dicCenterline, {})
+
+    return dicCenterline
+
+
+# enddef
+
+
+###############################################################################
+# Returns the (N, 3) points of a curve at a lateral offset, see offset_curve.
+# EvalOffsetCurve(). The offset curves are cached with the centerline.
+def GetOffsetCurve(_xCurve, _iResolution, _aUp, _dOffset):
+
+    dicCenterline = GetCenterline(_xCurve, _iResolution, _aUp)
+    if _dOffset == 0.0 or "aNormal" not in dicCenterline:
+        return dicCenterline["aPos"]
+    # endif
+
+    dicOffsetCurves = dicCenterlines[_xCurve.name][2]
+    dOffset = float(_dOffset)
+    aPos = dicOffsetCurves.get(dOffset)
+    if aPos is None:
+        aPos = offset_curve.EvalOffsetCurve(dicCenterline, dOffset)
+        aPos.flags.writeable = False
+        dicOffsetCurves[dOffset] = aPos
+    # endif
+
+    return aPos
+
+
+# enddef
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \clearance.py
+# Created Date: Tuesday, October 20th 2026, 6:03:44 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Clearance check of vehicle tracks against the static geometry of a scene.
+# The meshes of a collection are combined in a BVH tree, which is cached
+# until the objects of the collection change. The box of the vehicle body
+# and the contact points of the wheels are tested along the track samples
+# with ray casts against the tree.
+
+import hashlib
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+from . import annotation
+
+# BVH trees of collections and objects as (geometry key, BVH tuple)
+dicBvhCache = {}
+
+# Evaluated meshes in world coordinates by object name, as tuples of the
+# world matrix, the geometry key, the vertices and the triangles.
+dicMeshCache = {}
+
+
+###############################################################################
+def ClearBvhCache():
+    dicBvhCache.clear()
+    dicMeshCache.clear()
+
+
+# enddef
+
+
+###############################################################################
+# Removes the cached meshes of objects, whose geometry changed. Has to be
+# called for geometry updates reported by the depsgraph, e.g. edited
+# vertices or modifiers, since these do not change the world matrix.
+def InvalidateGeometry(_lNames):
+    for sName in _lNames:
+        dicMeshCache.pop(sName, None)
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+# Returns the mesh objects of a collection and its children,
+# apart from the excluded objects.
+def _GetMeshObjects(_clnX, _setExclude):
+
+    return [objX for objX in _clnX.all_objects if objX.type == "MESH" and objX.name not in _setExclude]
+
+
+# enddef
+
+
+###############################################################################
+# Returns the evaluated mesh of an object, with all modifiers applied,
+# as tuple of a key of its geometry, the (V, 3) vertices in world
+# coordinates and the (T, 3) vertex indices of its triangles.
+# The key is a hash of the vertex coordinates and triangles, so that it
+# changes whenever the object is moved or its evaluated mesh changes.
+# The mesh is only evaluated again, if the object moved or its cached
+# mesh was removed by InvalidateGeometry(). The arrays are read-only.
+def GetWorldMesh(_objX, _xDepsGraph):
+
+    objEval = _objX.evaluated_get(_xDepsGraph)
+    mWorld = np.array(objEval.matrix_world, dtype=np.float64)
+
+    tCache = dicMeshCache.get(_objX.name)
+    if tCache is not None and np.array_equal(tCache[0], mWorld):
+        return tCache[1:]
+    # endif
+
+    meshX = objEval.to_mesh()
+    try:
+        meshX.calc_loop_triangles()
+
+        aVex = np.empty(len(meshX.vertices) * 3, dtype=np.float64)
+        meshX.vertices.foreach_get("co", aVex)
+        aVex = aVex.reshape(-1, 3)
+
+        aTri = np.empty(len(meshX.loop_triangles) * 3, dtype=np.int64)
+        meshX.loop_triangles.foreach_get("vertices", aTri)
+        aTri = aTri.reshape(-1, 3)
+    finally:
+        objEval.to_mesh_clear()
+    # endtry
+
+    aVex = aVex @ mWorld[0:3, 0:3].T + mWorld[0:3, 3]
+    aVex.flags.writeable = False
+    aTri.flags.writeable = False
+
+    xHash = hashlib.sha1()
+    xHash.update(_objX.name.encode("utf-8"))
+    xHash.update(aVex.tobytes())
+    xHash.update(aTri.tobytes())
+    sKey = xHash.hexdigest()
+
+    dicMeshCache[_objX.name] = (mWorld, sKey, aVex, aTri)
+    return sKey, aVex, aTri
+
+
+# enddef
+
+
+###############################################################################
+# Returns a key that changes, when the objects are exchanged, moved,
+# or their evaluated meshes change. See GetWorldMesh().
+def GetGeometryKey(_lObjects, _xDepsGraph):
+
+    xHash = hashlib.sha1()
+    for objX in _lObjects:
+        xHash.update(GetWorldMesh(objX, _xDepsGraph)[0].encode("utf-8"))
+    # endfor
+
+    return xHash.hexdigest()
+
+
+# enddef
+
+
+###############################################################################
+# Returns the BVH tree of the evaluated meshes of the objects in world
+# coordinates, the array of object indices per triangle and the list of
+# object names. Returns None, if there are no triangles. The tree is only
+# built again, if the objects changed since it was cached under the key.
+def _GetCachedBvh(_xCacheKey, _lObjects, _xDepsGraph):
+
+    sKey = GetGeometryKey(_lObjects, _xDepsGraph)
+
+    tCache = dicBvhCache.get(_xCacheKey)
+    if tCache is not None and tCache[0] == sKey:
+        return tCache[1]
+    # endif
+
+    lVertices = []
+    lTriangles = []
+    lTriObjects = []
+    iVexOffset = 0
+    for iObj, objX in enumerate(_lObjects):
+        aVex, aTri = GetWorldMesh(objX, _xDepsGraph)[1:]
+        lVertices.append(aVex)
+        lTriangles.append(aTri + iVexOffset)
+        lTriObjects.append(np.full(len(aTri), iObj, dtype=np.int64))
+        iVexOffset += len(aVex)
+    # endfor
+
+    if iVexOffset == 0:
+        tBvh = None
+    else:
+        xTree = BVHTree.FromPolygons(
+            np.concatenate(lVertices).tolist(), np.concatenate(lTriangles).tolist(), all_triangles=True
+        )
+        tBvh = (xTree, np.concatenate(lTriObjects), [x.name for x in _lObjects])
+    # endif
+
+    dicBvhCache[_xCacheKey] = (sKey, tBvh)
+    return tBvh
+
+
+# enddef
+
+
+###############################################################################
+# Returns the cached BVH tree of the mesh objects of a collection,
+# apart from the excluded objects. See _GetCachedBvh().
+def GetCollectionBvh(_clnX, _xDepsGraph, *, setExclude=None):
+
+    lObjects = _GetMeshObjects(_clnX, setExclude or set())
+    return _GetCachedBvh(("Collection", _clnX.name), lObjects, _xDepsGraph)
+
+
+# enddef
+
+
+###############################################################################
+# Returns the cached BVH tree of a single mesh object. See _GetCachedBvh().
+def GetObjectBvh(_objX, _xDepsGraph):
+
+    return _GetCachedBvh(("Object", _objX.name), [_objX], _xDepsGraph)
+
+
+# enddef
+
+
+###############################################################################
+# Transforms (..., 3) points by a (4, 4) matrix
+def _Transform(_mX, _aPos):
+
+    return _aPos @ _mX[0:3, 0:3].T + _mX[0:3, 3]
+
+
+# enddef
+
+
+###############################################################################
+# Casts rays from the start to the end points and returns, for each ray
+# that hits the tree, the tuple (ray index, object name, hit location).
+def _CastRays(_tBvh, _aStart, _aEnd):
+
+    xTree, aTriObjects, lNames = _tBvh
+
+    aDir = _aEnd - _aStart
+    aDist = np.linalg.norm(aDir, axis=1)
+
+    lHits = []
+    for iRay, (tStart, tDir, dDist) in enumerate(zip(_aStart.tolist(), aDir.tolist(), aDist.tolist())):
+        if dDist <= 0.0:
+            continue
+        # endif
+
+        vHit, vNormal, iTri, dHitDist = xTree.ray_cast(tStart, tDir, dDist)
+        if vHit is not None:
+            lHits.append((iRay, lNames[aTriObjects[iTri]], tuple(vHit)))
+        # endif
+    # endfor
+
+    return lHits
+
+
+# enddef
+
+
+###############################################################################
+# Merges the hits of consecutive track samples with the same part and
+# object to spans. The hits are tuples (part, object, sample index, location).
+def _MergeHits(_lHits, _aLen, _aTimes):
+
+    dicSpans = {}
+    for sPart, sObject, iIdx, tLoc in sorted(_lHits, key=lambda x: x[0:3]):
+        lSpans = dicSpans.setdefault((sPart, sObject), [])
+        if len(lSpans) > 0 and iIdx - lSpans[-1]["iLastIdx"] <= 1:
+            lSpans[-1]["iLastIdx"] = iIdx
+        else:
+            lSpans.append({"iFirstIdx": iIdx, "iLastIdx": iIdx, "tLocation": tLoc})
+        # endif
+    # endfor
+
+    lResult = []
+    for (sPart, sObject), lSpans in dicSpans.items():
+        for dicSpan in lSpans:
+            iFirst = dicSpan["iFirstIdx"]
+            iLast = dicSpan["iLastIdx"]
+            lResult.append(
+                {
+                    "sPart": sPart,
+                    "sObject": sObject,
+                    "lArcLen": [float(_aLen[iFirst]), float(_aLen[iLast])],
+                    "lTime": [float(_aTimes[iFirst]), float(_aTimes[iLast])],
+                    "tLocation": dicSpan["tLocation"],
+                }
+            )
+        # endfor
+    # endfor
+
+    return sorted(lResult, key=lambda x: x["lArcLen"][0])
+
+
+# enddef
+
+
+###############################################################################
+# Tests the track of a vehicle model against the BVH tree of the static scene.
+#   _tBvh: result of GetCollectionBvh()
+#   dGroundClearance: distance above the ground, below which the body box
+#       and the wheel contact points are not tested, so that the road
+#       surface does not count as obstacle.
+#   iRayCount: number of rays per side of the body box
+# The body box is tested with rays along its length and width at each
+# track sample. The wheel contact points are tested with rays between
+# consecutive track samples. Only samples that have static geometry near
+# the vehicle are tested with rays.
+# For vehicles following a terrain, the body box and the wheel contact
+# points are lifted onto the terrain, but the pitch and bank of the body
+# box are not considered.
+# Returns a list of collision spans, sorted by arc length. Each span is a
+# dictionary with the part ("Body" or the wheel name), the name of the hit
+# object, the arc length and time intervals along the track and the
+# location of the first hit.
+def CheckTrackClearance(_xModel, _tBvh, *, tExtents=None, dGroundClearance=0.05, iRayCount=5):
+
+    if _tBvh is None:
+        return []
+    # endif
+
+    if tExtents is None:
+        tExtents = annotation.GetRigExtents(_xModel.objFAC)
+    # endif
+
+    mCurve = np.array(_xModel.GetCurveMatrix())
+    aZ = _xModel.aZ
+
+    iCnt = len(_xModel.aFAC_Pos) - 2
+    aPos = _xModel.aFAC_Pos[:iCnt]
+    aX = annotation.NormalizeRows(_xModel.aFAC_Deriv[:iCnt])
+    aY = np.cross(aZ, aX)
+    aLen = _xModel.aFAC_Len[:iCnt]
+    if _xModel.bTerrain:
+        aPos = aPos + _xModel.aTerrainHeight[:, np.newaxis] * aZ
+    # endif
+    aTimes = _xModel.GetTrackSampleTimes()
+
+    lHits = []
+
+    # Wheel contact points, for a single track model
+    # the points below the fixed and steering axis centers.
+    dicWheelPos = _xModel.dicTrack["dicWheelPos"]
+    if len(dicWheelPos) == 0:
+        dicWheelPos = {"FAC": aPos, "SAC": _xModel.aSAC_Pos}
+    # endif
+
+    dicGroundLift = _xModel.dicTrack.get("dicGroundLift", {})
+    dDown = _xModel.dWheelRadius - dGroundClearance
+    for sWheel, aWheelPos in dicWheelPos.items():
+        aContact = aWheelPos - dDown * aZ
+        if sWheel in dicGroundLift:
+            aContact = aContact + dicGroundLift[sWheel][:, np.newaxis] * aZ
+        # endif
+        aContact = _Transform(mCurve, aContact)
+        for iRay, sObject, tLoc in _CastRays(_tBvh, aContact[:-1], aContact[1:]):
+            lHits.append((sWheel, sObject, iRay, tLoc))
+        # endfor
+    # endfor
+
+    if tExtents is not None:
+        aCenter, aSize = tExtents
+        aHalf = 0.5 * aSize
+        dBottom = max(aCenter[2] - aHalf[2], -dDown)
+        dTop = aCenter[2] + aHalf[2]
+
+        # Ray end points in the frame of the fixed axis center,
+        # along the length and along the width of the box.
+        aS = np.linspace(-1.0, 1.0, iRayCount)
+        aH = np.linspace(dBottom, dTop, max(2, iRayCount // 2))
+        lStart = []
+        lEnd = []
+        for dH in aH:
+            for dS in aS:
+                dY = aCenter[1] + dS * aHalf[1]
+                lStart.append((aCenter[0] - aHalf[0], dY, dH))
+                lEnd.append((aCenter[0] + aHalf[0], dY, dH))
+                dX = aCenter[0] + dS * aHalf[0]
+                lStart.append((dX, aCenter[1] - aHalf[1], dH))
+                lEnd.append((dX, aCenter[1] + aHalf[1], dH))
+            # endfor
+        # endfor
+        aLocal = np.array(lStart + lEnd)
+
+        # Positions of the ray end points at all samples as (samples, rays, 3)
+        aRayPos = (
+            aPos[:, np.newaxis, :]
+            + aX[:, np.newaxis, :] * aLocal[:, 0][np.newaxis, :, np.newaxis]
+            + aY[:, np.newaxis, :] * aLocal[:, 1][np.newaxis, :, np.newaxis]
+            + aZ * aLocal[:, 2][np.newaxis, :, np.newaxis]
+        )
+        aRayPos = _Transform(mCurve, aRayPos)
+        iRays = len(lStart)
+
+        # Only test samples with geometry within the sphere about the box
+        aBoxCenter = _Transform(mCurve, aPos + aX * aCenter[0] + aY * aCenter[1] + aZ * aCenter[2])
+        dScale = float(np.max(np.linalg.norm(mCurve[0:3, 0:3], axis=0)))
+        dRadius = dScale * float(np.linalg.norm(aHalf))
+        xTree = _tBvh[0]
+        for iIdx, tCenter in enumerate(aBoxCenter.tolist()):
+            if xTree.find_nearest(tCenter, dRadius)[0] is None:
+                continue
+            # endif
+
+            aSamplePos = aRayPos[iIdx]
+            for iRay, sObject, tLoc in _CastRays(_tBvh, aSamplePos[:iRays], aSamplePos[iRays:]):
+                lHits.append(("Body", sObject, iIdx, tLoc))
+            # endfor
+        # endfor
+    # endif
+
+    return _MergeHits(lHits, aLen, aTimes)
+
+
+# enddef
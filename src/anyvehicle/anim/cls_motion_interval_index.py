@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_motion_interval_index.py
+# Created Date: Tuesday, October 20th 2026, 9:14:52 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import numpy as np
+
+
+####################################################################
+# Index of the time intervals in which vehicles move along their paths.
+# Before and after its interval, a vehicle is parked at the start or end
+# of its path, so it only needs to be set once.
+class CMotionIntervalIndex:
+
+    # States of a vehicle relative to its motion interval
+    iStateBefore = -1
+    iStateMoving = 0
+    iStateAfter = 1
+    iStateUnknown = 2
+
+    #############################################################
+    def __init__(self):
+        self.Clear()
+
+    # enddef
+
+    #############################################################
+    def Clear(self):
+        self.lNames = []
+        self.aStart = np.zeros(0)
+        self.aEnd = np.zeros(0)
+        self.aState = np.zeros(0, dtype=np.int8)
+
+    # enddef
+
+    #############################################################
+    # Builds the index from a dictionary of models by name.
+    # Only models with an evaluated track are added.
+    def Build(self, _dicModels):
+
+        lNames = []
+        lIntervals = []
+        for sName, xModel in _dicModels.items():
+            if not xModel.IsTrackAvailable():
+                continue
+            # endif
+            lNames.append(sName)
+            lIntervals.append(xModel.GetMotionInterval())
+        # endfor
+
+        self.lNames = lNames
+        aIntervals = np.array(lIntervals, dtype=np.float64).reshape(-1, 2)
+        self.aStart = aIntervals[:, 0]
+        self.aEnd = aIntervals[:, 1]
+        self.aState = np.full(len(lNames), self.iStateUnknown, dtype=np.int8)
+
+    # enddef
+
+    #############################################################
+    # Returns the names of the vehicles moving at time dT, of the vehicles
+    # that started moving and of the vehicles that got parked since the
+    # last call. Only moving and newly parked vehicles need to be set.
+    def Update(self, dT):
+
+        aState = np.where(
+            dT < self.aStart, self.iStateBefore, np.where(dT > self.aEnd, self.iStateAfter, self.iStateMoving)
+        ).astype(np.int8)
+
+        aChanged = aState != self.aState
+        aMoving = aState == self.iStateMoving
+        self.aState = aState
+
+        lMoving = [self.lNames[i] for i in np.flatnonzero(aMoving)]
+        lStarted = [self.lNames[i] for i in np.flatnonzero(aMoving & aChanged)]
+        lParked = [self.lNames[i] for i in np.flatnonzero(~aMoving & aChanged)]
+
+        return lMoving, lStarted, lParked
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_planar_diff_drive_model.py
+# Created Date: Wednesday, October 21st 2026, 5:08:31 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import math
+import numpy as np
+
+from . import track
+from .cls_planar_single_track_model import CPlanarSingleTrackModel
+
+
+####################################################################
+# Model of vehicles with differential drive, like tracked vehicles and
+# skid-steer loaders, which do not steer, but turn by driving their left
+# and right side at different speeds. The vehicle center moves along the
+# path with the vehicle heading along the path direction, so that the
+# speeds of the sides follow from the path curvature.
+#
+# The track objects are children of the vehicle center object at the
+# centers of the left and right track or wheel sides. The optional spin
+# objects of each side, e.g. sprockets, road wheels or the wheels of a
+# skid-steer loader, spin with the distance driven by their side. The
+# optional scroll objects are moved along their x-axis by the distance
+# driven by their side, modulo the track loop length, if it is not zero.
+# They can serve as texture coordinate objects of the track materials.
+class CPlanarDiffDriveModel(CPlanarSingleTrackModel):
+
+    # Layout of the pose records
+    lPoseChannels = [
+        "FAC.Pos.x",
+        "FAC.Pos.y",
+        "FAC.Pos.z",
+        "FAC.Dir.x",
+        "FAC.Dir.y",
+        "FAC.Dir.z",
+        "TL.Spin",
+        "TR.Spin",
+        "TL.Scroll",
+        "TR.Scroll",
+        "Rot.Pos.x",
+        "Rot.Pos.y",
+        "Rot.Pos.z",
+        "FAC.Bank",
+    ]
+
+    lSides = ["TL", "TR"]
+
+    #############################################################
+    def __init__(
+        self,
+        *,
+        NurbsCurve,
+        VectorUp,
+        Speed_kmh,
+        WheelRadius,
+        FixedAxisOrigObj,
+        TrackLeftObj,
+        TrackRightObj,
+        LeftSpinObjs=None,
+        RightSpinObjs=None,
+        LeftScrollObj=None,
+        RightScrollObj=None,
+        ContactLength=None,
+        TrackLoopLength=0.0,
+        RotOrigObj=None,
+        TerrainObj=None,
+        LateralOffset=0.0,
+        TimeOffset=0.0,
+        PoseCacheSize=256
+    ):
+
+        # The vehicle has no steering axis, so the steering axis center
+        # coincides with the vehicle center.
+        super().__init__(
+            NurbsCurve=NurbsCurve,
+            VectorUp=VectorUp,
+            Speed_kmh=Speed_kmh,
+            WheelRadius=WheelRadius,
+            FixedAxisOrigObj=FixedAxisOrigObj,
+            SteerAxisOrigObj=FixedAxisOrigObj,
+            RotOrigObj=RotOrigObj,
+            TerrainObj=TerrainObj,
+            LateralOffset=LateralOffset,
+            TimeOffset=TimeOffset,
+            PoseCacheSize=PoseCacheSize,
+        )
+
+        self.objTL = TrackLeftObj
+        self.objTR = TrackRightObj
+        self.lTL_Spin = LeftSpinObjs if LeftSpinObjs is not None else []
+        self.lTR_Spin = RightSpinObjs if RightSpinObjs is not None else []
+        self.objTL_Scroll = LeftScrollObj
+        self.objTR_Scroll = RightScrollObj
+
+        # Length of the ground contact of the sides, which defaults to
+        # the distance between the sides.
+        self.dContactLength = ContactLength
+        self.dTrackLoopLength = TrackLoopLength
+
+        self.aSideLen = None
+        self.aSideRatio = None
+
+    # enddef
+
+    #############################################################
+    def _GetWheelOffsets(self):
+
+        return {"TL": tuple(self.objTL.matrix_local.translation), "TR": tuple(self.objTR.matrix_local.translation)}
+
+    # enddef
+
+    #############################################################
+    # The terrain is sampled at the front and back ends of both sides
+    def _GetTerrainContactOffsets(self, _dAxisSep):
+
+        dicOffsets = self._GetWheelOffsets()
+        dContactLength = self.dContactLength
+        if dContactLength is None:
+            dContactLength = abs(dicOffsets["TL"][1] - dicOffsets["TR"][1])
+        # endif
+        dHalf = 0.5 * dContactLength
+
+        return {
+            "{0}{1}".format(sSide, sEnd): (tOffset[0] + dX, tOffset[1], tOffset[2])
+            for sSide, tOffset in dicOffsets.items()
+            for sEnd, dX in (("F", dHalf), ("B", -dHalf))
+        }
+
+    # enddef
+
+    #############################################################
+    def _GetRigTrackObjects(self):
+        return [self.objTL, self.objTR]
+
+    # enddef
+
+    #############################################################
+    def ApplyTrack(self, _dicTrack):
+
+        super().ApplyTrack(_dicTrack)
+
+        # (2, N-2) tables of the distances driven by the sides
+        # and the ratios of their speeds to the vehicle speed
+        dicSides = track.EvalSideLengths(self.aFAC_Len, self.aFAC_CurvSigned, _dicTrack["dicWheelOffsets"])
+        self.aSideLen = np.stack([dicSides[x][0] for x in self.lSides])
+        self.aSideRatio = np.stack([dicSides[x][1] for x in self.lSides])
+        self.lSideLen = self.aSideLen.tolist()
+
+    # enddef
+
+    #############################################################
+    def _GetScroll(self, _dLen):
+
+        if self.dTrackLoopLength > 0.0:
+            return math.fmod(_dLen, self.dTrackLoopLength)
+        # endif
+
+        return _dLen
+
+    # enddef
+
+    #############################################################
+    def EvalPose(self, dT):
+
+        iPntIdx1, iPntIdx2, dFac2, dTimeDelta = self._GetCurvePos(dT)
+
+        tFAC_Pos = self._Lerp3(self.lFAC_Pos, iPntIdx1, iPntIdx2, dFac2)
+        tFAC_Deriv = self._Lerp3(self.lFAC_Deriv, iPntIdx1, iPntIdx2, dFac2)
+
+        dTL_Len = self._Lerp(self.lSideLen[0], iPntIdx1, iPntIdx2, dFac2)
+        dTR_Len = self._Lerp(self.lSideLen[1], iPntIdx1, iPntIdx2, dFac2)
+
+        tX = self._Normalize3(tFAC_Deriv)
+        tY = self._CrossUp(tX)
+
+        tRC_Pos = self._GetRotCenter(iPntIdx1, iPntIdx2, dFac2, tFAC_Pos)
+        if tRC_Pos is None:
+            tRC_Pos = (10000.0 * tY[0], 10000.0 * tY[1], 10000.0 * tY[2])
+        # endif
+
+        tFAC_Pos, tFAC_Dir, dBank = self._GetTerrainPose(iPntIdx1, iPntIdx2, dFac2, tFAC_Pos, tX)
+
+        return (
+            *tFAC_Pos,
+            *tFAC_Dir,
+            dTL_Len / self.dWheelRadius,
+            dTR_Len / self.dWheelRadius,
+            self._GetScroll(dTL_Len),
+            self._GetScroll(dTR_Len),
+            *tRC_Pos,
+            dBank,
+        )
+
+    # enddef
+
+    #############################################################
+    # Adds the elements "dicSideSpeed" and "dicScroll" with the speeds
+    # and the scroll offsets of the sides by side id "TL" or "TR".
+    # The speed of the inner side is negative, if it turns backwards.
+    def _EvaluateWheelPoses(self, _dicPoses, _aIdx1, _aIdx2, _aFac2, _aVel, _aCurv):
+
+        aFac1 = 1.0 - _aFac2
+        aLen = self.aSideLen[:, _aIdx1] * aFac1 + self.aSideLen[:, _aIdx2] * _aFac2
+        aRatio = self.aSideRatio[:, _aIdx1] * aFac1 + self.aSideRatio[:, _aIdx2] * _aFac2
+        if self.dTrackLoopLength > 0.0:
+            aScroll = np.fmod(aLen, self.dTrackLoopLength)
+        else:
+            aScroll = aLen
+        # endif
+
+        _dicPoses["dicSpin"] = dict(zip(self.lSides, aLen / self.dWheelRadius))
+        _dicPoses["dicScroll"] = dict(zip(self.lSides, aScroll))
+        _dicPoses["dicSideSpeed"] = dict(zip(self.lSides, aRatio * _dicPoses["aSpeed"]))
+
+    # enddef
+
+    #############################################################
+    def _GetPoseRecordColumns(self, _dicPoses):
+
+        aFAC_Pos = _dicPoses["aFAC_Pos"]
+        aFAC_Dir = _dicPoses["aFAC_Dir"]
+        aRC_Pos = _dicPoses["aRC_Pos"]
+        dicSpin = _dicPoses["dicSpin"]
+        dicScroll = _dicPoses["dicScroll"]
+
+        return [
+            *aFAC_Pos.T,
+            *aFAC_Dir.T,
+            dicSpin["TL"],
+            dicSpin["TR"],
+            dicScroll["TL"],
+            dicScroll["TR"],
+            *aRC_Pos.T,
+            _dicPoses["aBank"],
+        ]
+
+    # enddef
+
+    #############################################################
+    def ApplyPose(self, _tPose):
+
+        self.ApplyRootPose(_tPose)
+
+        for objSpin in self.lTL_Spin:
+            objSpin.rotation_euler = (0.0, _tPose[6], 0.0)
+        # endfor
+        for objSpin in self.lTR_Spin:
+            objSpin.rotation_euler = (0.0, _tPose[7], 0.0)
+        # endfor
+
+        if self.objTL_Scroll is not None:
+            self.objTL_Scroll.location[0] = _tPose[8]
+        # endif
+        if self.objTR_Scroll is not None:
+            self.objTR_Scroll.location[0] = _tPose[9]
+        # endif
+
+        if self.objRot is not None:
+            self.objRot.location = _tPose[10:13]
+        # endif
+
+    # enddef
+
+
+# endclass
@@ -26,14 +26,32 @@
 # </LICENSE>
 ###
 
-import copy
-import bpy
 import math
-import mathutils
-import anyblend
+import numpy as np
+
+from .cls_planar_single_track_model import CPlanarSingleTrackModel
+
 
 ####################################################################
-class CPlanarSingleTrack2wModel:
+class CPlanarSingleTrack2wModel(CPlanarSingleTrackModel):
+
+    # Layout of the pose records
+    lPoseChannels = [
+        "FAC.Pos.x",
+        "FAC.Pos.y",
+        "FAC.Pos.z",
+        "FAC.Dir.x",
+        "FAC.Dir.y",
+        "FAC.Dir.z",
+        "Steer",
+        "FAS.Spin",
+        "SATS.Spin",
+        "FAR.Roll",
+        "Rot.Pos.x",
+        "Rot.Pos.y",
+        "Rot.Pos.z",
+        "FAC.Bank",
+    ]
 
     #############################################################
     def __init__(
@@ -50,340 +68,131 @@ class CPlanarSingleTrack2wModel:
         SteerAxisTiltObj,
         SteerAxisOrientObj,
         SteerAxisSpinObj,
-        RotOrigObj=None
+        RotOrigObj=None,
+        TerrainObj=None,
+        LateralOffset=0.0,
+        TimeOffset=0.0,
+        PoseCacheSize=256
     ):
 
-        self.xCurve = NurbsCurve
-        self.vZ = VectorUp
-        self.dWheelRadius = WheelRadius
-        self.dSpeed_ms = 0.0
-        self.SetSpeed_kmh(Speed_kmh)
+        super().__init__(
+            NurbsCurve=NurbsCurve,
+            VectorUp=VectorUp,
+            Speed_kmh=Speed_kmh,
+            WheelRadius=WheelRadius,
+            FixedAxisOrigObj=FixedAxisOrigObj,
+            SteerAxisOrigObj=SteerAxisOrigObj,
+            RotOrigObj=RotOrigObj,
+            TerrainObj=TerrainObj,
+            LateralOffset=LateralOffset,
+            TimeOffset=TimeOffset,
+            PoseCacheSize=PoseCacheSize,
+        )
 
-        self.objFAC = FixedAxisOrigObj
         self.objFAR = FixedAxisRollObj
         self.objFAS = FixedAxisSpinObj
 
-        self.objSAC = SteerAxisOrigObj
         self.objSAT = SteerAxisTiltObj
         self.objSATO = SteerAxisOrientObj
         self.objSATS = SteerAxisSpinObj
 
-        self.objRot = RotOrigObj
-
-        self.bTrackDataAvailable = False
-
-        self.dAxisSep = None
-        self.dCurveTimeStep = None
-        self.dCurveTimeTotal = None
-
-        self.lFAC_Pos = None
-        self.dFAC_LenTotal = None
-        self.lFAC_Len = None
-        self.lFAC_Deriv2 = None
-        self.lFAC_Curv = None
-        self.lFAC_CurvN = None
-
-        self.lSAC_Pos = None
-
-        self.lRC_Pos = None
-
     # enddef
 
     #############################################################
-    def IsTrackAvailable(self):
-        return self.bTrackDataAvailable
+    def EvalPose(self, dT):
 
-    # enddef
+        iPntIdx1, iPntIdx2, dFac2, dTimeDelta = self._GetCurvePos(dT)
 
-    #############################################################
-    def SetSpeed_mps(self, dSpeed_ms):
-        self.dSpeed_ms = dSpeed_ms
+        tFAC_Pos = self._Lerp3(self.lFAC_Pos, iPntIdx1, iPntIdx2, dFac2)
+        tFAC_Deriv = self._Lerp3(self.lFAC_Deriv, iPntIdx1, iPntIdx2, dFac2)
 
-    # enddef
-
-    #############################################################
-    def SetSpeed_kmh(self, dSpeed_kmh):
-        self.dSpeed_ms = dSpeed_kmh / 3.6
+        dFAC_Len = self._Lerp(self.lFAC_Len, iPntIdx1, iPntIdx2, dFac2)
+        dFAC_SpinAngle_rad = dFAC_Len / self.dWheelRadius
 
-    # enddef
+        dSAC_Len = self._Lerp(self.lSAC_Len, iPntIdx1, iPntIdx2, dFac2)
+        dSAC_SpinAngle_rad = dSAC_Len / self.dWheelRadius
 
-    #############################################################
-    def EvalTrack(self, *, Resolution):
+        dFAC_Curv = self._Lerp(self.lFAC_CurvSigned, iPntIdx1, iPntIdx2, dFac2)
+        dFAC_Deriv_Len = math.sqrt(
+            tFAC_Deriv[0] * tFAC_Deriv[0] + tFAC_Deriv[1] * tFAC_Deriv[1] + tFAC_Deriv[2] * tFAC_Deriv[2]
+        )
+        dFAC_Vel = dFAC_Deriv_Len / dTimeDelta
+        dFAC_Roll_rad = -math.atan(dFAC_Vel * dFAC_Vel * dFAC_Curv / 9.81)
 
-        vFAC = self.objFAC.matrix_world.translation
+        tX = self._Normalize3(tFAC_Deriv)
+        tY = self._CrossUp(tX)
 
-        self.dAxisSep = (self.objSAC.matrix_world.translation - vFAC).length
+        dSteerAngle_rad = self._EvalSteerAngle(iPntIdx1, iPntIdx2, dFac2, tX, tY, tFAC_Pos)
 
-        if self.xCurve.data.splines[0].type != "NURBS":
-            raise Exception(
-                "Expect a 'NURBS' type curve for the vehicle planar single track model."
-            )
+        tRC_Pos = self._GetRotCenter(iPntIdx1, iPntIdx2, dFac2, tFAC_Pos)
+        if tRC_Pos is None:
+            tRC_Pos = (10000.0 * tY[0], 10000.0 * tY[1], 10000.0 * tY[2])
         # endif
 
-        self.xCurve.data.resolution_u = Resolution
-        self.xCurve.data.render_resolution_u = 0
-
-        # we need to transform the curve to a mesh with all modifiers applied
-        xDepsGraph = bpy.context.evaluated_depsgraph_get()
-        xCurveEval = self.xCurve.evaluated_get(xDepsGraph)
-        meshCurve = xCurveEval.to_mesh()
-
-        # IMPORTANT: the "x.co" elements are stored in a list by reference,
-        # and thus become invalid after the call "to_mesh_clear()".
-        # Do not apply world matrix of curve at this point, because
-        # the following calculations assume that the curve is in XY-plane,
-        # with Z-axis pointing up.
-        self.lFAC_Pos = [x.co.copy() for x in meshCurve.vertices]
-        xCurveEval.to_mesh_clear()
-
-        # print(len(lPnts))
-        # print(lPnts[0])
-
-        # Evaluate length of curve traced by fixed axis origin
-        # and calculate the derivative of the curve
-        iPntCnt = len(self.lFAC_Pos)
-
-        self.dCurveTimeStep = 1
-        self.dCurveTimeTotal = (iPntCnt - 1) * self.dCurveTimeStep
-        self.dFAC_LenTotal = 0.0
-
-        self.lFAC_Deriv = []
-        self.lFAC_Len = [0.0]
-        for iPntIdx in range(iPntCnt - 1):
-            vD = self.lFAC_Pos[iPntIdx + 1] - self.lFAC_Pos[iPntIdx]
-            self.dFAC_LenTotal += vD.length
-            self.lFAC_Len.append(self.dFAC_LenTotal)
-            self.lFAC_Deriv.append(vD / self.dCurveTimeStep)
-        # endfor
-
-        # Calculate the curve's second derivative and curvature
-        self.lFAC_Deriv2 = []
-        self.lFAC_Curv = []
-        self.lFAC_CurvN = []
-
-        for iPntIdx in range(iPntCnt - 2):
-            vD = self.lFAC_Deriv[iPntIdx]
-            vD2 = (self.lFAC_Deriv[iPntIdx + 1] - vD) / self.dCurveTimeStep
-            self.lFAC_Deriv2.append(vD2)
-
-            # Curvature
-            vA = vD.cross(vD2)
-            dDl = vD.length
-            dC = vA.length / (dDl * dDl * dDl)
-            self.lFAC_Curv.append(dC)
-
-            if dC < 1e-8:
-                vN = None
-            else:
-                vN = vA.normalized()
-            # endif
-            self.lFAC_CurvN.append(vN)
-        # endfor
-
-        # Create world matrices for front and back
-        self.lSAC_Pos = []
-        self.dSAC_LenTotal = 0.0
-        self.lSAC_Len = [0.0]
-
-        self.lRC_Pos = []
-
-        for iPntIdx in range(iPntCnt - 2):
-            vD = self.lFAC_Deriv[iPntIdx]
-            # print("vD: {0}".format(vD))
-
-            vFAC_Pos = self.lFAC_Pos[iPntIdx]
-            # print("vPnt: {0}".format(vPnt))
-
-            vX = vD.normalized()
-            vY = self.vZ.cross(vX)
-            mWorld = mathutils.Matrix([vX, vY, self.vZ, vFAC_Pos])
-            mWorld = mWorld.to_4x4()
-            mWorld.transpose()
-
-            vSAC_Pos = vFAC_Pos + self.dAxisSep * vX
-            self.lSAC_Pos.append(vSAC_Pos)
-
-            if iPntIdx > 0:
-                self.dSAC_LenTotal += (vSAC_Pos - self.lSAC_Pos[iPntIdx - 1]).length
-                self.lSAC_Len.append(self.dSAC_LenTotal)
-            # endif
-
-            # Eval rotation center
-            dC = self.lFAC_Curv[iPntIdx]
-            if dC > 1e-8:
-                vN = self.lFAC_CurvN[iPntIdx]
-                vR = vN.cross(vX)
-                dR = 1.0 / dC
-                vRot = dR * vR + vFAC_Pos
-                self.lRC_Pos.append(vRot)
-            else:
-                self.lRC_Pos.append(None)
-            # endif
-        # endfor
+        tFAC_Pos, tFAC_Dir, dBank = self._GetTerrainPose(iPntIdx1, iPntIdx2, dFac2, tFAC_Pos, tX)
+
+        return (
+            *tFAC_Pos,
+            *tFAC_Dir,
+            dSteerAngle_rad,
+            float(dFAC_SpinAngle_rad),
+            float(dSAC_SpinAngle_rad),
+            float(dFAC_Roll_rad),
+            *tRC_Pos,
+            dBank,
+        )
 
     # enddef
 
     #############################################################
-    def _GetSteerDir(self, _iIdx, _vY, _vSAC_Pos):
+    def _EvaluateWheelPoses(self, _dicPoses, _aIdx1, _aIdx2, _aFac2, _aVel, _aCurv):
 
-        vSteer = _vY
-        vRC_Pos = self.lRC_Pos[_iIdx]
+        aFAC_Len = self._LerpArray(self.aFAC_Len, _aIdx1, _aIdx2, _aFac2)
+        aSAC_Len = self._LerpArray(self.aSAC_Len, _aIdx1, _aIdx2, _aFac2)
 
-        if vRC_Pos is not None:
-            vN = self.lFAC_CurvN[_iIdx]
-            vSteer = (vRC_Pos - _vSAC_Pos).normalized()
-            if vN.dot(self.vZ) < 0.0:
-                vSteer = -vSteer
-            # endif
-        # endif
-
-        return vSteer
+        _dicPoses["dicSpin"] = {"FAS": aFAC_Len / self.dWheelRadius, "SATS": aSAC_Len / self.dWheelRadius}
+        _dicPoses["aRoll"] = -np.arctan(_aVel * _aVel * _aCurv / 9.81)
 
     # enddef
 
     #############################################################
-    def _SetMatrixLocal(self, _objX, _vX, _vY, _vZ, _mWorldInv, _dSpinAngle_rad):
-
-        dC = math.cos(_dSpinAngle_rad)
-        dS = math.sin(_dSpinAngle_rad)
-
-        mB = mathutils.Matrix([dC * _vX - dS * _vZ, _vY, dC * _vZ + dS * _vX])
-        mB.transpose()
-        mC = _mWorldInv @ mB
-        mD = mC.to_4x4()
-        mD[0][3] = _objX.location[0]
-        mD[1][3] = _objX.location[1]
-        mD[2][3] = _objX.location[2]
-        _objX.matrix_local = mD
+    def _GetPoseRecordColumns(self, _dicPoses):
+
+        aFAC_Pos = _dicPoses["aFAC_Pos"]
+        aFAC_Dir = _dicPoses["aFAC_Dir"]
+        aRC_Pos = _dicPoses["aRC_Pos"]
+        dicSpin = _dicPoses["dicSpin"]
+
+        return [
+            *aFAC_Pos.T,
+            *aFAC_Dir.T,
+            _dicPoses["aSteer"],
+            dicSpin["FAS"],
+            dicSpin["SATS"],
+            _dicPoses["aRoll"],
+            *aRC_Pos.T,
+            _dicPoses["aBank"],
+        ]
 
     # enddef
 
     #############################################################
-    def SetObjectToTime(self, dT):
-
-        dTimeForCurve = self.dFAC_LenTotal / self.dSpeed_ms
-        dTimeRatio = self.dCurveTimeTotal / dTimeForCurve
-        dCurveIdx = (dTimeRatio * dT) / self.dCurveTimeStep
-
-        dTimeDelta = self.dCurveTimeStep / dTimeRatio
-
-        iPntIdx1 = int(math.floor(dCurveIdx))
-        iPntIdx2 = iPntIdx1 + 1
-
-        # print("")
-        # print("iIdx1: {0}, iIdx2: {1}, len(pos): {2}, len(deriv): {3}".format(
-        #           iPntIdx1, iPntIdx2, len(self.lFAC_Pos), len(self.lFAC_Deriv)))
-
-        if iPntIdx1 < 0:
-            iPntIdx1 = 0
-            iPntIdx2 = 0
-            dFac2 = 0.0
-        elif iPntIdx1 >= len(self.lFAC_Pos) - 3:
-            iPntIdx1 = len(self.lFAC_Pos) - 3
-            iPntIdx2 = len(self.lFAC_Pos) - 3
-            dFac2 = 0.0
-        else:
-            dFac2 = dCurveIdx - iPntIdx1
-        # endif
+    def ApplyPose(self, _tPose):
 
-        # print("iIdx1: {0}, iIdx2: {1}, len(pos): {2}, len(deriv): {3}".format(
-        #        iPntIdx1, iPntIdx2, len(self.lFAC_Pos), len(self.lFAC_Deriv)))
-        # vFAC_Pos_Orig = self.lFAC_Pos[0]
+        self.ApplyRootPose(_tPose)
 
-        vFAC_Pos = (
-            self.lFAC_Pos[iPntIdx1] * (1.0 - dFac2) + self.lFAC_Pos[iPntIdx2] * dFac2
-        )
-        vFAC_Deriv = (
-            self.lFAC_Deriv[iPntIdx1] * (1.0 - dFac2)
-            + self.lFAC_Deriv[iPntIdx2] * dFac2
-        )
-
-        dFAC_Len = (
-            self.lFAC_Len[iPntIdx1] * (1.0 - dFac2) + self.lFAC_Len[iPntIdx2] * dFac2
-        )
-        dFAC_SpinAngle_rad = dFAC_Len / self.dWheelRadius
-
-        dSAC_Len = (
-            self.lSAC_Len[iPntIdx1] * (1.0 - dFac2) + self.lSAC_Len[iPntIdx2] * dFac2
-        )
-        dSAC_SpinAngle_rad = dSAC_Len / self.dWheelRadius
-
-        dC1 = self.lFAC_Curv[iPntIdx1]
-        if dC1 > 1e-8:
-            vN = self.lFAC_CurvN[iPntIdx1]
-            dC1 *= 1.0 if vN.dot(self.vZ) >= 0 else -1.0
-        # endif
-
-        dC2 = self.lFAC_Curv[iPntIdx2]
-        if dC2 > 1e-8:
-            vN = self.lFAC_CurvN[iPntIdx2]
-            dC2 *= 1.0 if vN.dot(self.vZ) >= 0 else -1.0
-        # endif
-
-        dFAC_Curv = dC1 * (1.0 - dFac2) + dC2 * dFac2
-        dFAC_Vel = vFAC_Deriv.length / dTimeDelta
-        dFAC_Roll_rad = -math.atan(dFAC_Vel * dFAC_Vel * dFAC_Curv / 9.81)
-        # mRoll = mathutils.Matrix.Rotation(dFAC_Roll_rad, 4, 'X')
-
-        vX = vFAC_Deriv.normalized()
-        # vFAC_Z = mathutils.Vector((0.0, -math.sin(dFAC_Roll_rad), math.cos(dFAC_Roll_rad)))
-        # vFAC_Y = vFAC_Z.cross(vX)
-        vY = self.vZ.cross(vX)
-
-        mA = mathutils.Matrix([vX, vY, self.vZ, vFAC_Pos])
-        mA = mA.to_4x4()
-        mA.transpose()
-
-        # Apply the full world matrix
-        self.objFAC.matrix_world = mA
-
-        vSAC_Pos = vFAC_Pos + self.dAxisSep * vX
-
-        vRC_Pos1 = self.lRC_Pos[iPntIdx1]
-        vRC_Pos2 = self.lRC_Pos[iPntIdx2]
-        vRC_Pos = None
-
-        if vRC_Pos1 is not None and vRC_Pos2 is not None:
-            dSign = (vRC_Pos1 - vFAC_Pos).dot(vRC_Pos2 - vFAC_Pos)
-            if dSign > 0.0:
-                vRC_Pos = vRC_Pos1 * (1.0 - dFac2) + vRC_Pos2 * dFac2
-            # endif
-        # endif
-
-        mWorldInv = self.objFAC.matrix_world.to_3x3().inverted()
-
-        vSteer1 = self._GetSteerDir(iPntIdx1, vY, vSAC_Pos)
-        vSteer2 = self._GetSteerDir(iPntIdx2, vY, vSAC_Pos)
-        vSteer = (vSteer1 * (1.0 - dFac2) + vSteer2 * dFac2).normalized()
-        vSAC_X = vSteer.cross(self.vZ)
-
-        self._SetMatrixLocal(self.objSAC, vSAC_X, vSteer, self.vZ, mWorldInv, 0.0)
-
-        dSteerAngle_rad = math.acos(vY.dot(vSteer))
-        dSign = (vY.cross(vSteer)).dot(self.vZ)
-        dSign = 1.0 if dSign >= 0.0 else -1.0
-        dSteerAngle_rad *= dSign
+        dSteerAngle_rad = _tPose[6]
+        self._SetLocalRotation(self.objSAC, dSteerAngle_rad)
 
         self.objSATO.rotation_euler = (0.0, 0.0, dSteerAngle_rad)
-        self.objSATS.rotation_euler = (0.0, dSAC_SpinAngle_rad, 0.0)
-        self.objFAS.rotation_euler = (0.0, dFAC_SpinAngle_rad, 0.0)
-        self.objFAR.rotation_euler = (dFAC_Roll_rad, 0.0, 0.0)
+        self.objSATS.rotation_euler = (0.0, _tPose[8], 0.0)
+        self.objFAS.rotation_euler = (0.0, _tPose[7], 0.0)
+        self.objFAR.rotation_euler = (_tPose[9], 0.0, 0.0)
 
         if self.objRot is not None:
-            if vRC_Pos is not None:
-                self.objRot.location = vRC_Pos
-            else:
-                self.objRot.location = 10000.0 * vY
-            # endif
+            self.objRot.location = _tPose[10:13]
         # endif
 
-        # Apply the world matrix of the curve object
-        # to place vehicle at correct world position.
-        self.objFAC.matrix_world = self.xCurve.matrix_world @ self.objFAC.matrix_world
-
-        # Ensure that location and matrix_world properties are consistent
-        anyblend.viewlayer.Update()
-
     # enddef
 
 
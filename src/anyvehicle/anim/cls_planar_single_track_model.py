@@ -0,0 +1,1330 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_planar_single_track_model.py
+# Created Date: Monday, October 19th 2026, 10:41:52 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import bpy
+import math
+import bisect
+import hashlib
+import mathutils
+import numpy as np
+from collections import OrderedDict
+
+import anyblend
+
+from . import track
+from . import cull
+from . import clearance
+from . import schedule
+from . import centerline
+from .cls_track_point_index import CTrackPointIndex
+
+
+####################################################################
+# Base class of the planar single track models. It implements the
+# evaluation of the track tables, which is split into a snapshot of
+# the Blender data, the evaluation of the tables on plain arrays
+# and applying the tables to the model.
+class CPlanarSingleTrackModel:
+
+    # Incremented whenever the motion interval of any model changes
+    iMotionRevision = 0
+
+    # Layout of the pose records. The base model only places the vehicle
+    # root. The derived models add the channels of their rigs, with the
+    # bank angle as last channel, see ApplyRootPose().
+    lPoseChannels = ["FAC.Pos.x", "FAC.Pos.y", "FAC.Pos.z", "FAC.Dir.x", "FAC.Dir.y", "FAC.Dir.z", "FAC.Bank"]
+
+    #############################################################
+    def __init__(
+        self,
+        *,
+        NurbsCurve,
+        VectorUp,
+        Speed_kmh,
+        WheelRadius,
+        FixedAxisOrigObj,
+        SteerAxisOrigObj,
+        RotOrigObj=None,
+        TerrainObj=None,
+        LateralOffset=0.0,
+        TimeOffset=0.0,
+        PoseCacheSize=256
+    ):
+
+        self.xCurve = NurbsCurve
+        # Offset of the vehicle's path to the left of the curve
+        self.dLateralOffset = LateralOffset
+        self.vZ = VectorUp
+        self.aZ = np.array(VectorUp, dtype=np.float64)
+        self.tZ = tuple(self.aZ.tolist())
+        self.dWheelRadius = WheelRadius
+        # Time at which the vehicle starts moving along the curve
+        self.dTimeOffset = TimeOffset
+        self.dSpeed_ms = Speed_kmh / 3.6
+
+        self.objFAC = FixedAxisOrigObj
+        self.objSAC = SteerAxisOrigObj
+        self.objRot = RotOrigObj
+        # Optional mesh object, whose surface the vehicle follows
+        self.objTerrain = TerrainObj
+
+        self.bTrackDataAvailable = False
+        self.dicTrack = None
+        self.iResolution = None
+        self.tRigSignature = None
+        self.setRigPointers = set()
+        self.sTrackSourceHash = None
+
+        self.dAxisSep = None
+        self.dCurveTimeStep = None
+        self.dCurveTimeTotal = None
+
+        self.aFAC_Pos = None
+        self.aFAC_Deriv = None
+        self.dFAC_LenTotal = None
+        self.aFAC_Len = None
+        self.aFAC_Deriv2 = None
+        self.aFAC_Curv = None
+        self.aFAC_CurvSigned = None
+        self.aFAC_CurvN = None
+
+        self.aSAC_Pos = None
+        self.aSAC_Len = None
+
+        self.aRC_Pos = None
+        self.aRC_Valid = None
+
+        # Arrival constraints or speed profile parameters and the times
+        # at which the track samples are passed, if the vehicle follows
+        # a schedule instead of moving with constant speed.
+        self.lArrivals = []
+        self.dArrivalStartTime = None
+        self.dicSpeedProfile = None
+        self.aSampleTime = None
+        self.lSampleTime = None
+
+        # Error message, if the schedule cannot be met on the current track
+        self.sScheduleError = None
+
+        self.bTerrain = False
+        self.aTerrainHeight = None
+        self.aTerrainPitch = None
+        self.aTerrainBank = None
+
+        # Least recently used cache of evaluated poses by time
+        self.iPoseCacheSize = PoseCacheSize
+        self.xPoseCache = OrderedDict()
+        self.dLastPoseTime = None
+        self.iLastCullLevel = cull.iCullNone
+        self.dCullRadius = None
+
+        # Buffers reused when applying poses, so that setting a pose
+        # does not create temporary mathutils objects.
+        self.mFAC_World = mathutils.Matrix.Identity(4)
+        self.dicLocalRotation = {}
+        self.tCurveMatrix = None
+        self.UpdateCurveMatrix()
+
+    # enddef
+
+    #############################################################
+    def IsTrackAvailable(self):
+        return self.bTrackDataAvailable
+
+    # enddef
+
+    #############################################################
+    # Sets the times at which the vehicle arrives at positions along its
+    # path. Each arrival is a tuple (position, time), where the position
+    # is either the arc length along the track or a world position, which
+    # is mapped to the nearest track point. The vehicle moves with constant
+    # speed between the arrivals, see schedule.SolveArrivalSchedule().
+    # The schedule is solved again whenever the track changes. An empty
+    # list of arrivals returns to moving with constant speed, or with
+    # the speed profile, if one is set. Arrivals take precedence over
+    # the speed profile.
+    def SetArrivals(self, _lArrivals, *, StartTime=None):
+
+        self.lArrivals = list(_lArrivals)
+        self.dArrivalStartTime = StartTime
+
+        self._ScheduleChanged()
+
+    # enddef
+
+    #############################################################
+    # Lets the vehicle follow a speed profile, which starts at the time
+    # offset. The speed is limited by the mean speed of the model, by the
+    # maximal lateral acceleration in curves and by the maximal acceleration
+    # and deceleration, see schedule.EvalSpeedProfile(). Accelerations are
+    # given in m/s^2 and the optional start and end speeds in m/s.
+    # If MaxLateralAcc is None, the vehicle returns to constant speed.
+    def SetSpeedProfile(self, *, MaxLateralAcc, MaxAcc=3.0, MaxDec=6.0, StartSpeed=None, EndSpeed=None):
+
+        if MaxLateralAcc is None:
+            self.dicSpeedProfile = None
+        else:
+            self.dicSpeedProfile = {
+                "dMaxLatAcc": MaxLateralAcc,
+                "dMaxAcc": MaxAcc,
+                "dMaxDec": MaxDec,
+                "dStartSpeed": StartSpeed,
+                "dEndSpeed": EndSpeed,
+            }
+        # endif
+
+        self._ScheduleChanged()
+
+    # enddef
+
+    #############################################################
+    def _ScheduleChanged(self):
+
+        if self.bTrackDataAvailable:
+            self._UpdateSchedule()
+            self.sScheduleError = None
+            self.ClearPoseCache()
+            CPlanarSingleTrackModel.iMotionRevision += 1
+        # endif
+
+    # enddef
+
+    #############################################################
+    def _UpdateSchedule(self):
+
+        aLen = self.aFAC_Len[: len(self.aFAC_Pos) - 2]
+
+        if len(self.lArrivals) == 0:
+            if self.dicSpeedProfile is None:
+                self.aSampleTime = None
+                self.lSampleTime = None
+            else:
+                dicPar = self.dicSpeedProfile
+                aSpeed = schedule.EvalSpeedProfile(
+                    aLen,
+                    self.aFAC_Curv,
+                    self.dSpeed_ms,
+                    dicPar["dMaxLatAcc"],
+                    dicPar["dMaxAcc"],
+                    dicPar["dMaxDec"],
+                    dStartSpeed=dicPar["dStartSpeed"],
+                    dEndSpeed=dicPar["dEndSpeed"],
+                )
+                self.aSampleTime = schedule.GetProfileTimes(aLen, aSpeed, self.dTimeOffset)
+                self.lSampleTime = self.aSampleTime.tolist()
+            # endif
+            return
+        # endif
+
+        lArcLen = [x[0] for x in self.lArrivals]
+        lPosIdx = [i for i, x in enumerate(lArcLen) if not np.isscalar(x)]
+        if len(lPosIdx) > 0:
+            xIndex = CTrackPointIndex(self)
+            aPos = np.array([lArcLen[i] for i in lPosIdx], dtype=np.float64)
+            for iIdx, dArcLen in zip(lPosIdx, xIndex.FindNearest(aPos)["aArcLen"]):
+                lArcLen[iIdx] = dArcLen
+            # endfor
+        # endif
+
+        aKnotLen, aKnotTime = schedule.SolveArrivalSchedule(
+            aLen[-1], lArcLen, [x[1] for x in self.lArrivals], self.dSpeed_ms, dStartTime=self.dArrivalStartTime
+        )
+        self.aSampleTime = schedule.GetScheduleTimes(aKnotLen, aKnotTime, aLen)
+        self.lSampleTime = self.aSampleTime.tolist()
+
+    # enddef
+
+    #############################################################
+    # Returns the error message, if the schedule could not be met on the
+    # last applied track, or None otherwise.
+    def GetScheduleError(self):
+        return self.sScheduleError
+
+    # enddef
+
+    #############################################################
+    def SetSpeed_mps(self, dSpeed_ms):
+        self.dSpeed_ms = dSpeed_ms
+        if self.bTrackDataAvailable:
+            self._UpdateSchedule()
+            self.sScheduleError = None
+        # endif
+        self.ClearPoseCache()
+        CPlanarSingleTrackModel.iMotionRevision += 1
+
+    # enddef
+
+    #############################################################
+    def SetSpeed_kmh(self, dSpeed_kmh):
+        self.SetSpeed_mps(dSpeed_kmh / 3.6)
+
+    # enddef
+
+    #############################################################
+    # Positions of the wheels, whose tracks are evaluated,
+    # in the local frame of the fixed axis center.
+    def _GetWheelOffsets(self):
+        return {}
+
+    # enddef
+
+    #############################################################
+    # Positions of the wheel centers, below which the terrain is sampled,
+    # in the local frame of the fixed axis center.
+    def _GetTerrainContactOffsets(self, _dAxisSep):
+        return {"FAC": (0.0, 0.0, 0.0), "SAC": (_dAxisSep, 0.0, 0.0)}
+
+    # enddef
+
+    #############################################################
+    # Rig objects whose location is used for evaluating the track
+    def _GetRigTrackObjects(self):
+        return [self.objSAC]
+
+    # enddef
+
+    #############################################################
+    # Returns the locations of all rig objects the track depends on.
+    # The model itself only changes the rotations of these objects,
+    # so a changed signature means that the rig has been edited.
+    def GetRigSignature(self):
+        return tuple(tuple(x.location) for x in self._GetRigTrackObjects())
+
+    # enddef
+
+    #############################################################
+    # Records the rig signature the track is evaluated for, together with
+    # the pointers of the rig objects, which stay valid when they are renamed.
+    def _RecordRigSignature(self):
+
+        lObjects = self._GetRigTrackObjects()
+        self.tRigSignature = tuple(tuple(x.location) for x in lObjects)
+        self.setRigPointers = {x.as_pointer() for x in lObjects}
+
+    # enddef
+
+    #############################################################
+    # Returns True, if the rig has been edited since the track was evaluated.
+    # The signature is only read, if one of the rig objects is among the
+    # updated objects, given by the set of their pointers.
+    def IsRigEdited(self, _setUpdated):
+
+        if self.setRigPointers.isdisjoint(_setUpdated):
+            return False
+        # endif
+
+        return self.GetRigSignature() != self.tRigSignature
+
+    # enddef
+
+    #############################################################
+    def _SetCurveResolution(self, _iResolution):
+
+        # Only set the curve resolution if it changes, as each change
+        # triggers a depsgraph update of the curve.
+        if self.xCurve.data.resolution_u != _iResolution:
+            self.xCurve.data.resolution_u = _iResolution
+        # endif
+        if self.xCurve.data.render_resolution_u != 0:
+            self.xCurve.data.render_resolution_u = 0
+        # endif
+
+    # enddef
+
+    #############################################################
+    # Returns a hash of the curve control points, the resolution and
+    # the rig geometry, which together determine the track.
+    # In contrast to the snapshot hash, the curve need not be evaluated.
+    # Curve modifiers are considered by their parameters, see centerline.UpdateModifierHash().
+    def GetTrackSourceHash(self, *, Resolution):
+
+        xHash = hashlib.sha1()
+        centerline.UpdateCurveHash(xHash, self.xCurve, Resolution)
+
+        vFAC = self.objFAC.matrix_world.translation
+        dAxisSep = (self.objSAC.matrix_world.translation - vFAC).length
+        xHash.update(np.float64(dAxisSep).tobytes())
+        if self.dLateralOffset != 0.0:
+            xHash.update(np.float64(self.dLateralOffset).tobytes())
+        # endif
+        xHash.update(np.asarray(self.aZ, dtype=np.float64).tobytes())
+        xHash.update(np.array(self.GetRigSignature(), dtype=np.float64).tobytes())
+
+        dicWheelOffsets = self._GetWheelOffsets()
+        for sWheel in sorted(dicWheelOffsets):
+            xHash.update(sWheel.encode("utf-8"))
+            xHash.update(np.asarray(dicWheelOffsets[sWheel], np.float64).tobytes())
+        # endfor
+
+        if self.objTerrain is not None:
+            xDepsGraph = bpy.context.evaluated_depsgraph_get()
+            xHash.update(clearance.GetGeometryKey([self.objTerrain], xDepsGraph).encode("utf-8"))
+            xHash.update(np.array(self.xCurve.matrix_world, np.float64).tobytes())
+            xHash.update(np.float64(self.dWheelRadius).tobytes())
+        # endif
+
+        return xHash.hexdigest()
+
+    # enddef
+
+    #############################################################
+    # Applies track tables that were evaluated earlier from data with
+    # the given source hash, e.g. tables stored in the Blender file.
+    def RestoreTrack(self, _dicTrack, *, Resolution, SourceHash):
+
+        self.iResolution = Resolution
+        self._RecordRigSignature()
+        self.sTrackSourceHash = SourceHash
+        self._SetCurveResolution(Resolution)
+        self.ApplyTrack(_dicTrack)
+
+    # enddef
+
+    #############################################################
+    # Reads all Blender data needed to evaluate the track.
+    # Must be called from the main thread.
+    def SnapshotTrack(self, *, Resolution):
+
+        vFAC = self.objFAC.matrix_world.translation
+
+        dAxisSep = (self.objSAC.matrix_world.translation - vFAC).length
+
+        if self.xCurve.data.splines[0].type != "NURBS":
+            raise Exception("Expect a 'NURBS' type curve for the vehicle planar single track model.")
+        # endif
+
+        self.iResolution = Resolution
+        self._RecordRigSignature()
+        self.sTrackSourceHash = self.GetTrackSourceHash(Resolution=Resolution)
+        self._SetCurveResolution(Resolution)
+
+        # The tessellated curve is shared with all vehicles on the same curve
+        aFAC_Pos = centerline.GetOffsetCurve(self.xCurve, Resolution, self.aZ, self.dLateralOffset)
+
+        dicSnapshot = {
+            "aFAC_Pos": aFAC_Pos,
+            "dAxisSep": dAxisSep,
+            "aUp": self.aZ,
+            "dicWheelOffsets": self._GetWheelOffsets(),
+        }
+
+        # Only the terrain's evaluated mesh is read here. The ground below
+        # the wheels is sampled together with the evaluation of the tables.
+        if self.objTerrain is not None:
+            xDepsGraph = bpy.context.evaluated_depsgraph_get()
+            dicSnapshot["tGroundMesh"] = clearance.GetWorldMesh(self.objTerrain, xDepsGraph)
+            dicSnapshot["mCurve"] = np.array(self.xCurve.matrix_world, dtype=np.float64)
+            dicSnapshot["dWheelRadius"] = self.dWheelRadius
+            dicSnapshot["dicContactOffsets"] = self._GetTerrainContactOffsets(dAxisSep)
+        # endif
+
+        return dicSnapshot
+
+    # enddef
+
+    #############################################################
+    # Sets the track tables evaluated by track.EvalTrackTables().
+    def ApplyTrack(self, _dicTrack):
+
+        self.dicTrack = _dicTrack
+
+        self.dAxisSep = _dicTrack["dAxisSep"]
+        self.dCurveTimeStep = _dicTrack["dCurveTimeStep"]
+        self.dCurveTimeTotal = _dicTrack["dCurveTimeTotal"]
+
+        self.aFAC_Pos = _dicTrack["aFAC_Pos"]
+        self.aFAC_Deriv = _dicTrack["aFAC_Deriv"]
+        self.dFAC_LenTotal = _dicTrack["dFAC_LenTotal"]
+        self.aFAC_Len = _dicTrack["aFAC_Len"]
+        self.aFAC_Deriv2 = _dicTrack["aFAC_Deriv2"]
+        self.aFAC_Curv = _dicTrack["aFAC_Curv"]
+        self.aFAC_CurvSigned = _dicTrack["aFAC_CurvSigned"]
+        self.aFAC_CurvN = _dicTrack["aFAC_CurvN"]
+
+        self.aSAC_Pos = _dicTrack["aSAC_Pos"]
+        self.aSAC_Len = _dicTrack["aSAC_Len"]
+
+        self.aRC_Pos = _dicTrack["aRC_Pos"]
+        self.aRC_Valid = _dicTrack["aRC_Valid"]
+
+        # Plain lists of the tables used by EvalPose(), since indexing
+        # a numpy array creates a temporary object per element.
+        self.lFAC_Pos = self.aFAC_Pos.tolist()
+        self.lFAC_Deriv = self.aFAC_Deriv.tolist()
+        self.lFAC_Len = self.aFAC_Len.tolist()
+        self.lFAC_CurvSigned = self.aFAC_CurvSigned.tolist()
+        self.lSAC_Len = self.aSAC_Len.tolist()
+        self.lRC_Pos = self.aRC_Pos.tolist()
+        self.lRC_Valid = self.aRC_Valid.tolist()
+
+        # Orientation of the steer direction relative to the rotation center
+        aCurvUp = self.aFAC_CurvN @ self.aZ
+        self.aSteerSign = np.where(aCurvUp < 0.0, -1.0, 1.0)
+        self.lSteerSign = self.aSteerSign.tolist()
+
+        # Optional tables of the vehicle's lift, pitch and bank on a terrain
+        self.bTerrain = "aTerrainHeight" in _dicTrack
+        if self.bTerrain:
+            self.aTerrainHeight = _dicTrack["aTerrainHeight"]
+            self.aTerrainPitch = _dicTrack["aTerrainPitch"]
+            self.aTerrainBank = _dicTrack["aTerrainBank"]
+            self.lTerrainHeight = self.aTerrainHeight.tolist()
+            self.lTerrainPitch = self.aTerrainPitch.tolist()
+            self.lTerrainBank = self.aTerrainBank.tolist()
+        # endif
+
+        # The rig may have changed
+        self.dicLocalRotation.clear()
+
+        self.bTrackDataAvailable = True
+        self.dCullRadius = None
+
+        # The arrival positions may have moved along the new track. If the
+        # schedule cannot be met, the vehicle moves with constant speed and
+        # the error is reported by the caller, see GetScheduleError().
+        try:
+            self._UpdateSchedule()
+            self.sScheduleError = None
+        except Exception as xEx:
+            self.sScheduleError = "Schedule of vehicle on path '{0}' ignored: {1}".format(self.xCurve.name, str(xEx))
+            self.aSampleTime = None
+            self.lSampleTime = None
+        # endtry
+
+        CPlanarSingleTrackModel.iMotionRevision += 1
+        self.ClearPoseCache()
+
+    # enddef
+
+    #############################################################
+    def EvalTrack(self, *, Resolution):
+
+        dicSnapshot = self.SnapshotTrack(Resolution=Resolution)
+        self.ApplyTrack(track.EvalTrackTables(dicSnapshot))
+
+    # enddef
+
+    #############################################################
+    # Returns the indices of the track samples enclosing time dT,
+    # the interpolation factor and the time between two samples.
+    def _GetCurvePos(self, dT):
+
+        if self.lSampleTime is not None:
+            return self._GetScheduledCurvePos(dT)
+        # endif
+
+        dTimeForCurve = self.dFAC_LenTotal / self.dSpeed_ms
+        dTimeRatio = self.dCurveTimeTotal / dTimeForCurve
+        dCurveIdx = (dTimeRatio * (dT - self.dTimeOffset)) / self.dCurveTimeStep
+
+        dTimeDelta = self.dCurveTimeStep / dTimeRatio
+
+        iPntIdx1 = int(math.floor(dCurveIdx))
+        iPntIdx2 = iPntIdx1 + 1
+        iPntIdxMax = len(self.aFAC_Pos) - 3
+
+        if iPntIdx1 < 0:
+            iPntIdx1 = 0
+            iPntIdx2 = 0
+            dFac2 = 0.0
+        elif iPntIdx1 >= iPntIdxMax:
+            iPntIdx1 = iPntIdxMax
+            iPntIdx2 = iPntIdxMax
+            dFac2 = 0.0
+        else:
+            dFac2 = dCurveIdx - iPntIdx1
+        # endif
+
+        return iPntIdx1, iPntIdx2, dFac2, dTimeDelta
+
+    # enddef
+
+    #############################################################
+    # Version of _GetCurvePos() for a vehicle following a schedule
+    def _GetScheduledCurvePos(self, dT):
+
+        lT = self.lSampleTime
+        iPntIdxMax = len(lT) - 1
+
+        if dT <= lT[0]:
+            return 0, 0, 0.0, lT[1] - lT[0]
+        elif dT >= lT[iPntIdxMax]:
+            return iPntIdxMax, iPntIdxMax, 0.0, lT[iPntIdxMax] - lT[iPntIdxMax - 1]
+        # endif
+
+        iPntIdx1 = bisect.bisect_right(lT, dT) - 1
+        dTimeDelta = lT[iPntIdx1 + 1] - lT[iPntIdx1]
+        dFac2 = (dT - lT[iPntIdx1]) / dTimeDelta if dTimeDelta > 0.0 else 0.0
+
+        return iPntIdx1, iPntIdx1 + 1, dFac2, dTimeDelta
+
+    # enddef
+
+    #############################################################
+    # Returns the start and end time of the motion along the curve.
+    # Before and after this interval, the pose of the vehicle is constant.
+    def GetMotionInterval(self):
+
+        if self.lSampleTime is not None:
+            return (self.lSampleTime[0], self.lSampleTime[-1])
+        # endif
+
+        dTimeForCurve = self.dFAC_LenTotal / self.dSpeed_ms
+        dTimeDelta = self.dCurveTimeStep * dTimeForCurve / self.dCurveTimeTotal
+        iPntIdxMax = len(self.aFAC_Pos) - 3
+
+        return (self.dTimeOffset, self.dTimeOffset + iPntIdxMax * dTimeDelta)
+
+    # enddef
+
+    #############################################################
+    # Returns the times at which the fixed axis center passes
+    # the track samples, for all samples with per sample tables.
+    def GetTrackSampleTimes(self):
+
+        if self.aSampleTime is not None:
+            return self.aSampleTime
+        # endif
+
+        dTimeForCurve = self.dFAC_LenTotal / self.dSpeed_ms
+        dTimeDelta = self.dCurveTimeStep * dTimeForCurve / self.dCurveTimeTotal
+
+        return self.dTimeOffset + dTimeDelta * np.arange(len(self.aFAC_Pos) - 2)
+
+    # enddef
+
+    #############################################################
+    # Returns the times at which the fixed axis center arrives at the
+    # given arc lengths along the track.
+    def GetArrivalTimes(self, _aArcLen):
+
+        aLen = self.aFAC_Len[: len(self.aFAC_Pos) - 2]
+        return np.interp(_aArcLen, aLen, self.GetTrackSampleTimes())
+
+    # enddef
+
+    #############################################################
+    # Returns the arc lengths along the track, which the fixed axis
+    # center has reached at the given times.
+    def GetArcLengths(self, _aTimes):
+
+        aLen = self.aFAC_Len[: len(self.aFAC_Pos) - 2]
+        return np.interp(_aTimes, self.GetTrackSampleTimes(), aLen)
+
+    # enddef
+
+    #############################################################
+    @staticmethod
+    def _Lerp(_aTable, _iIdx1, _iIdx2, _dFac2):
+        return _aTable[_iIdx1] * (1.0 - _dFac2) + _aTable[_iIdx2] * _dFac2
+
+    # enddef
+
+    #############################################################
+    # Interpolates 3-vectors of a table given as list of lists.
+    @staticmethod
+    def _Lerp3(_lTable, _iIdx1, _iIdx2, _dFac2):
+
+        tA = _lTable[_iIdx1]
+        tB = _lTable[_iIdx2]
+        dFac1 = 1.0 - _dFac2
+
+        return (tA[0] * dFac1 + tB[0] * _dFac2, tA[1] * dFac1 + tB[1] * _dFac2, tA[2] * dFac1 + tB[2] * _dFac2)
+
+    # enddef
+
+    #############################################################
+    @staticmethod
+    def _Normalize3(_tA):
+
+        dLen = math.sqrt(_tA[0] * _tA[0] + _tA[1] * _tA[1] + _tA[2] * _tA[2])
+        if dLen == 0.0:
+            return (0.0, 0.0, 0.0)
+        # endif
+
+        return (_tA[0] / dLen, _tA[1] / dLen, _tA[2] / dLen)
+
+    # enddef
+
+    #############################################################
+    # Returns the cross product of the up vector with _tA
+    def _CrossUp(self, _tA):
+
+        dZx, dZy, dZz = self.tZ
+        return (dZy * _tA[2] - dZz * _tA[1], dZz * _tA[0] - dZx * _tA[2], dZx * _tA[1] - dZy * _tA[0])
+
+    # enddef
+
+    #############################################################
+    def _GetSteerDir(self, _iIdx, _tY, _tSAC_Pos):
+
+        if not self.lRC_Valid[_iIdx]:
+            return _tY
+        # endif
+
+        tRC_Pos = self.lRC_Pos[_iIdx]
+        tSteer = self._Normalize3((tRC_Pos[0] - _tSAC_Pos[0], tRC_Pos[1] - _tSAC_Pos[1], tRC_Pos[2] - _tSAC_Pos[2]))
+
+        if self.lSteerSign[_iIdx] < 0.0:
+            tSteer = (-tSteer[0], -tSteer[1], -tSteer[2])
+        # endif
+
+        return tSteer
+
+    # enddef
+
+    #############################################################
+    # Returns the interpolated rotation center or None,
+    # if there is no valid rotation center.
+    def _GetRotCenter(self, _iIdx1, _iIdx2, _dFac2, _tFAC_Pos):
+
+        if not (self.lRC_Valid[_iIdx1] and self.lRC_Valid[_iIdx2]):
+            return None
+        # endif
+
+        tRC_Pos1 = self.lRC_Pos[_iIdx1]
+        tRC_Pos2 = self.lRC_Pos[_iIdx2]
+
+        dSign = (
+            (tRC_Pos1[0] - _tFAC_Pos[0]) * (tRC_Pos2[0] - _tFAC_Pos[0])
+            + (tRC_Pos1[1] - _tFAC_Pos[1]) * (tRC_Pos2[1] - _tFAC_Pos[1])
+            + (tRC_Pos1[2] - _tFAC_Pos[2]) * (tRC_Pos2[2] - _tFAC_Pos[2])
+        )
+        if dSign <= 0.0:
+            return None
+        # endif
+
+        return self._Lerp3(self.lRC_Pos, _iIdx1, _iIdx2, _dFac2)
+
+    # enddef
+
+    #############################################################
+    # Evaluates the steering angle about the up vector, relative to the
+    # fixed axis direction.
+    def _EvalSteerAngle(self, _iIdx1, _iIdx2, _dFac2, _tX, _tY, _tFAC_Pos):
+
+        dAxisSep = self.dAxisSep
+        tSAC_Pos = (
+            _tFAC_Pos[0] + dAxisSep * _tX[0],
+            _tFAC_Pos[1] + dAxisSep * _tX[1],
+            _tFAC_Pos[2] + dAxisSep * _tX[2],
+        )
+
+        tSteer1 = self._GetSteerDir(_iIdx1, _tY, tSAC_Pos)
+        tSteer2 = self._GetSteerDir(_iIdx2, _tY, tSAC_Pos)
+        dFac1 = 1.0 - _dFac2
+        tSteer = self._Normalize3(
+            (
+                tSteer1[0] * dFac1 + tSteer2[0] * _dFac2,
+                tSteer1[1] * dFac1 + tSteer2[1] * _dFac2,
+                tSteer1[2] * dFac1 + tSteer2[2] * _dFac2,
+            )
+        )
+
+        dCos = _tY[0] * tSteer[0] + _tY[1] * tSteer[1] + _tY[2] * tSteer[2]
+        dSteerAngle_rad = math.acos(max(-1.0, min(1.0, dCos)))
+
+        # Sign of (vY x vSteer) . vZ
+        dZx, dZy, dZz = self.tZ
+        dSign = (
+            (_tY[1] * tSteer[2] - _tY[2] * tSteer[1]) * dZx
+            + (_tY[2] * tSteer[0] - _tY[0] * tSteer[2]) * dZy
+            + (_tY[0] * tSteer[1] - _tY[1] * tSteer[0]) * dZz
+        )
+        dSign = 1.0 if dSign >= 0.0 else -1.0
+
+        return dSign * dSteerAngle_rad
+
+    # enddef
+
+    #############################################################
+    # Applies the terrain tables to the position and direction of the
+    # fixed axis center. Returns the lifted position, the pitched direction
+    # and the bank angle, which is zero without terrain.
+    def _GetTerrainPose(self, _iIdx1, _iIdx2, _dFac2, _tPos, _tX):
+
+        if not self.bTerrain:
+            return _tPos, _tX, 0.0
+        # endif
+
+        dHeight = self._Lerp(self.lTerrainHeight, _iIdx1, _iIdx2, _dFac2)
+        dPitch = self._Lerp(self.lTerrainPitch, _iIdx1, _iIdx2, _dFac2)
+        dBank = self._Lerp(self.lTerrainBank, _iIdx1, _iIdx2, _dFac2)
+
+        dCos = math.cos(dPitch)
+        dSin = math.sin(dPitch)
+        dZx, dZy, dZz = self.tZ
+
+        return (
+            (_tPos[0] + dHeight * dZx, _tPos[1] + dHeight * dZy, _tPos[2] + dHeight * dZz),
+            (dCos * _tX[0] + dSin * dZx, dCos * _tX[1] + dSin * dZy, dCos * _tX[2] + dSin * dZz),
+            dBank,
+        )
+
+    # enddef
+
+    #############################################################
+    # Sets the local rotation of an object to a rotation about the up axis,
+    # keeping its location.
+    def _SetLocalRotation(self, _objX, _dAngle_rad):
+        self._SetLocalRotationCS(_objX, math.cos(_dAngle_rad), math.sin(_dAngle_rad))
+
+    # enddef
+
+    #############################################################
+    # Same as _SetLocalRotation(), with the cosine and sine of the angle
+    # given. A matrix is kept per object. The location is read each time,
+    # as it may be driven or changed by undo.
+    def _SetLocalRotationCS(self, _objX, _dCos, _dSin):
+
+        mD = self.dicLocalRotation.get(_objX)
+        if mD is None:
+            mD = mathutils.Matrix.Identity(4)
+            self.dicLocalRotation[_objX] = mD
+        # endif
+
+        dLocX, dLocY, dLocZ = _objX.location
+        mD[0] = (_dCos, -_dSin, 0.0, dLocX)
+        mD[1] = (_dSin, _dCos, 0.0, dLocY)
+        mD[2] = (0.0, 0.0, 1.0, dLocZ)
+        _objX.matrix_local = mD
+
+    # enddef
+
+    #############################################################
+    # Reads the world matrix of the curve, which places the vehicle.
+    # The curve may be animated, constrained or parented, so the matrix
+    # is read again whenever poses are applied or transformed to world
+    # coordinates. Returns True, if the matrix changed since the last call.
+    def UpdateCurveMatrix(self):
+
+        tMatrix = tuple(tuple(x) for x in self.xCurve.matrix_world)
+        if tMatrix == self.tCurveMatrix:
+            return False
+        # endif
+
+        self.tCurveMatrix = tMatrix
+        return True
+
+    # enddef
+
+    #############################################################
+    # Returns the current world matrix of the curve as tuple of rows.
+    def GetCurveMatrix(self):
+
+        self.UpdateCurveMatrix()
+        return self.tCurveMatrix
+
+    # enddef
+
+    #############################################################
+    # Transforms a point from curve to world coordinates
+    def _CurveToWorld(self, _tPos):
+
+        return tuple(
+            tRow[0] * _tPos[0] + tRow[1] * _tPos[1] + tRow[2] * _tPos[2] + tRow[3] for tRow in self.tCurveMatrix[0:3]
+        )
+
+    # enddef
+
+    #############################################################
+    # Vectorized version of _GetCurvePos() for an array of times.
+    # Also returns a boolean array, which is true for times within
+    # the motion interval.
+    def _GetCurvePosArray(self, _aT):
+
+        if self.aSampleTime is not None:
+            return self._GetScheduledCurvePosArray(_aT)
+        # endif
+
+        dTimeForCurve = self.dFAC_LenTotal / self.dSpeed_ms
+        dTimeRatio = self.dCurveTimeTotal / dTimeForCurve
+        aCurveIdx = (dTimeRatio * (_aT - self.dTimeOffset)) / self.dCurveTimeStep
+
+        dTimeDelta = self.dCurveTimeStep / dTimeRatio
+
+        iPntIdxMax = len(self.aFAC_Pos) - 3
+        aPntIdx1 = np.floor(aCurveIdx).astype(np.int64)
+        aIsMoving = (aPntIdx1 >= 0) & (aPntIdx1 < iPntIdxMax)
+
+        aFac2 = np.where(aIsMoving, aCurveIdx - aPntIdx1, 0.0)
+        aPntIdx1 = np.clip(aPntIdx1, 0, iPntIdxMax)
+        aPntIdx2 = np.where(aIsMoving, aPntIdx1 + 1, aPntIdx1)
+
+        return aPntIdx1, aPntIdx2, aFac2, dTimeDelta, aIsMoving
+
+    # enddef
+
+    #############################################################
+    # Version of _GetCurvePosArray() for a vehicle following a schedule.
+    # The time between samples is returned per time.
+    def _GetScheduledCurvePosArray(self, _aT):
+
+        aSampleTime = self.aSampleTime
+        iPntIdxMax = len(aSampleTime) - 1
+
+        aIsMoving = (_aT >= aSampleTime[0]) & (_aT < aSampleTime[-1])
+        aPntIdx1 = np.clip(np.searchsorted(aSampleTime, _aT, side="right") - 1, 0, iPntIdxMax - 1)
+        aTimeDelta = aSampleTime[aPntIdx1 + 1] - aSampleTime[aPntIdx1]
+
+        aFac2 = np.divide(
+            _aT - aSampleTime[aPntIdx1], aTimeDelta, out=np.zeros_like(aTimeDelta), where=aTimeDelta > 0.0
+        )
+        aFac2 = np.where(aIsMoving, aFac2, 0.0)
+        aPntIdx1 = np.where(_aT >= aSampleTime[-1], iPntIdxMax, aPntIdx1)
+        aPntIdx2 = np.where(aIsMoving, aPntIdx1 + 1, aPntIdx1)
+
+        return aPntIdx1, aPntIdx2, aFac2, aTimeDelta, aIsMoving
+
+    # enddef
+
+    #############################################################
+    @staticmethod
+    def _LerpArray(_aTable, _aIdx1, _aIdx2, _aFac2):
+
+        aFac2 = _aFac2 if _aTable.ndim == 1 else _aFac2[:, np.newaxis]
+        return _aTable[_aIdx1] * (1.0 - aFac2) + _aTable[_aIdx2] * aFac2
+
+    # enddef
+
+    #############################################################
+    @staticmethod
+    def _NormalizeArray(_aA):
+
+        aLen = np.linalg.norm(_aA, axis=1)[:, np.newaxis]
+        return np.divide(_aA, aLen, out=np.zeros_like(_aA), where=aLen > 0.0)
+
+    # enddef
+
+    #############################################################
+    def _GetSteerDirArray(self, _aIdx, _aY, _aSAC_Pos):
+
+        aSteer = self._NormalizeArray(self.aRC_Pos[_aIdx] - _aSAC_Pos)
+        aSteer *= self.aSteerSign[_aIdx][:, np.newaxis]
+
+        return np.where(self.aRC_Valid[_aIdx][:, np.newaxis], aSteer, _aY)
+
+    # enddef
+
+    #############################################################
+    # Vectorized version of _EvalSteerAngle()
+    def _EvalSteerAngleArray(self, _aIdx1, _aIdx2, _aFac2, _aX, _aY, _aFAC_Pos):
+
+        aSAC_Pos = _aFAC_Pos + self.dAxisSep * _aX
+
+        aSteer1 = self._GetSteerDirArray(_aIdx1, _aY, aSAC_Pos)
+        aSteer2 = self._GetSteerDirArray(_aIdx2, _aY, aSAC_Pos)
+        aFac2 = _aFac2[:, np.newaxis]
+        aSteer = self._NormalizeArray(aSteer1 * (1.0 - aFac2) + aSteer2 * aFac2)
+
+        aCos = np.clip(np.einsum("ij,ij->i", _aY, aSteer), -1.0, 1.0)
+        aSign = np.where(np.cross(_aY, aSteer) @ self.aZ >= 0.0, 1.0, -1.0)
+
+        return aSign * np.arccos(aCos)
+
+    # enddef
+
+    #############################################################
+    # Vectorized version of _GetRotCenter(). Where there is no valid
+    # rotation center, a point far away along the y-axis is returned.
+    def _GetRotCenterArray(self, _aIdx1, _aIdx2, _aFac2, _aFAC_Pos, _aY):
+
+        aRC_Pos1 = self.aRC_Pos[_aIdx1]
+        aRC_Pos2 = self.aRC_Pos[_aIdx2]
+
+        aSign = np.einsum("ij,ij->i", aRC_Pos1 - _aFAC_Pos, aRC_Pos2 - _aFAC_Pos)
+        aValid = self.aRC_Valid[_aIdx1] & self.aRC_Valid[_aIdx2] & (aSign > 0.0)
+
+        aRC_Pos = self._LerpArray(self.aRC_Pos, _aIdx1, _aIdx2, _aFac2)
+        return np.where(aValid[:, np.newaxis], aRC_Pos, 10000.0 * _aY)
+
+    # enddef
+
+    #############################################################
+    # Evaluates the poses of the vehicle for an array of times, without
+    # changing the scene. Returns a dictionary of arrays with one element
+    # per time. Positions and directions are given in the curve's frame:
+    #   aTime: the times
+    #   aFAC_Pos: (M, 3) positions of the fixed axis center,
+    #       lifted onto the terrain, if the model follows a terrain
+    #   aFAC_Dir: (M, 3) unit direction of the vehicle, including the pitch
+    #   aBank: bank angle about the direction on a terrain, otherwise zero
+    #   aHeading: heading angle of the direction in the XY-plane
+    #   aSteer: steering angle
+    #   dicSpin: spin angles of the wheels by wheel id
+    #   aRoll: roll angle of the vehicle body
+    #   aSpeed: speed along the path, which is zero while parked
+    #   aYawRate: rotation rate about the up vector
+    #   aRC_Pos: (M, 3) rotation centers
+    def EvaluatePoses(self, _aTimes):
+
+        if not self.bTrackDataAvailable:
+            raise Exception("Vehicle track has not been evaluated.")
+        # endif
+
+        aT = np.atleast_1d(np.asarray(_aTimes, dtype=np.float64))
+        aIdx1, aIdx2, aFac2, dTimeDelta, aIsMoving = self._GetCurvePosArray(aT)
+
+        aFAC_Pos = self._LerpArray(self.aFAC_Pos, aIdx1, aIdx2, aFac2)
+        aFAC_Deriv = self._LerpArray(self.aFAC_Deriv, aIdx1, aIdx2, aFac2)
+        aFAC_Curv = self._LerpArray(self.aFAC_CurvSigned, aIdx1, aIdx2, aFac2)
+
+        aX = self._NormalizeArray(aFAC_Deriv)
+        aY = np.cross(self.aZ, aX)
+
+        # Velocity as used for the pose, and the actual speed,
+        # which is zero while the vehicle is parked.
+        aVel = np.linalg.norm(aFAC_Deriv, axis=1) / dTimeDelta
+        aSpeed = np.where(aIsMoving, aVel, 0.0)
+
+        dicPoses = {
+            "aTime": aT,
+            "aFAC_Pos": aFAC_Pos,
+            "aFAC_Dir": aX,
+            "aHeading": np.arctan2(aX[:, 1], aX[:, 0]),
+            "aSteer": self._EvalSteerAngleArray(aIdx1, aIdx2, aFac2, aX, aY, aFAC_Pos),
+            "dicSpin": {},
+            "aRoll": np.zeros(len(aT)),
+            "aSpeed": aSpeed,
+            "aYawRate": aFAC_Curv * aSpeed,
+            "aRC_Pos": self._GetRotCenterArray(aIdx1, aIdx2, aFac2, aFAC_Pos, aY),
+        }
+
+        self._EvaluateWheelPoses(dicPoses, aIdx1, aIdx2, aFac2, aVel, aFAC_Curv)
+
+        if self.bTerrain:
+            aHeight = self._LerpArray(self.aTerrainHeight, aIdx1, aIdx2, aFac2)
+            aPitch = self._LerpArray(self.aTerrainPitch, aIdx1, aIdx2, aFac2)
+            dicPoses["aFAC_Pos"] = aFAC_Pos + aHeight[:, np.newaxis] * self.aZ
+            dicPoses["aFAC_Dir"] = np.cos(aPitch)[:, np.newaxis] * aX + np.sin(aPitch)[:, np.newaxis] * self.aZ
+            dicPoses["aBank"] = self._LerpArray(self.aTerrainBank, aIdx1, aIdx2, aFac2)
+        else:
+            dicPoses["aBank"] = np.zeros(len(aT))
+        # endif
+
+        return dicPoses
+
+    # enddef
+
+    #############################################################
+    # Adds the model specific wheel spin and roll angles to the
+    # result of EvaluatePoses().
+    def _EvaluateWheelPoses(self, _dicPoses, _aIdx1, _aIdx2, _aFac2, _aVel, _aCurv):
+        pass
+
+    # enddef
+
+    #############################################################
+    # Returns the pose records for an array of times as (M, C) array,
+    # with the C channels given by lPoseChannels.
+    def EvaluatePoseRecords(self, _aTimes):
+        return np.column_stack(self._GetPoseRecordColumns(self.EvaluatePoses(_aTimes)))
+
+    # enddef
+
+    #############################################################
+    # Returns the world matrices of the fixed axis center for the
+    # result of EvaluatePoses() as (M, 4, 4) array.
+    def GetWorldMatrices(self, _dicPoses):
+
+        aX = _dicPoses["aFAC_Dir"]
+        aY = self._NormalizeArray(np.cross(self.aZ, aX))
+        aZ = np.cross(aX, aY)
+
+        aCos = np.cos(_dicPoses["aBank"])[:, np.newaxis]
+        aSin = np.sin(_dicPoses["aBank"])[:, np.newaxis]
+
+        aA = np.zeros((len(aX), 4, 4))
+        aA[:, 0:3, 0] = aX
+        aA[:, 0:3, 1] = aCos * aY + aSin * aZ
+        aA[:, 0:3, 2] = aCos * aZ - aSin * aY
+        aA[:, 0:3, 3] = _dicPoses["aFAC_Pos"]
+        aA[:, 3, 3] = 1.0
+
+        return np.array(self.GetCurveMatrix()) @ aA
+
+    # enddef
+
+    #############################################################
+    # Evaluates dense poses within a time window, e.g. one per scan line
+    # of a rolling shutter camera or per azimuth step of a LiDAR sweep.
+    # The samples are spaced evenly from dStartTime to dStartTime + dDuration,
+    # both included. Returns the result of EvaluatePoses() with the
+    # additional element "aWorldMatrix".
+    def EvaluateSweepPoses(self, dStartTime, dDuration, iSampleCount):
+
+        if iSampleCount < 1:
+            raise Exception("Pose sweep needs at least one sample.")
+        # endif
+
+        aTimes = dStartTime + np.linspace(0.0, dDuration, iSampleCount)
+        dicPoses = self.EvaluatePoses(aTimes)
+        dicPoses["aWorldMatrix"] = self.GetWorldMatrices(dicPoses)
+
+        return dicPoses
+
+    # enddef
+
+    #############################################################
+    # Returns the columns of the pose records from the result of EvaluatePoses()
+    def _GetPoseRecordColumns(self, _dicPoses):
+
+        return [*_dicPoses["aFAC_Pos"].T, *_dicPoses["aFAC_Dir"].T, _dicPoses["aBank"]]
+
+    # enddef
+
+    #############################################################
+    # Evaluates the pose record at time dT. The pose record is a tuple
+    # of floats with the layout given by the model's lPoseChannels.
+    # The base model only evaluates the pose of the vehicle root.
+    def EvalPose(self, dT):
+
+        iPntIdx1, iPntIdx2, dFac2, dTimeDelta = self._GetCurvePos(dT)
+
+        tFAC_Pos = self._Lerp3(self.lFAC_Pos, iPntIdx1, iPntIdx2, dFac2)
+        tFAC_Deriv = self._Lerp3(self.lFAC_Deriv, iPntIdx1, iPntIdx2, dFac2)
+        tX = self._Normalize3(tFAC_Deriv)
+
+        tFAC_Pos, tFAC_Dir, dBank = self._GetTerrainPose(iPntIdx1, iPntIdx2, dFac2, tFAC_Pos, tX)
+
+        return (*tFAC_Pos, *tFAC_Dir, dBank)
+
+    # enddef
+
+    #############################################################
+    # Sets the rig objects to the given pose record.
+    def ApplyPose(self, _tPose):
+
+        self.ApplyRootPose(_tPose)
+
+    # enddef
+
+    #############################################################
+    # Only sets the world matrix of the fixed axis center object,
+    # which moves the whole vehicle, to the given pose record.
+    # The last channel of the pose record is the terrain bank angle.
+    def ApplyRootPose(self, _tPose):
+
+        dPx, dPy, dPz, dXx, dXy, dXz = _tPose[0:6]
+        dUx, dUy, dUz = self.tZ
+        dYx = dUy * dXz - dUz * dXy
+        dYy = dUz * dXx - dUx * dXz
+        dYz = dUx * dXy - dUy * dXx
+
+        if dXx * dUx + dXy * dUy + dXz * dUz == 0.0:
+            # The direction is not pitched, so the up vector is the Z-axis
+            dZx, dZy, dZz = dUx, dUy, dUz
+        else:
+            dLen = math.sqrt(dYx * dYx + dYy * dYy + dYz * dYz)
+            dYx /= dLen
+            dYy /= dLen
+            dYz /= dLen
+            dZx = dXy * dYz - dXz * dYy
+            dZy = dXz * dYx - dXx * dYz
+            dZz = dXx * dYy - dXy * dYx
+        # endif
+
+        dBank = _tPose[-1]
+        if dBank != 0.0:
+            dCos = math.cos(dBank)
+            dSin = math.sin(dBank)
+            dYx, dYy, dYz, dZx, dZy, dZz = (
+                dCos * dYx + dSin * dZx,
+                dCos * dYy + dSin * dZy,
+                dCos * dYz + dSin * dZz,
+                dCos * dZx - dSin * dYx,
+                dCos * dZy - dSin * dYy,
+                dCos * dZz - dSin * dYz,
+            )
+        # endif
+
+        # The fixed axis frame has the columns vX, vY, vZ and the position.
+        # Apply the world matrix of the curve object
+        # to place vehicle at correct world position.
+        mW = self.mFAC_World
+        for iRow in range(3):
+            dC0, dC1, dC2, dC3 = self.tCurveMatrix[iRow]
+            mW[iRow] = (
+                dC0 * dXx + dC1 * dXy + dC2 * dXz,
+                dC0 * dYx + dC1 * dYy + dC2 * dYz,
+                dC0 * dZx + dC1 * dZy + dC2 * dZz,
+                dC0 * dPx + dC1 * dPy + dC2 * dPz + dC3,
+            )
+        # endfor
+
+        self.objFAC.matrix_world = mW
+
+    # enddef
+
+    #############################################################
+    # Returns the radius of a sphere about the fixed axis center,
+    # which contains the wheels of the vehicle.
+    def GetCullRadius(self):
+
+        if self.dCullRadius is None:
+            vFAC = self.objFAC.matrix_world.translation
+            dRadius = max((x.matrix_world.translation - vFAC).length for x in self._GetRigTrackObjects())
+            self.dCullRadius = dRadius + self.dWheelRadius
+        # endif
+
+        return self.dCullRadius
+
+    # enddef
+
+    #############################################################
+    def ClearPoseCache(self):
+        self.xPoseCache.clear()
+        self.ClearLastPose()
+
+    # enddef
+
+    #############################################################
+    # Forces the next call of SetObjectToTime() or SetObjectToPose()
+    # to set the objects, even if the time has not changed.
+    def ClearLastPose(self):
+        self.dLastPoseTime = None
+        self.iLastCullLevel = cull.iCullNone
+
+    # enddef
+
+    #############################################################
+    # Returns the pose record at time dT from the pose cache,
+    # or evaluates it, if it is not available.
+    def GetPose(self, dT):
+
+        tPose = self.xPoseCache.get(dT)
+        if tPose is not None:
+            self.xPoseCache.move_to_end(dT)
+            return tPose
+        # endif
+
+        tPose = self.EvalPose(dT)
+        self.xPoseCache[dT] = tPose
+        if len(self.xPoseCache) > self.iPoseCacheSize:
+            self.xPoseCache.popitem(last=False)
+        # endif
+
+        return tPose
+
+    # enddef
+
+    #############################################################
+    # If a camera frustum from cull.GetSceneFrustum() is given, vehicles
+    # outside of the frustum are not updated, and vehicles further away
+    # than the frustum's cull distance only get their root transform.
+    def SetObjectToTime(self, dT, *, Frustum=None, UpdateViewLayer=True):
+
+        if not self.bTrackDataAvailable:
+            return
+        # endif
+
+        # Outside of the motion interval the vehicle is parked, so all
+        # times map to the same pose.
+        dStart, dEnd = self.GetMotionInterval()
+        dT = min(max(dT, dStart), dEnd)
+
+        # The curve places the vehicle in the world and may have moved
+        if self.UpdateCurveMatrix():
+            self.ClearLastPose()
+        # endif
+
+        tPose = None
+        iCullLevel = cull.iCullNone
+        if Frustum is not None:
+            tPose = self.GetPose(dT)
+            tPos = self._CurveToWorld(tPose)
+            iCullLevel = cull.GetCullLevel(Frustum, tPos, self.GetCullRadius())
+            if iCullLevel == cull.iCullSkip:
+                return
+            # endif
+        # endif
+
+        # The objects are already set to this time, at the same or a
+        # higher level of detail.
+        if dT == self.dLastPoseTime and iCullLevel >= self.iLastCullLevel:
+            return
+        # endif
+
+        if tPose is None:
+            tPose = self.GetPose(dT)
+        # endif
+
+        if iCullLevel == cull.iCullRoot:
+            self.ApplyRootPose(tPose)
+        else:
+            self.ApplyPose(tPose)
+        # endif
+        self.dLastPoseTime = dT
+        self.iLastCullLevel = iCullLevel
+
+        # Ensure that location and matrix_world properties are consistent
+        if UpdateViewLayer:
+            anyblend.viewlayer.Update()
+        # endif
+
+    # enddef
+
+    #############################################################
+    # Sets the objects to a given pose record, e.g. replayed from a pose
+    # bake, with the same culling as SetObjectToTime(). The time dT only
+    # identifies the pose, so that an unchanged pose is not set again.
+    def SetObjectToPose(self, tPose, dT, *, Frustum=None, UpdateViewLayer=True):
+
+        if self.UpdateCurveMatrix():
+            self.ClearLastPose()
+        # endif
+
+        iCullLevel = cull.iCullNone
+        if Frustum is not None:
+            iCullLevel = cull.GetCullLevel(Frustum, self._CurveToWorld(tPose), self.GetCullRadius())
+            if iCullLevel == cull.iCullSkip:
+                return
+            # endif
+        # endif
+
+        if dT == self.dLastPoseTime and iCullLevel >= self.iLastCullLevel:
+            return
+        # endif
+
+        if iCullLevel == cull.iCullRoot:
+            self.ApplyRootPose(tPose)
+        else:
+            self.ApplyPose(tPose)
+        # endif
+        self.dLastPoseTime = dT
+        self.iLastCullLevel = iCullLevel
+
+        if UpdateViewLayer:
+            anyblend.viewlayer.Update()
+        # endif
+
+    # enddef
+
+
+# endclass
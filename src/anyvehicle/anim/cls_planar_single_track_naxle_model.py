@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_planar_single_track_naxle_model.py
+# Created Date: Wednesday, October 21st 2026, 3:36:52 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import math
+import hashlib
+import numpy as np
+
+from .cls_planar_single_track_model import CPlanarSingleTrackModel
+
+
+####################################################################
+# Single track model with any number of axles and wheels, and optional
+# trailers. The rig is described by lists of axles. Each axle is a
+# dictionary with the elements:
+#   bSteer: whether the wheels of the axle are steered
+#   dWheelRadius: radius of the axle's wheels
+#   lWheels: list of tuples (objMount, objSpin) of the object, which is
+#       rotated when steering, and the object, which spins with the wheel.
+#       The mount objects are children of the fixed axis center object and
+#       the spin objects are children of their mount objects.
+#
+# Each trailer is a dictionary with the elements:
+#   objHitch: object at the hitch point, which is rotated about its z-axis
+#       by the hitch angle. The hitch of the first trailer is a child of the
+#       fixed axis center object, the hitch of each following trailer is a
+#       child of the hitch object of the preceding trailer.
+#   lAxles: list of axles, as above, whose mount objects are children of
+#       the hitch object. Trailer axles are not steered.
+#
+# Steered axles are turned, such that they point at the rotation center
+# on the line of the fixed axis. The wheel ids in the track tables and the
+# pose channels are the names of the spin objects.
+class CPlanarSingleTrackNaxleModel(CPlanarSingleTrackModel):
+
+    #############################################################
+    def __init__(
+        self,
+        *,
+        NurbsCurve,
+        VectorUp,
+        Speed_kmh,
+        WheelRadius,
+        FixedAxisOrigObj,
+        SteerAxisOrigObj,
+        Axles,
+        Trailers=None,
+        RotOrigObj=None,
+        TerrainObj=None,
+        LateralOffset=0.0,
+        TimeOffset=0.0,
+        PoseCacheSize=256
+    ):
+
+        super().__init__(
+            NurbsCurve=NurbsCurve,
+            VectorUp=VectorUp,
+            Speed_kmh=Speed_kmh,
+            WheelRadius=WheelRadius,
+            FixedAxisOrigObj=FixedAxisOrigObj,
+            SteerAxisOrigObj=SteerAxisOrigObj,
+            RotOrigObj=RotOrigObj,
+            TerrainObj=TerrainObj,
+            LateralOffset=LateralOffset,
+            TimeOffset=TimeOffset,
+            PoseCacheSize=PoseCacheSize,
+        )
+
+        self.lAxles = Axles
+        self.lTrailers = Trailers if Trailers is not None else []
+
+        # Wheels of the vehicle, followed by the wheels of the trailers,
+        # as tuples (objMount, objSpin, dWheelRadius)
+        self.lWheels = [
+            (objMount, objSpin, dicAxle["dWheelRadius"])
+            for dicAxle in self.lAxles + [x for dicTrailer in self.lTrailers for x in dicTrailer["lAxles"]]
+            for objMount, objSpin in dicAxle["lWheels"]
+        ]
+        self.lWheelIds = [x[1].name for x in self.lWheels]
+        self.lHitchIds = [x["objHitch"].name for x in self.lTrailers]
+
+        # Layout of the pose records
+        self.lPoseChannels = [
+            "FAC.Pos.x",
+            "FAC.Pos.y",
+            "FAC.Pos.z",
+            "FAC.Dir.x",
+            "FAC.Dir.y",
+            "FAC.Dir.z",
+            "Steer",
+            *["{0}.Spin".format(x) for x in self.lWheelIds],
+            *["{0}.Hitch".format(x) for x in self.lHitchIds],
+            "Rot.Pos.x",
+            "Rot.Pos.y",
+            "Rot.Pos.z",
+            "FAC.Bank",
+        ]
+        self.iSpinChannel = 7
+        self.iHitchChannel = self.iSpinChannel + len(self.lWheelIds)
+        self.iRotChannel = self.iHitchChannel + len(self.lHitchIds)
+
+        self.aWheelLen = None
+        self.aWheelRadius = np.array([x[2] for x in self.lWheels], dtype=np.float64)
+        self.lWheelRadius = self.aWheelRadius.tolist()
+        self.aHitchAngle = None
+
+        vFAC = self.objFAC.matrix_world.translation
+        self._UpdateSteerRatios((self.objSAC.matrix_world.translation - vFAC).length)
+
+    # enddef
+
+    #############################################################
+    # For each steered axle, the ratio of the tangent of its steering angle
+    # to the tangent of the steering angle at the steering axis center.
+    def _UpdateSteerRatios(self, _dAxisSep):
+
+        self.lSteerMounts = []
+        for dicAxle in self.lAxles:
+            if not dicAxle["bSteer"]:
+                continue
+            # endif
+            for objMount, objSpin in dicAxle["lWheels"]:
+                dRatio = objMount.location[0] / _dAxisSep if _dAxisSep > 0.0 else 1.0
+                self.lSteerMounts.append((objMount, dRatio))
+            # endfor
+        # endfor
+
+    # enddef
+
+    #############################################################
+    def _GetWheelOffsets(self):
+
+        return {
+            objSpin.name: tuple(objMount.matrix_local @ objSpin.location)
+            for dicAxle in self.lAxles
+            for objMount, objSpin in dicAxle["lWheels"]
+        }
+
+    # enddef
+
+    #############################################################
+    # The wheel centers of the vehicle are lowered by the difference of
+    # their radius to the model's wheel radius, so that the contact points
+    # are placed below each wheel.
+    def _GetTerrainContactOffsets(self, _dAxisSep):
+
+        dicOffsets = {}
+        for dicAxle in self.lAxles:
+            dLower = dicAxle["dWheelRadius"] - self.dWheelRadius
+            for objMount, objSpin in dicAxle["lWheels"]:
+                tOffset = tuple(objMount.matrix_local @ objSpin.location)
+                dicOffsets[objSpin.name] = (
+                    tOffset[0] - dLower * self.tZ[0],
+                    tOffset[1] - dLower * self.tZ[1],
+                    tOffset[2] - dLower * self.tZ[2],
+                )
+            # endfor
+        # endfor
+
+        return dicOffsets
+
+    # enddef
+
+    #############################################################
+    # The trailers of the track snapshot, see trailer.EvalTrailerTables()
+    def _GetTrailerSnapshots(self):
+
+        return [
+            {
+                "sName": dicTrailer["objHitch"].name,
+                "aHitchOffset": tuple(dicTrailer["objHitch"].location),
+                "dicWheelOffsets": {
+                    objSpin.name: tuple(objMount.matrix_local @ objSpin.location)
+                    for dicAxle in dicTrailer["lAxles"]
+                    for objMount, objSpin in dicAxle["lWheels"]
+                },
+            }
+            for dicTrailer in self.lTrailers
+        ]
+
+    # enddef
+
+    #############################################################
+    def _GetRigTrackObjects(self):
+
+        lObjects = [self.objSAC]
+        for dicTrailer in self.lTrailers:
+            lObjects.append(dicTrailer["objHitch"])
+        # endfor
+        for objMount, objSpin, dWheelRadius in self.lWheels:
+            lObjects.append(objMount)
+            lObjects.append(objSpin)
+        # endfor
+
+        return lObjects
+
+    # enddef
+
+    #############################################################
+    def GetTrackSourceHash(self, *, Resolution):
+
+        xHash = hashlib.sha1()
+        xHash.update(super().GetTrackSourceHash(Resolution=Resolution).encode("utf-8"))
+
+        for dicTrailer in self._GetTrailerSnapshots():
+            xHash.update(dicTrailer["sName"].encode("utf-8"))
+            xHash.update(np.asarray(dicTrailer["aHitchOffset"], np.float64).tobytes())
+            dicWheelOffsets = dicTrailer["dicWheelOffsets"]
+            for sWheel in sorted(dicWheelOffsets):
+                xHash.update(sWheel.encode("utf-8"))
+                xHash.update(np.asarray(dicWheelOffsets[sWheel], np.float64).tobytes())
+            # endfor
+        # endfor
+
+        xHash.update(self.aWheelRadius.tobytes())
+
+        return xHash.hexdigest()
+
+    # enddef
+
+    #############################################################
+    def SnapshotTrack(self, *, Resolution):
+
+        dicSnapshot = super().SnapshotTrack(Resolution=Resolution)
+        dicSnapshot["lTrailers"] = self._GetTrailerSnapshots()
+
+        return dicSnapshot
+
+    # enddef
+
+    #############################################################
+    def ApplyTrack(self, _dicTrack):
+
+        super().ApplyTrack(_dicTrack)
+
+        # (W, N-2) and (T, N-2) tables of the wheels and the trailers
+        iSampleCnt = len(self.aFAC_Pos) - 2
+        dicWheelLen = _dicTrack["dicWheelLen"]
+        self.aWheelLen = np.array([dicWheelLen[x] for x in self.lWheelIds], dtype=np.float64).reshape(-1, iSampleCnt)
+        self.lWheelLen = self.aWheelLen.tolist()
+
+        dicHitchAngle = _dicTrack.get("dicHitchAngle", {})
+        self.aHitchAngle = np.array([dicHitchAngle[x] for x in self.lHitchIds], dtype=np.float64).reshape(
+            -1, iSampleCnt
+        )
+        self.lHitchAngle = self.aHitchAngle.tolist()
+
+        self._UpdateSteerRatios(self.dAxisSep)
+
+    # enddef
+
+    #############################################################
+    def EvalPose(self, dT):
+
+        iPntIdx1, iPntIdx2, dFac2, dTimeDelta = self._GetCurvePos(dT)
+
+        tFAC_Pos = self._Lerp3(self.lFAC_Pos, iPntIdx1, iPntIdx2, dFac2)
+        tFAC_Deriv = self._Lerp3(self.lFAC_Deriv, iPntIdx1, iPntIdx2, dFac2)
+
+        lSpin = [
+            self._Lerp(lLen, iPntIdx1, iPntIdx2, dFac2) / dRadius
+            for lLen, dRadius in zip(self.lWheelLen, self.lWheelRadius)
+        ]
+        lHitch = [self._Lerp(lAngle, iPntIdx1, iPntIdx2, dFac2) for lAngle in self.lHitchAngle]
+
+        tX = self._Normalize3(tFAC_Deriv)
+        tY = self._CrossUp(tX)
+
+        dSteerAngle_rad = self._EvalSteerAngle(iPntIdx1, iPntIdx2, dFac2, tX, tY, tFAC_Pos)
+
+        tRC_Pos = self._GetRotCenter(iPntIdx1, iPntIdx2, dFac2, tFAC_Pos)
+        if tRC_Pos is None:
+            tRC_Pos = (10000.0 * tY[0], 10000.0 * tY[1], 10000.0 * tY[2])
+        # endif
+
+        tFAC_Pos, tFAC_Dir, dBank = self._GetTerrainPose(iPntIdx1, iPntIdx2, dFac2, tFAC_Pos, tX)
+
+        return (*tFAC_Pos, *tFAC_Dir, dSteerAngle_rad, *lSpin, *lHitch, *tRC_Pos, dBank)
+
+    # enddef
+
+    #############################################################
+    # Adds the element "dicHitchAngle" with the hitch angles of the
+    # trailers by hitch id.
+    def _EvaluateWheelPoses(self, _dicPoses, _aIdx1, _aIdx2, _aFac2, _aVel, _aCurv):
+
+        aFac1 = 1.0 - _aFac2
+        aSpin = self.aWheelLen[:, _aIdx1] * aFac1 + self.aWheelLen[:, _aIdx2] * _aFac2
+        aSpin /= self.aWheelRadius[:, np.newaxis]
+        aHitch = self.aHitchAngle[:, _aIdx1] * aFac1 + self.aHitchAngle[:, _aIdx2] * _aFac2
+
+        _dicPoses["dicSpin"] = dict(zip(self.lWheelIds, aSpin))
+        _dicPoses["dicHitchAngle"] = dict(zip(self.lHitchIds, aHitch))
+
+    # enddef
+
+    #############################################################
+    def _GetPoseRecordColumns(self, _dicPoses):
+
+        aFAC_Pos = _dicPoses["aFAC_Pos"]
+        aFAC_Dir = _dicPoses["aFAC_Dir"]
+        aRC_Pos = _dicPoses["aRC_Pos"]
+        dicSpin = _dicPoses["dicSpin"]
+        dicHitchAngle = _dicPoses["dicHitchAngle"]
+
+        return [
+            *aFAC_Pos.T,
+            *aFAC_Dir.T,
+            _dicPoses["aSteer"],
+            *[dicSpin[x] for x in self.lWheelIds],
+            *[dicHitchAngle[x] for x in self.lHitchIds],
+            *aRC_Pos.T,
+            _dicPoses["aBank"],
+        ]
+
+    # enddef
+
+    #############################################################
+    def ApplyPose(self, _tPose):
+
+        self.ApplyRootPose(_tPose)
+
+        dSteerAngle_rad = _tPose[6]
+        self._SetLocalRotation(self.objSAC, dSteerAngle_rad)
+
+        dTan = math.tan(dSteerAngle_rad)
+        for objMount, dRatio in self.lSteerMounts:
+            self._SetLocalRotation(objMount, math.atan(dRatio * dTan))
+        # endfor
+
+        iChannel = self.iSpinChannel
+        for objMount, objSpin, dWheelRadius in self.lWheels:
+            objSpin.rotation_euler = (0.0, _tPose[iChannel], 0.0)
+            iChannel += 1
+        # endfor
+
+        for dicTrailer in self.lTrailers:
+            self._SetLocalRotation(dicTrailer["objHitch"], _tPose[iChannel])
+            iChannel += 1
+        # endfor
+
+        if self.objRot is not None:
+            self.objRot.location = _tPose[self.iRotChannel : self.iRotChannel + 3]
+        # endif
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_pose_bake.py
+# Created Date: Monday, October 19th 2026, 3:51:20 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import json
+import math
+import numpy as np
+
+from . import pose_bake
+
+
+####################################################################
+# Reads pose records from a memory mapped pose bake file.
+# See module pose_bake for a description of the file format.
+class CPoseBake:
+
+    #############################################################
+    def __init__(self, _sFilePath):
+
+        self.sFilePath = _sFilePath
+
+        with open(_sFilePath, "rb") as xFile:
+            xHeader = xFile.read(pose_bake.iHeaderSize)
+            if xHeader[0 : len(pose_bake.sMagic)] != pose_bake.sMagic:
+                raise Exception("File '{0}' is not a vehicle pose bake file.".format(_sFilePath))
+            # endif
+
+            iDirOffset, iDirLen = np.frombuffer(xHeader, dtype=np.uint64, count=2, offset=len(pose_bake.sMagic))
+            xFile.seek(int(iDirOffset))
+            dicDir = json.loads(xFile.read(int(iDirLen)).decode("utf-8"))
+        # endwith
+
+        self.iFrameFirst = dicDir["iFrameFirst"]
+        self.iFrameCount = dicDir["iFrameCount"]
+        self.iChunkSize = dicDir["iChunkSize"]
+        self.dFps = dicDir["dFps"]
+        self.dicVehicles = dicDir["dicVehicles"]
+
+        self.xMap = np.memmap(_sFilePath, dtype=np.uint8, mode="r")
+        self.dicViews = {}
+
+    # enddef
+
+    #############################################################
+    def HasVehicle(self, _sName):
+        return _sName in self.dicVehicles
+
+    # enddef
+
+    #############################################################
+    def GetChannels(self, _sName):
+        return self.dicVehicles[_sName]["lChannels"]
+
+    # enddef
+
+    #############################################################
+    def _GetArray(self, _iOffset, _xType, _tShape):
+        iSize = int(np.prod(_tShape)) * np.dtype(_xType).itemsize
+        aData = self.xMap[_iOffset : _iOffset + iSize].view(_xType)
+        return aData.reshape(_tShape)
+
+    # enddef
+
+    #############################################################
+    # Creates the array views on the memory map for a vehicle.
+    # No data is read at this point.
+    def _GetViews(self, _sName):
+
+        dicViews = self.dicViews.get(_sName)
+        if dicViews is not None:
+            return dicViews
+        # endif
+
+        dicVehicle = self.dicVehicles[_sName]
+        iChCnt = len(dicVehicle["lChannels"])
+        tShape = (self.iFrameCount, iChCnt)
+        sEncoding = dicVehicle["sEncoding"]
+
+        dicViews = {"sEncoding": sEncoding, "iChannelCount": iChCnt}
+        if sEncoding == "f32":
+            dicViews["aData"] = self._GetArray(dicVehicle["iDataOffset"], np.float32, tShape)
+
+        else:
+            dicViews["aOffset"] = np.array(dicVehicle["lOffset"])
+            dicViews["aScale"] = np.array(dicVehicle["lScale"])
+
+            if sEncoding == "q16":
+                dicViews["aData"] = self._GetArray(dicVehicle["iDataOffset"], np.int16, tShape)
+            else:
+                iChunkCnt = (self.iFrameCount + self.iChunkSize - 1) // self.iChunkSize
+                dicViews["aKeys"] = self._GetArray(dicVehicle["iKeyOffset"], np.int16, (iChunkCnt, iChCnt))
+                dicViews["aChunkOffsets"] = self._GetArray(dicVehicle["iChunkOffsetsOffset"], np.uint64, (iChunkCnt,))
+                dicViews["aChunkItemSize"] = self._GetArray(dicVehicle["iChunkItemSizeOffset"], np.uint8, (iChunkCnt,))
+            # endif
+        # endif
+
+        self.dicViews[_sName] = dicViews
+        return dicViews
+
+    # enddef
+
+    #############################################################
+    def _GetQuantizedRow(self, _dicViews, _iIdx):
+
+        if _dicViews["sEncoding"] == "q16":
+            return _dicViews["aData"][_iIdx].astype(np.int32)
+        # endif
+
+        iChunk = _iIdx // self.iChunkSize
+        iRow = _iIdx - iChunk * self.iChunkSize
+        aQ = _dicViews["aKeys"][iChunk].astype(np.int32)
+        if iRow == 0:
+            return aQ
+        # endif
+
+        iItemSize = int(_dicViews["aChunkItemSize"][iChunk])
+        xType = np.int8 if iItemSize == 1 else np.int16
+        aDelta = self._GetArray(int(_dicViews["aChunkOffsets"][iChunk]), xType, (iRow, _dicViews["iChannelCount"]))
+        aQ = aQ + np.sum(aDelta, axis=0, dtype=np.int32)
+        return (aQ + 32768) % 65536 - 32768
+
+    # enddef
+
+    #############################################################
+    # Returns the pose of a vehicle at a frame index relative to the
+    # first frame, as float64 array.
+    def _GetRow(self, _sName, _iIdx):
+
+        dicViews = self._GetViews(_sName)
+        if dicViews["sEncoding"] == "f32":
+            return dicViews["aData"][_iIdx].astype(np.float64)
+        # endif
+
+        aQ = self._GetQuantizedRow(dicViews, _iIdx)
+        return dicViews["aOffset"] + dicViews["aScale"] * aQ
+
+    # enddef
+
+    #############################################################
+    # Returns the pose record of a vehicle at the given frame. The frame
+    # may be fractional, in which case the neighboring frames are interpolated.
+    # Frames outside of the baked range are clamped.
+    def GetPose(self, _sName, _dFrame):
+
+        dIdx = min(max(_dFrame - self.iFrameFirst, 0.0), self.iFrameCount - 1)
+        iIdx1 = int(math.floor(dIdx))
+        dFac2 = dIdx - iIdx1
+
+        aPose = self._GetRow(_sName, iIdx1)
+        if dFac2 > 0.0:
+            aPose2 = self._GetRow(_sName, iIdx1 + 1)
+            aDelta = aPose2 - aPose
+
+            # Interpolate wrapped angles along the shorter arc
+            lWrap = self.dicVehicles[_sName].get("lWrap")
+            if lWrap is not None:
+                aWrap = np.array(lWrap, dtype=bool)
+                aDelta[aWrap] = np.remainder(aDelta[aWrap] + math.pi, 2.0 * math.pi) - math.pi
+            # endif
+
+            aPose = aPose + dFac2 * aDelta
+        # endif
+
+        return tuple(aPose.tolist())
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_track_point_index.py
+# Created Date: Wednesday, October 21st 2026, 11:38:05 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import numpy as np
+from mathutils.kdtree import KDTree
+
+
+####################################################################
+# Spatial index of the track samples of a vehicle model in world
+# coordinates, which finds the points on the track nearest to given
+# world positions. The index is only valid for the track tables and the
+# curve placement it was built for.
+class CTrackPointIndex:
+
+    #############################################################
+    def __init__(self, _xModel):
+
+        if not _xModel.IsTrackAvailable():
+            raise Exception("Vehicle track has not been evaluated.")
+        # endif
+
+        self.xModel = _xModel
+        self.dicTrack = _xModel.dicTrack
+        self.tCurveMatrix = _xModel.GetCurveMatrix()
+
+        # Only samples with per sample tables are indexed
+        mCurve = np.array(self.tCurveMatrix)
+        self.iCnt = len(_xModel.aFAC_Pos) - 2
+        self.aPos = _xModel.aFAC_Pos[: self.iCnt] @ mCurve[0:3, 0:3].T + mCurve[0:3, 3]
+
+        self.xTree = KDTree(self.iCnt)
+        for iIdx, tPos in enumerate(self.aPos.tolist()):
+            self.xTree.insert(tPos, iIdx)
+        # endfor
+        self.xTree.balance()
+
+    # enddef
+
+    #############################################################
+    def IsValid(self):
+        return self.xModel.dicTrack is self.dicTrack and self.xModel.GetCurveMatrix() == self.tCurveMatrix
+
+    # enddef
+
+    #############################################################
+    # Projects the points onto the track segments between the sample
+    # indices aIdx and aIdx + 1. Returns the interpolation factors and
+    # the squared distances to the projected points.
+    def _ProjectToSegments(self, _aPoints, _aIdx):
+
+        aA = self.aPos[_aIdx]
+        aD = self.aPos[_aIdx + 1] - aA
+        aLenSq = np.einsum("ij,ij->i", aD, aD)
+        aFac = np.einsum("ij,ij->i", _aPoints - aA, aD)
+        aFac = np.clip(np.divide(aFac, aLenSq, out=np.zeros_like(aFac), where=aLenSq > 0.0), 0.0, 1.0)
+        aDelta = aA + aFac[:, np.newaxis] * aD - _aPoints
+
+        return aFac, np.einsum("ij,ij->i", aDelta, aDelta)
+
+    # enddef
+
+    #############################################################
+    # Finds the nearest points on the track for the (M, 3) array of world
+    # positions. The nearest track sample is found in the KD-tree, and the
+    # point is refined on the two track segments adjacent to that sample.
+    # Returns a dictionary of arrays with one element per point:
+    #   aArcLen: arc length along the track of the fixed axis center
+    #   aTime: time at which the fixed axis center passes the point
+    #   aDistance: distance of the position from the track
+    #   aWorldMatrix: (M, 4, 4) world matrix of the fixed axis center
+    #       at the point, whose columns are the local frame of the vehicle
+    def FindNearest(self, _aPoints):
+
+        aPoints = np.atleast_2d(np.asarray(_aPoints, dtype=np.float64))
+        aNearest = np.array([self.xTree.find(x)[1] for x in aPoints.tolist()], dtype=np.int64)
+
+        # Segments before and after the nearest sample
+        iMaxIdx = self.iCnt - 2
+        aIdxPrev = np.clip(aNearest - 1, 0, iMaxIdx)
+        aIdxNext = np.clip(aNearest, 0, iMaxIdx)
+        aFacPrev, aDistPrev = self._ProjectToSegments(aPoints, aIdxPrev)
+        aFacNext, aDistNext = self._ProjectToSegments(aPoints, aIdxNext)
+
+        aUsePrev = aDistPrev < aDistNext
+        aParam = np.where(aUsePrev, aIdxPrev + aFacPrev, aIdxNext + aFacNext)
+        aDistSq = np.where(aUsePrev, aDistPrev, aDistNext)
+
+        aSampleIdx = np.arange(self.iCnt)
+        aArcLen = np.interp(aParam, aSampleIdx, self.xModel.aFAC_Len[: self.iCnt])
+        aTime = np.interp(aParam, aSampleIdx, self.xModel.GetTrackSampleTimes())
+
+        dicPoses = self.xModel.EvaluatePoses(aTime)
+
+        return {
+            "aArcLen": aArcLen,
+            "aTime": aTime,
+            "aDistance": np.sqrt(aDistSq),
+            "aWorldMatrix": self.xModel.GetWorldMatrices(dicPoses),
+        }
+
+    # enddef
+
+
+# endclass
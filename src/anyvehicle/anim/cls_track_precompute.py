@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_track_precompute.py
+# Created Date: Monday, October 19th 2026, 1:27:05 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import track
+
+
+####################################################################
+# Evaluates track tables in a background thread. The results are collected
+# and have to be applied to the models from Blender's main thread,
+# by regularly calling PopResults().
+# The evaluation of a track reports its stages, see track.EvalTrackTables(),
+# so that the progress of long tracks is shown and a cancelled evaluation
+# stops within a running track.
+class CTrackPrecompute:
+
+    #############################################################
+    def __init__(self):
+
+        self._xLock = threading.Lock()
+        self._xCancel = threading.Event()
+        self._xThread = None
+        self._lResults = []
+
+        self.iJobCount = 0
+        self.iDoneCount = 0
+        # Stage and fraction of the stage that is done by key of running jobs
+        self.dicJobStages = {}
+
+    # enddef
+
+    #############################################################
+    def IsRunning(self):
+        return self._xThread is not None and self._xThread.is_alive()
+
+    # enddef
+
+    #############################################################
+    def IsCancelled(self):
+        return self._xCancel.is_set()
+
+    # enddef
+
+    #############################################################
+    # Starts the evaluation of the given jobs. Each job is a tuple of a key,
+    # which is returned with the result, and a track snapshot.
+    def Start(self, _lJobs, *, iWorkerCount=None):
+
+        if self.IsRunning():
+            raise Exception("Vehicle track evaluation is already running.")
+        # endif
+
+        if iWorkerCount is None:
+            iWorkerCount = os.cpu_count() or 1
+        # endif
+
+        self._xCancel.clear()
+        with self._xLock:
+            self._lResults = []
+            self.iJobCount = len(_lJobs)
+            self.iDoneCount = 0
+            self.dicJobStages = {}
+        # endwith
+
+        self._xThread = threading.Thread(target=self._Run, args=(list(_lJobs), iWorkerCount), daemon=True)
+        self._xThread.start()
+
+    # enddef
+
+    #############################################################
+    def Cancel(self):
+        self._xCancel.set()
+
+    # enddef
+
+    #############################################################
+    # Returns the number of finished jobs and the total number of jobs.
+    def GetProgress(self):
+        with self._xLock:
+            return self.iDoneCount, self.iJobCount
+        # endwith
+
+    # enddef
+
+    #############################################################
+    # Returns a dictionary of the current stage and the fraction of the
+    # stage that is done, by key of the running jobs.
+    def GetJobStages(self):
+        with self._xLock:
+            return dict(self.dicJobStages)
+        # endwith
+
+    # enddef
+
+    #############################################################
+    # Returns the list of (key, result) tuples finished since the last call.
+    # The result is either the track table dictionary, or the exception
+    # raised while evaluating it.
+    def PopResults(self):
+        with self._xLock:
+            lResults = self._lResults
+            self._lResults = []
+        # endwith
+        return lResults
+
+    # enddef
+
+    #############################################################
+    # Returns whether the evaluation is still running, and the results
+    # finished since the last call. The state is read before the results,
+    # so that if the evaluation is reported as stopped, all of its results
+    # are returned, even if it stopped in between.
+    def PopResultsAndState(self):
+
+        bRunning = self.IsRunning()
+        return bRunning, self.PopResults()
+
+    # enddef
+
+    #############################################################
+    def _Run(self, _lJobs, _iWorkerCount):
+
+        iWorkerCount = max(1, min(_iWorkerCount, len(_lJobs)))
+        with ThreadPoolExecutor(max_workers=iWorkerCount) as xPool:
+            dicFutures = {xPool.submit(self._EvalJob, tJob[0], tJob[1]): tJob[0] for tJob in _lJobs}
+
+            for xFuture in as_completed(dicFutures):
+                if self._xCancel.is_set():
+                    xPool.shutdown(wait=False, cancel_futures=True)
+                    break
+                # endif
+
+                try:
+                    xResult = xFuture.result()
+                except Exception as xEx:
+                    xResult = xEx
+                # endtry
+
+                with self._xLock:
+                    self._lResults.append((dicFutures[xFuture], xResult))
+                    self.iDoneCount += 1
+                    self.dicJobStages.pop(dicFutures[xFuture], None)
+                # endwith
+            # endfor
+        # endwith
+
+    # enddef
+
+    #############################################################
+    # Evaluates the track tables of a single job. The progress callback
+    # records the job's stage and stops the evaluation, if it is cancelled.
+    def _EvalJob(self, _xKey, _dicSnapshot):
+
+        def Progress(_sStage, _dFraction):
+            if self._xCancel.is_set():
+                raise Exception("Vehicle track evaluation cancelled.")
+            # endif
+            with self._xLock:
+                self.dicJobStages[_xKey] = (_sStage, _dFraction)
+            # endwith
+
+        # enddef
+
+        return track.EvalTrackTables(_dicSnapshot, funcProgress=Progress)
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \conflict.py
+# Created Date: Tuesday, October 20th 2026, 5:12:08 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Detection of overlapping vehicle footprints along the trajectories.
+# For each time step, the footprints are inserted into a uniform grid,
+# whose cells are as large as the largest footprint. Only vehicles in
+# neighboring cells are tested for overlap with the separating axis test
+# of their oriented footprint rectangles.
+
+import numpy as np
+
+from . import annotation
+from . import bev
+
+# Offsets of the cells tested for each cell, such that each pair of
+# neighboring cells is visited once.
+lNeighborCells = [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]
+
+
+###############################################################################
+# Returns the candidate pairs of footprints with centers in the same or
+# neighboring grid cells, as two index arrays.
+def _GetCandidatePairs(_aPos, _dCellSize):
+
+    aCell = np.floor(_aPos / _dCellSize).astype(np.int64)
+
+    dicCells = {}
+    for iIdx, tCell in enumerate(map(tuple, aCell.tolist())):
+        dicCells.setdefault(tCell, []).append(iIdx)
+    # endfor
+
+    lIdxA = []
+    lIdxB = []
+    for (iX, iY), lIdx in dicCells.items():
+        for iDx, iDy in lNeighborCells:
+            lOther = dicCells.get((iX + iDx, iY + iDy))
+            if lOther is None:
+                continue
+            # endif
+
+            for iPos, iA in enumerate(lIdx):
+                # Within the same cell, each pair is only added once
+                lB = lOther[iPos + 1 :] if lOther is lIdx else lOther
+                lIdxA.extend([iA] * len(lB))
+                lIdxB.extend(lB)
+            # endfor
+        # endfor
+    # endfor
+
+    return np.array(lIdxA, dtype=np.int64), np.array(lIdxB, dtype=np.int64)
+
+
+# enddef
+
+
+###############################################################################
+# Separating axis test of pairs of oriented rectangles. Returns a boolean
+# array, which is true for overlapping pairs.
+def _TestOverlap(_aPos, _aAxisX, _aAxisY, _aHalf, _aIdxA, _aIdxB):
+
+    aD = _aPos[_aIdxB] - _aPos[_aIdxA]
+    lAxesA = (_aAxisX[_aIdxA], _aAxisY[_aIdxA])
+    lAxesB = (_aAxisX[_aIdxB], _aAxisY[_aIdxB])
+    aHalfA = _aHalf[_aIdxA]
+    aHalfB = _aHalf[_aIdxB]
+
+    aOverlap = np.ones(len(_aIdxA), dtype=bool)
+    for aAxis in (*lAxesA, *lAxesB):
+        dDist = np.abs(np.einsum("ij,ij->i", aD, aAxis))
+        aRadA = aHalfA[:, 0] * np.abs(np.einsum("ij,ij->i", lAxesA[0], aAxis))
+        aRadA += aHalfA[:, 1] * np.abs(np.einsum("ij,ij->i", lAxesA[1], aAxis))
+        aRadB = aHalfB[:, 0] * np.abs(np.einsum("ij,ij->i", lAxesB[0], aAxis))
+        aRadB += aHalfB[:, 1] * np.abs(np.einsum("ij,ij->i", lAxesB[1], aAxis))
+        aOverlap &= dDist <= aRadA + aRadB
+    # endfor
+
+    return aOverlap
+
+
+# enddef
+
+
+###############################################################################
+# Finds overlapping footprints of vehicles over a range of frames.
+#   _lVehicles: list of tuples (vehicle name, vehicle model, active interval),
+#       where the active interval (start time, end time) limits the times
+#       at which the vehicle is present, or is None.
+#   _lFrames: frame range as (first frame, last frame)
+#   _dFps: frames per second used to convert frames to model time
+#   iFrameStep: step between the tested frames
+# Returns a dictionary of the lists of overlapping frame intervals
+# (first frame, last frame) by pairs of vehicle names.
+def FindConflicts(_lVehicles, _lFrames, _dFps, *, iFrameStep=1):
+
+    aFrames = np.arange(int(_lFrames[0]), int(_lFrames[1]) + 1, iFrameStep)
+    aTimes = aFrames / _dFps
+
+    lNames = []
+    lFootprints = []
+    lActive = []
+    for sName, xModel, tActive in _lVehicles:
+        tExtents = annotation.GetRigExtents(xModel.objFAC)
+        if tExtents is None:
+            continue
+        # endif
+
+        lNames.append(sName)
+        lFootprints.append(bev.GetFootprints(xModel, aTimes, tExtents))
+        if tActive is None:
+            lActive.append(np.ones(len(aTimes), dtype=bool))
+        else:
+            lActive.append((aTimes >= tActive[0]) & (aTimes <= tActive[1]))
+        # endif
+    # endfor
+
+    if len(lNames) < 2:
+        return {}
+    # endif
+
+    # Arrays of shape (vehicles, times, ...)
+    aPosAll = np.stack([x[0] for x in lFootprints])
+    aAxisXAll = np.stack([x[1] for x in lFootprints])
+    aAxisYAll = np.stack([x[2] for x in lFootprints])
+    aHalf = np.stack([x[4] for x in lFootprints])
+    aActiveAll = np.stack(lActive)
+
+    dCellSize = 2.0 * float(np.max(np.linalg.norm(aHalf, axis=1)))
+
+    dicFrames = {}
+    for iIdx, iFrame in enumerate(aFrames):
+        aVehicles = np.flatnonzero(aActiveAll[:, iIdx])
+        aPos = aPosAll[aVehicles, iIdx]
+
+        aIdxA, aIdxB = _GetCandidatePairs(aPos, dCellSize)
+        if len(aIdxA) == 0:
+            continue
+        # endif
+
+        aOverlap = _TestOverlap(
+            aPos, aAxisXAll[aVehicles, iIdx], aAxisYAll[aVehicles, iIdx], aHalf[aVehicles], aIdxA, aIdxB
+        )
+
+        for iA, iB in zip(aVehicles[aIdxA[aOverlap]], aVehicles[aIdxB[aOverlap]]):
+            tPair = tuple(sorted((lNames[iA], lNames[iB])))
+            dicFrames.setdefault(tPair, []).append(int(iFrame))
+        # endfor
+    # endfor
+
+    # Merge the frames of each pair to intervals
+    dicConflicts = {}
+    for tPair, lPairFrames in dicFrames.items():
+        lIntervals = []
+        for iFrame in sorted(lPairFrames):
+            if len(lIntervals) > 0 and iFrame - lIntervals[-1][1] <= iFrameStep:
+                lIntervals[-1][1] = iFrame
+            else:
+                lIntervals.append([iFrame, iFrame])
+            # endif
+        # endfor
+        dicConflicts[tPair] = [tuple(x) for x in lIntervals]
+    # endfor
+
+    return dicConflicts
+
+
+# enddef
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cull.py
+# Created Date: Monday, October 19th 2026, 6:02:37 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Culling of vehicle pose updates by the distance to, and the view
+# frustum of the active camera.
+
+import math
+import mathutils
+
+# Cull levels of a vehicle
+iCullNone = 0  # set the full pose
+iCullRoot = 1  # only set the root transform
+iCullSkip = 2  # do not update the vehicle
+
+# Last evaluated frustum and the key it was evaluated for
+tFrustumKey = None
+dicFrustum = None
+
+
+###############################################################################
+# Returns the planes of the camera frustum in camera coordinates, as list
+# of tuples (normal x, normal y, normal z, offset). Points inside the
+# frustum have a positive distance to all planes. The near and far planes
+# are not included.
+def _GetFramePlanes(_xCamera, _xScene):
+
+    lCorners = [mathutils.Vector(x) for x in _xCamera.view_frame(scene=_xScene)]
+    vCenter = sum(lCorners, mathutils.Vector((0.0, 0.0, 0.0))) / len(lCorners)
+    bIsOrtho = _xCamera.type == "ORTHO"
+
+    lPlanes = []
+    for iIdx, vCorner in enumerate(lCorners):
+        vEdge = lCorners[(iIdx + 1) % len(lCorners)] - vCorner
+        if bIsOrtho:
+            vDir = mathutils.Vector((0.0, 0.0, -1.0))
+        else:
+            vDir = vCorner
+        # endif
+
+        vNormal = vEdge.cross(vDir).normalized()
+        dOffset = vNormal.dot(vCorner)
+        if vNormal.dot(vCenter) - dOffset < 0.0:
+            vNormal.negate()
+            dOffset = -dOffset
+        # endif
+        lPlanes.append((*vNormal, dOffset))
+    # endfor
+
+    return lPlanes
+
+
+# enddef
+
+
+###############################################################################
+# Returns the frustum of the scene's active camera for culling,
+# or None if the scene has no camera.
+def GetSceneFrustum(_xScene, *, dDistance, dMargin):
+
+    global tFrustumKey, dicFrustum
+
+    objCam = _xScene.camera
+    if objCam is None or objCam.type != "CAMERA":
+        return None
+    # endif
+
+    # The camera need only be evaluated once per frame
+    tKey = (
+        _xScene.name,
+        _xScene.frame_current,
+        _xScene.frame_subframe,
+        objCam.name,
+        tuple(tuple(x) for x in objCam.matrix_world),
+        dDistance,
+        dMargin,
+    )
+    if tKey == tFrustumKey:
+        return dicFrustum
+    # endif
+
+    xCamera = objCam.data
+    tFrustumKey = tKey
+    dicFrustum = {
+        "tWorldToCam": tuple(tuple(x) for x in objCam.matrix_world.normalized().inverted()),
+        "lPlanes": _GetFramePlanes(xCamera, _xScene),
+        "dClipEnd": xCamera.clip_end,
+        "dDistance": dDistance,
+        "dMargin": dMargin,
+    }
+
+    return dicFrustum
+
+
+# enddef
+
+
+###############################################################################
+# Returns the cull level of a bounding sphere in world coordinates.
+# The position is given as tuple of floats.
+def GetCullLevel(_dicFrustum, _tPos, _dRadius):
+
+    dX, dY, dZ = _tPos[0:3]
+    tM = _dicFrustum["tWorldToCam"]
+    dCx = tM[0][0] * dX + tM[0][1] * dY + tM[0][2] * dZ + tM[0][3]
+    dCy = tM[1][0] * dX + tM[1][1] * dY + tM[1][2] * dZ + tM[1][3]
+    dCz = tM[2][0] * dX + tM[2][1] * dY + tM[2][2] * dZ + tM[2][3]
+
+    dRadius = _dRadius + _dicFrustum["dMargin"]
+
+    # The camera looks along its negative z-axis
+    if dCz > dRadius or -dCz > _dicFrustum["dClipEnd"] + dRadius:
+        return iCullSkip
+    # endif
+
+    for dNx, dNy, dNz, dOffset in _dicFrustum["lPlanes"]:
+        if dNx * dCx + dNy * dCy + dNz * dCz - dOffset < -dRadius:
+            return iCullSkip
+        # endif
+    # endfor
+
+    dDist = math.sqrt(dCx * dCx + dCy * dCy + dCz * dCz)
+    if dDist - _dRadius > _dicFrustum["dDistance"]:
+        return iCullRoot
+    # endif
+
+    return iCullNone
+
+
+# enddef
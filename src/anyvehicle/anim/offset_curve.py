@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \offset_curve.py
+# Created Date: Wednesday, October 21st 2026, 6:24:05 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Tables of a centerline and the curves at lateral offsets from it, which
+# only depend on numpy, so that they can be evaluated outside of Blender.
+
+import numpy as np
+
+# The offset is limited on the inner side of curves to this fraction of the
+# curve radius, so that the offset curve has no cusps or loops.
+dMaxOffsetRatio = 0.9
+
+# Maximal change of a reduced offset per unit length along the centerline,
+# so that the offset curve blends into and out of the reduced offset.
+dMaxOffsetSlope = 0.5
+
+
+###############################################################################
+# Evaluates the tables of a centerline from its (N, 3) points: the unit
+# normals in the plane perpendicular to the up vector, pointing to the left,
+# and the curvatures with the sign of the rotation about the up vector.
+def EvalCenterlineTables(_aPos, _aUp):
+
+    aDeriv = np.gradient(_aPos, axis=0)
+    aDeriv2 = np.gradient(aDeriv, axis=0)
+
+    aNormal = np.cross(_aUp, aDeriv)
+    aNormalLen = np.linalg.norm(aNormal, axis=1)
+    aNormal = np.divide(
+        aNormal, aNormalLen[:, np.newaxis], out=np.zeros_like(aNormal), where=aNormalLen[:, np.newaxis] > 0.0
+    )
+
+    aSpeed = np.linalg.norm(aDeriv, axis=1)
+    aCurvSigned = np.divide(
+        np.cross(aDeriv, aDeriv2) @ _aUp, aSpeed * aSpeed * aSpeed, out=np.zeros_like(aSpeed), where=aSpeed > 0.0
+    )
+
+    return {"aPos": _aPos, "aNormal": aNormal, "aCurvSigned": aCurvSigned}
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the (N, 3) points of the curve at the lateral offset _dOffset
+# from the centerline, where positive offsets are to the left. On the inner
+# side of tight curves, the offset is reduced to dMaxOffsetRatio of the
+# curve radius, where the offset curve would otherwise form a cusp.
+# The reduced offset changes by at most dMaxOffsetSlope per unit length,
+# which is ensured by a forward and a backward pass over the samples.
+def EvalOffsetCurve(_dicCenterline, _dOffset):
+
+    aPos = _dicCenterline["aPos"]
+    aCurvSigned = _dicCenterline["aCurvSigned"]
+
+    # Limit of the absolute offset per sample
+    aLimit = np.full(len(aCurvSigned), abs(_dOffset))
+    aIsCusp = aCurvSigned * _dOffset > dMaxOffsetRatio
+    aLimit[aIsCusp] = dMaxOffsetRatio / np.abs(aCurvSigned[aIsCusp])
+
+    if np.any(aIsCusp):
+        aLen = np.zeros(len(aPos))
+        np.cumsum(np.linalg.norm(np.diff(aPos, axis=0), axis=1), out=aLen[1:])
+        aSlope = dMaxOffsetSlope * aLen
+        aLimit = aSlope + np.minimum.accumulate(aLimit - aSlope)
+        aLimit = np.minimum.accumulate((aLimit + aSlope)[::-1])[::-1] - aSlope
+    # endif
+
+    aOffset = np.copysign(aLimit, _dOffset)
+
+    return aPos + aOffset[:, np.newaxis] * _dicCenterline["aNormal"]
+
+
+# enddef
@@ -27,15 +27,77 @@
 ###
 
 import bpy
+from bpy.app.handlers import persistent
 import mathutils
+import numpy as np
+import anyblend
 import pyjson5 as json
 
 from . import util
+from . import track
+from . import pose_bake
+from . import track_store
+from . import cull
+from . import annotation
+from . import bev
+from . import conflict
+from . import clearance
+from . import centerline
+from .cls_pose_bake import CPoseBake
+from .cls_track_precompute import CTrackPrecompute
+from .cls_motion_interval_index import CMotionIntervalIndex
+from .cls_track_point_index import CTrackPointIndex
+from .cls_planar_single_track_model import CPlanarSingleTrackModel
 from .cls_planar_single_track_2w_model import CPlanarSingleTrack2wModel
 from .cls_planar_single_track_4w_model import CPlanarSingleTrack4wModel
+from .cls_planar_single_track_naxle_model import CPlanarSingleTrackNaxleModel
+from .cls_planar_diff_drive_model import CPlanarDiffDriveModel
 
 dicModels = {}
 
+# If not None, the track evaluations of newly created models are
+# collected in this list, instead of being evaluated immediately.
+lDeferredTracks = None
+
+# Evaluated track tables by vehicle object name, together with
+# the hash of the snapshot they were evaluated from.
+dicTrackCache = {}
+
+# Background evaluation of track tables and the models waiting for them
+xTrackPrecompute = CTrackPrecompute()
+dicPendingTracks = {}
+
+# Opened pose bake files by file path
+dicPoseBakes = {}
+
+# Pose bake and vehicle name in the bake of replayed vehicles,
+# by vehicle object name
+dicBakeReplays = {}
+
+# Motion intervals of all models, and the keys of the model state the
+# index was built for and of the last dispatched frame.
+xMotionIndex = CMotionIntervalIndex()
+tMotionIndexKey = None
+tDispatchKey = None
+
+# Objects of vehicles that are hidden while parked, by vehicle object name
+dicHideObjects = {}
+
+# Original visibility flags of the objects of the currently hidden vehicles,
+# by vehicle object name. The flags are restored before the file is saved,
+# so that hiding parked vehicles does not change the saved file.
+dicHiddenFlags = {}
+
+# Vehicles that were hidden when the file was saved, to hide them again
+lHiddenOnSave = []
+
+# Nearest point indices of the vehicle tracks by vehicle object name
+dicPointIndices = {}
+
+# Errors of the track evaluation or of the schedule of the last applied
+# track by vehicle object name, which are reported by the operators and the UI
+dicTrackErrors = {}
+
 
 ###############################################################################
 def GetAnimModel(_sObj):
@@ -103,6 +165,16 @@ def RemoveAnimHandler(_sObj):
         del dicModels[_sObj]
     # endif
 
+    dicPointIndices.pop(_sObj, None)
+    dicTrackErrors.pop(_sObj, None)
+
+    if _sObj in dicHideObjects:
+        _SetVehiclesHidden([_sObj], False)
+        del dicHideObjects[_sObj]
+    # endif
+
+    InvalidateMotionIndex()
+
 
 # enddef
 
@@ -138,6 +210,25 @@ def _GetObject(_sId, _dicAnim, bDoThrow=True):
 # enddef
 
 
+###############################################################################
+# Returns the objects of an optional list of object names
+def _GetObjectList(_sId, _dicAnim):
+
+    lObjects = []
+    for sObj in _dicAnim.get(_sId, []):
+        objX = bpy.data.objects.get(sObj)
+        if objX is None:
+            raise Exception("Object '{0}' does not exist.".format(sObj))
+        # endif
+        lObjects.append(objX)
+    # endfor
+
+    return lObjects
+
+
+# enddef
+
+
 ###############################################################################
 def _GetPar(_sId, _dicAnim, _sObj):
     xVal = _dicAnim.get(_sId)
@@ -153,102 +244,1234 @@ def _GetPar(_sId, _dicAnim, _sObj):
 
 
 ###############################################################################
-def CreatePlanarSingleTrack2wHandler(_objAnim, _dicAnim):
+def GetSceneTime(_xScene):
 
-    global dicModels
+    dFps = _xScene.render.fps / _xScene.render.fps_base
+    return _xScene.frame_current / dFps
 
-    sObj = _objAnim.name
-    vZ = mathutils.Vector((0, 0, 1))
 
-    xModel = CPlanarSingleTrack2wModel(
-        FixedAxisOrigObj=_GetObject("sObjFAC", _dicAnim),
-        FixedAxisRollObj=_GetObject("sObjFAR", _dicAnim),
-        FixedAxisSpinObj=_GetObject("sObjFAS", _dicAnim),
-        SteerAxisOrigObj=_GetObject("sObjSAC", _dicAnim),
-        SteerAxisTiltObj=_GetObject("sObjSAT", _dicAnim),
-        SteerAxisOrientObj=_GetObject("sObjSATO", _dicAnim),
-        SteerAxisSpinObj=_GetObject("sObjSATS", _dicAnim),
-        RotOrigObj=_GetObject("sObjRot", _dicAnim, bDoThrow=False),
-        NurbsCurve=_GetObject("sObjNurbsPath", _dicAnim),
-        VectorUp=vZ,
-        Speed_kmh=_GetPar("fMeanSpeed", _dicAnim, sObj),
-        WheelRadius=_GetPar("fWheelRadius", _dicAnim, sObj),
-    )
+# enddef
 
-    xModel.EvalTrack(Resolution=_GetPar("iResolution", _dicAnim, sObj))
 
-    dicModels[sObj] = xModel
+###############################################################################
+# Returns the camera frustum used to cull vehicle updates,
+# or None if culling is disabled in the scene.
+def GetCullFrustum(_xScene):
+
+    if not getattr(_xScene, "AnyVehicleCullEnabled", False):
+        return None
+    # endif
 
-    return _CreateModelHandler(sObj)
+    return cull.GetSceneFrustum(_xScene, dDistance=_xScene.AnyVehicleCullDistance, dMargin=_xScene.AnyVehicleCullMargin)
 
 
 # enddef
 
 
 ###############################################################################
-def CreatePlanarSingleTrack4wHandler(_objAnim, _dicAnim):
+# Forces the motion index to be rebuilt and all vehicles to be set
+# on the next frame change.
+def InvalidateMotionIndex():
 
-    global dicModels
+    global tMotionIndexKey, tDispatchKey
+    tMotionIndexKey = None
+    tDispatchKey = None
 
-    sObj = _objAnim.name
-    vZ = mathutils.Vector((0, 0, 1))
 
-    xModel = CPlanarSingleTrack4wModel(
-        FixedAxisOrigObj=_GetObject("sObjFAC", _dicAnim),
-        FixedAxisLeftObj=_GetObject("sObjFAL", _dicAnim),
-        FixedAxisRightObj=_GetObject("sObjFAR", _dicAnim),
-        FixedAxisLeftSpinObj=_GetObject("sObjFALS", _dicAnim),
-        FixedAxisRightSpinObj=_GetObject("sObjFARS", _dicAnim),
-        SteerAxisOrigObj=_GetObject("sObjSAC", _dicAnim),
-        SteerAxisLeftObj=_GetObject("sObjSAL", _dicAnim),
-        SteerAxisRightObj=_GetObject("sObjSAR", _dicAnim),
-        SteerAxisLeftSpinObj=_GetObject("sObjSALS", _dicAnim),
-        SteerAxisRightSpinObj=_GetObject("sObjSARS", _dicAnim),
-        RotOrigObj=_GetObject("sObjRot", _dicAnim, bDoThrow=False),
-        NurbsCurve=_GetObject("sObjNurbsPath", _dicAnim),
-        VectorUp=vZ,
-        Speed_kmh=_GetPar("fMeanSpeed", _dicAnim, sObj),
-        WheelRadius=_GetPar("fWheelRadius", _dicAnim, sObj),
-    )
+# enddef
 
-    xModel.EvalTrack(Resolution=_GetPar("iResolution", _dicAnim, sObj))
 
-    dicModels[sObj] = xModel
+###############################################################################
+def _SetObjectHidden(_objX, _bViewport, _bRender):
 
-    return _CreateModelHandler(sObj)
+    try:
+        if _objX.hide_viewport != _bViewport:
+            _objX.hide_viewport = _bViewport
+        # endif
+        if _objX.hide_render != _bRender:
+            _objX.hide_render = _bRender
+        # endif
+    except ReferenceError:
+        # The object has been deleted
+        pass
+    # endtry
 
 
 # enddef
 
 
 ###############################################################################
-def _CreateModelHandler(_sId):
+# Hides or shows the objects of vehicles. The original flags of the objects
+# are kept while a vehicle is hidden and are restored when it is shown.
+def _SetVehiclesHidden(_lNames, _bHide):
+
+    for sObj in _lNames:
+        if _bHide:
+            lFlags = dicHiddenFlags.get(sObj)
+            if lFlags is None:
+                lFlags = [(objX, objX.hide_viewport, objX.hide_render) for objX in dicHideObjects.get(sObj, [])]
+                dicHiddenFlags[sObj] = lFlags
+            # endif
+
+            for objX, bViewport, bRender in lFlags:
+                _SetObjectHidden(objX, True, True)
+            # endfor
+        else:
+            for objX, bViewport, bRender in dicHiddenFlags.pop(sObj, []):
+                _SetObjectHidden(objX, bViewport, bRender)
+            # endfor
+        # endif
+    # endfor
 
-    ##############################################
-    def handler(xScene, xDepsGraph):
 
-        global dicModels
-        xModel = dicModels.get(_sId)
-        if xModel is None:
-            raise Exception(
-                "Vehicle animation model with '{0}' not available.".format(_sId)
-            )
+# enddef
+
+
+###############################################################################
+# Shows all vehicles that are hidden while parked, with their original
+# visibility flags. Returns the names of the vehicles that were hidden.
+def ShowHiddenVehicles():
+
+    lNames = list(dicHiddenFlags.keys())
+    _SetVehiclesHidden(lNames, False)
+    return lNames
+
+
+# enddef
+
+
+###############################################################################
+# Sets all vehicle models for the current frame. This is called by the
+# frame change handlers of all vehicles, but only the first call per frame
+# sets the vehicles. Using the motion index, only moving vehicles are set,
+# while parked vehicles are set once, when they stop moving.
+def _DispatchFrame(_xScene):
+
+    global tMotionIndexKey, tDispatchKey
+
+    tKey = (_xScene.name, _xScene.frame_current, _xScene.frame_subframe)
+    if tKey == tDispatchKey:
+        return
+    # endif
+    tDispatchKey = tKey
+
+    tIndexKey = (len(dicModels), CPlanarSingleTrackModel.iMotionRevision)
+    if tIndexKey != tMotionIndexKey:
+        xMotionIndex.Build(dicModels)
+        tMotionIndexKey = tIndexKey
+    # endif
+
+    dTime = GetSceneTime(_xScene)
+    lMoving, lStarted, lParked = xMotionIndex.Update(dTime)
+
+    # Vehicles that stay parked are set again, if their curve moved,
+    # e.g. because it is animated, constrained or parented.
+    setDispatched = set(lMoving)
+    setDispatched.update(lParked)
+    for sObj, xModel in dicModels.items():
+        if sObj not in setDispatched and xModel.IsTrackAvailable() and xModel.UpdateCurveMatrix():
+            xModel.ClearLastPose()
+            lParked.append(sObj)
         # endif
+    # endfor
+
+    if len(dicHideObjects) > 0:
+        _SetVehiclesHidden(lParked, True)
+        _SetVehiclesHidden(lStarted, False)
+    # endif
+
+    # Parked vehicles are not culled, as they are not set again
+    # when they come into view.
+    for sObj in lParked:
+        dicModels[sObj].SetObjectToTime(dTime, UpdateViewLayer=False)
+    # endfor
+
+    xFrustum = GetCullFrustum(_xScene)
+    for sObj in lMoving:
+        dicModels[sObj].SetObjectToTime(dTime, Frustum=xFrustum, UpdateViewLayer=False)
+    # endfor
+
+    # Baked vehicles are culled like moving vehicles. Outside of the
+    # baked frame range the pose does not change and is not set again.
+    dSceneFrame = _xScene.frame_current + _xScene.frame_subframe
+    for sObj, (xBake, sBakeName) in dicBakeReplays.items():
+        dFrame = min(max(dSceneFrame, xBake.iFrameFirst), xBake.iFrameFirst + xBake.iFrameCount - 1)
+        dicModels[sObj].SetObjectToPose(
+            xBake.GetPose(sBakeName, dFrame), dFrame / xBake.dFps, Frustum=xFrustum, UpdateViewLayer=False
+        )
+    # endfor
+
+    # Ensure that location and matrix_world properties are consistent
+    if len(lMoving) > 0 or len(lParked) > 0 or len(dicBakeReplays) > 0:
+        anyblend.viewlayer.Update()
+    # endif
+
+
+# enddef
+
+
+###############################################################################
+# Start collecting the track evaluations of models created by subsequent
+# calls to the handler factories. The tracks are evaluated in parallel
+# by FinishDeferredTrackEval().
+def StartDeferredTrackEval():
+
+    global lDeferredTracks
+    lDeferredTracks = []
+
+
+# enddef
+
+
+###############################################################################
+# Stops collecting track evaluations and returns the list of collected
+# tracks, without evaluating them. Each element is a tuple of the vehicle
+# object name, the model, the track snapshot and the snapshot's hash.
+def TakeDeferredTracks():
+
+    global lDeferredTracks
+
+    lTracks = lDeferredTracks
+    lDeferredTracks = None
+    if lTracks is None:
+        return []
+    # endif
+
+    return lTracks
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates all tracks collected since StartDeferredTrackEval() in a pool of
+# worker threads. Only reading the Blender data before and setting the
+# objects afterwards is done on the main thread.
+def FinishDeferredTrackEval(*, iWorkerCount=None):
+
+    lTracks = TakeDeferredTracks()
+    if len(lTracks) == 0:
+        return
+    # endif
 
-        dFps = xScene.render.fps / xScene.render.fps_base
-        dTime = xScene.frame_current / dFps
+    lTables = track.EvalTrackTablesParallel([x[2] for x in lTracks], iWorkerCount=iWorkerCount)
+
+    dTime = GetSceneTime(bpy.context.scene)
+    for tTrack, dicTrack in zip(lTracks, lTables):
+        sObj, xModel, dicSnapshot, sHash = tTrack
+        _ApplyModelTrack(sObj, xModel, dicTrack, sHash)
         xModel.SetObjectToTime(dTime)
+    # endfor
 
-    # enddef
 
-    ##############################################
-    def finalizer():
+# enddef
 
-        global dicModels
-        if dicModels.get(_sId):
-            del dicModels[_sId]
+
+###############################################################################
+def _UpdateTrackError(_sObj, _xModel):
+
+    sError = _xModel.GetScheduleError()
+    if sError is None:
+        dicTrackErrors.pop(_sObj, None)
+    else:
+        dicTrackErrors[_sObj] = sError
+    # endif
+
+
+# enddef
+
+
+###############################################################################
+# Returns a dictionary of the error messages of the vehicle tracks by
+# vehicle object name. Do not modify the returned dictionary.
+def GetTrackErrors():
+    return dicTrackErrors
+
+
+# enddef
+
+
+###############################################################################
+# Sets the error message shown for the tracks under the given key, which is
+# a vehicle object name, or another label for errors not related to a single
+# vehicle. If the message is None, the error is removed.
+def SetTrackError(_sKey, _sText):
+
+    if _sText is None:
+        dicTrackErrors.pop(_sKey, None)
+    else:
+        dicTrackErrors[_sKey] = _sText
+    # endif
+
+
+# enddef
+
+
+###############################################################################
+def _ApplyModelTrack(_sObj, _xModel, _dicTrack, _sHash):
+
+    _xModel.ApplyTrack(_dicTrack)
+    dicTrackCache[_sObj] = (_sHash, _dicTrack)
+    _UpdateTrackError(_sObj, _xModel)
+
+
+# enddef
+
+
+###############################################################################
+def _EvalModelTrack(_sObj, _xModel, _iResolution):
+
+    # Use track tables stored in the Blender file, if they are still valid
+    objAnim = bpy.data.objects.get(_sObj)
+    if objAnim is not None and track_store.sTrackStoreKey in objAnim:
+        sSourceHash = _xModel.GetTrackSourceHash(Resolution=_iResolution)
+        dicTrack = track_store.LoadTrack(objAnim, sSourceHash)
+        if dicTrack is not None:
+            _xModel.RestoreTrack(dicTrack, Resolution=_iResolution, SourceHash=sSourceHash)
+            _UpdateTrackError(_sObj, _xModel)
+            return
+        # endif
+    # endif
+
+    dicSnapshot = _xModel.SnapshotTrack(Resolution=_iResolution)
+    sHash = track.GetSnapshotHash(dicSnapshot)
+
+    # Use previously evaluated track tables if the snapshot has not changed
+    tCache = dicTrackCache.get(_sObj)
+    if tCache is not None and tCache[0] == sHash:
+        _xModel.ApplyTrack(tCache[1])
+        _UpdateTrackError(_sObj, _xModel)
+        return
+    # endif
+
+    if lDeferredTracks is not None:
+        lDeferredTracks.append((_sObj, _xModel, dicSnapshot, sHash))
+    else:
+        dicTrack = track.EvalTrackTables(dicSnapshot)
+        _ApplyModelTrack(_sObj, _xModel, dicTrack, sHash)
+    # endif
+
+
+# enddef
+
+
+###############################################################################
+# Stores the track tables of all models with evaluated tracks at their
+# vehicle root objects, so that they are saved with the Blender file.
+def StoreModelTracks():
+
+    for sObj, xModel in dicModels.items():
+        objAnim = bpy.data.objects.get(sObj)
+        if objAnim is None or not xModel.IsTrackAvailable():
+            continue
+        # endif
+        track_store.StoreTrack(objAnim, xModel.sTrackSourceHash, xModel.dicTrack)
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+def IsBackgroundTrackEvalRunning():
+    return xTrackPrecompute.IsRunning() or len(dicPendingTracks) > 0
+
+
+# enddef
+
+
+###############################################################################
+# Returns the number of evaluated tracks and the total number of tracks
+# of the running background evaluation.
+def GetBackgroundTrackEvalProgress():
+    return xTrackPrecompute.GetProgress()
+
+
+# enddef
+
+
+###############################################################################
+# Returns a dictionary of the current evaluation stage and the fraction
+# of the stage that is done, by name of the vehicles being evaluated.
+def GetBackgroundTrackEvalStages():
+    return xTrackPrecompute.GetJobStages()
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the tracks returned by TakeDeferredTracks() in a background thread.
+# The evaluated tracks are applied to the models by a timer function,
+# so that Blender stays responsive in the mean time.
+def StartBackgroundTrackEval(_lTracks, *, iWorkerCount=None):
+
+    if IsBackgroundTrackEvalRunning():
+        raise Exception("Vehicle track evaluation is already running.")
+    # endif
+
+    lJobs = []
+    for sObj, xModel, dicSnapshot, sHash in _lTracks:
+        dicPendingTracks[sObj] = (xModel, sHash)
+        lJobs.append((sObj, dicSnapshot))
+    # endfor
+
+    xTrackPrecompute.Start(lJobs, iWorkerCount=iWorkerCount)
+
+    if not bpy.app.timers.is_registered(_ApplyBackgroundTracks):
+        bpy.app.timers.register(_ApplyBackgroundTracks, first_interval=0.1)
+    # endif
+
+
+# enddef
+
+
+###############################################################################
+def CancelBackgroundTrackEval():
+    xTrackPrecompute.Cancel()
+
+
+# enddef
+
+
+###############################################################################
+def _TagRedrawViews():
+
+    xWindowManager = bpy.context.window_manager
+    if xWindowManager is None:
+        return
+    # endif
+
+    for xWindow in xWindowManager.windows:
+        for xArea in xWindow.screen.areas:
+            if xArea.type == "VIEW_3D":
+                xArea.tag_redraw()
+            # endif
+        # endfor
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+# Timer function that applies the tracks evaluated in the background
+def _ApplyBackgroundTracks():
+
+    dTime = GetSceneTime(bpy.context.scene)
+
+    bRunning, lResults = xTrackPrecompute.PopResultsAndState()
+    bApplied = False
+    for sObj, xResult in lResults:
+        xModel, sHash = dicPendingTracks.pop(sObj, (None, None))
+
+        # Ignore results for models that have been replaced in the mean time
+        if xModel is None or dicModels.get(sObj) is not xModel:
+            continue
+        # endif
+
+        if isinstance(xResult, Exception):
+            dicTrackErrors[sObj] = "Error evaluating track: {0}".format(str(xResult))
+            continue
         # endif
 
+        _ApplyModelTrack(sObj, xModel, xResult, sHash)
+        xModel.SetObjectToTime(dTime, UpdateViewLayer=False)
+        bApplied = True
+    # endfor
+
+    # Ensure that location and matrix_world properties are consistent
+    if bApplied:
+        anyblend.viewlayer.Update()
+    # endif
+
+    _TagRedrawViews()
+
+    if bRunning:
+        return 0.1
+    # endif
+
+    # Models whose tracks were not evaluated, because the evaluation was
+    # cancelled, stay without track data and are not animated.
+    dicPendingTracks.clear()
+    return None
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the track of a model again, after its curve or rig has been edited.
+# Only the span of the track that depends on changed curve points is evaluated.
+def _UpdateModelTrack(_sObj, _xModel):
+
+    dicSnapshot = _xModel.SnapshotTrack(Resolution=_xModel.iResolution)
+    sHash = track.GetSnapshotHash(dicSnapshot)
+
+    tCache = dicTrackCache.get(_sObj)
+    if tCache is not None and tCache[0] == sHash:
+        return False
+    # endif
+
+    dicTrack = track.UpdateTrackTables(_xModel.dicTrack, dicSnapshot)
+    _ApplyModelTrack(_sObj, _xModel, dicTrack, sHash)
+
+    return True
+
+
+# enddef
+
+
+###############################################################################
+# Handler
+# Undo and redo restore the vehicle objects without a change of the frame
+# or a depsgraph update of the models' curves, so the poses are set again.
+@persistent
+def AnyVehicle_ResetPoses(_xScene, *args):
+
+    if len(dicModels) == 0:
+        return
+    # endif
+
+    for xModel in dicModels.values():
+        xModel.ClearLastPose()
+    # endfor
+    InvalidateMotionIndex()
+    _DispatchFrame(bpy.context.scene)
+
+
+# enddef
+
+
+###############################################################################
+# Handler
+# Vehicles that are hidden while parked are shown before the file is saved,
+# so that the saved visibility flags do not depend on the saved frame.
+@persistent
+def AnyVehicle_ShowVehiclesOnSave(_xScene, *args):
+    global lHiddenOnSave
+
+    lHiddenOnSave = ShowHiddenVehicles()
+
+
+# enddef
+
+
+###############################################################################
+# Handler
+@persistent
+def AnyVehicle_HideVehiclesAfterSave(_xScene, *args):
+    global lHiddenOnSave
+
+    _SetVehiclesHidden([sObj for sObj in lHiddenOnSave if sObj in dicHideObjects], True)
+    lHiddenOnSave = []
+
+
+# enddef
+
+
+###############################################################################
+# Handler
+# Restores the visibility of the hidden vehicles, before another file is loaded.
+@persistent
+def AnyVehicle_ShowVehiclesOnLoad(_xScene, *args):
+    global lHiddenOnSave
+
+    ShowHiddenVehicles()
+    lHiddenOnSave = []
+
+
+# enddef
+
+
+###############################################################################
+# Handler
+@persistent
+def AnyVehicle_UpdateTracks(_xScene, _xDepsGraph):
+
+    setGeometry = set()
+    setTransform = set()
+    setUpdated = set()
+    for xUpdate in _xDepsGraph.updates:
+        if not isinstance(xUpdate.id, bpy.types.Object):
+            continue
+        # endif
+
+        objX = xUpdate.id.original
+        if xUpdate.is_updated_geometry:
+            setGeometry.add(objX.name)
+            setUpdated.add(objX.as_pointer())
+        # endif
+        if xUpdate.is_updated_transform:
+            setTransform.add(objX.name)
+            setUpdated.add(objX.as_pointer())
+        # endif
+    # endfor
+
+    if len(setGeometry) == 0 and len(setTransform) == 0:
+        return
+    # endif
+
+    # The tessellations of edited curves and the meshes of edited terrains
+    # are evaluated again. This is also needed while no models exist,
+    # since the cached data is used by models created later.
+    for sName in setGeometry:
+        centerline.InvalidateCurve(sName)
+    # endfor
+    clearance.InvalidateGeometry(setGeometry)
+
+    if len(dicModels) == 0 or lDeferredTracks is not None:
+        return
+    # endif
+
+    dTime = None
+    for sObj, xModel in list(dicModels.items()):
+        if not xModel.IsTrackAvailable() or sObj in dicPendingTracks:
+            continue
+        # endif
+
+        sCurve = xModel.xCurve.name
+        bUpdate = sCurve in setGeometry
+        bUpdate = bUpdate or xModel.IsRigEdited(setUpdated)
+
+        # The ground below the vehicle changes with its terrain,
+        # and with the placement of its curve on the terrain.
+        if xModel.objTerrain is not None:
+            setTerrain = {sCurve, xModel.objTerrain.name}
+            bUpdate = bUpdate or not setTerrain.isdisjoint(setGeometry | setTransform)
+        # endif
+
+        bChanged = False
+        if bUpdate:
+            bChanged = _UpdateModelTrack(sObj, xModel)
+        # endif
+
+        # Moving the curve object only changes the vehicle's world placement
+        if bChanged or sCurve in setTransform:
+            if dTime is None:
+                dTime = GetSceneTime(_xScene)
+            # endif
+            xModel.ClearLastPose()
+            xModel.SetObjectToTime(dTime)
+        # endif
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+def CreatePlanarSingleTrack2wHandler(_objAnim, _dicAnim):
+
+    global dicModels
+
+    sObj = _objAnim.name
+    vZ = mathutils.Vector((0, 0, 1))
+
+    xModel = CPlanarSingleTrack2wModel(
+        FixedAxisOrigObj=_GetObject("sObjFAC", _dicAnim),
+        FixedAxisRollObj=_GetObject("sObjFAR", _dicAnim),
+        FixedAxisSpinObj=_GetObject("sObjFAS", _dicAnim),
+        SteerAxisOrigObj=_GetObject("sObjSAC", _dicAnim),
+        SteerAxisTiltObj=_GetObject("sObjSAT", _dicAnim),
+        SteerAxisOrientObj=_GetObject("sObjSATO", _dicAnim),
+        SteerAxisSpinObj=_GetObject("sObjSATS", _dicAnim),
+        RotOrigObj=_GetObject("sObjRot", _dicAnim, bDoThrow=False),
+        TerrainObj=_GetObject("sObjTerrain", _dicAnim, bDoThrow=False),
+        LateralOffset=_dicAnim.get("fLateralOffset", 0.0),
+        NurbsCurve=_GetObject("sObjNurbsPath", _dicAnim),
+        VectorUp=vZ,
+        Speed_kmh=_GetPar("fMeanSpeed", _dicAnim, sObj),
+        WheelRadius=_GetPar("fWheelRadius", _dicAnim, sObj),
+        TimeOffset=_dicAnim.get("fTimeOffset", 0.0),
+        PoseCacheSize=_dicAnim.get("iPoseCacheSize", 256),
+    )
+
+    return _InitModel(sObj, xModel, _dicAnim)
+
+
+# enddef
+
+
+###############################################################################
+def CreatePlanarSingleTrack4wHandler(_objAnim, _dicAnim):
+
+    global dicModels
+
+    sObj = _objAnim.name
+    vZ = mathutils.Vector((0, 0, 1))
+
+    xModel = CPlanarSingleTrack4wModel(
+        FixedAxisOrigObj=_GetObject("sObjFAC", _dicAnim),
+        FixedAxisLeftObj=_GetObject("sObjFAL", _dicAnim),
+        FixedAxisRightObj=_GetObject("sObjFAR", _dicAnim),
+        FixedAxisLeftSpinObj=_GetObject("sObjFALS", _dicAnim),
+        FixedAxisRightSpinObj=_GetObject("sObjFARS", _dicAnim),
+        SteerAxisOrigObj=_GetObject("sObjSAC", _dicAnim),
+        SteerAxisLeftObj=_GetObject("sObjSAL", _dicAnim),
+        SteerAxisRightObj=_GetObject("sObjSAR", _dicAnim),
+        SteerAxisLeftSpinObj=_GetObject("sObjSALS", _dicAnim),
+        SteerAxisRightSpinObj=_GetObject("sObjSARS", _dicAnim),
+        RotOrigObj=_GetObject("sObjRot", _dicAnim, bDoThrow=False),
+        TerrainObj=_GetObject("sObjTerrain", _dicAnim, bDoThrow=False),
+        LateralOffset=_dicAnim.get("fLateralOffset", 0.0),
+        AckermannSteer=_dicAnim.get("bAckermannSteer", False),
+        RearSteerCenter=_dicAnim.get("fRearSteerCenter", 0.0),
+        NurbsCurve=_GetObject("sObjNurbsPath", _dicAnim),
+        VectorUp=vZ,
+        Speed_kmh=_GetPar("fMeanSpeed", _dicAnim, sObj),
+        WheelRadius=_GetPar("fWheelRadius", _dicAnim, sObj),
+        TimeOffset=_dicAnim.get("fTimeOffset", 0.0),
+        PoseCacheSize=_dicAnim.get("iPoseCacheSize", 256),
+    )
+
+    return _InitModel(sObj, xModel, _dicAnim)
+
+
+# enddef
+
+
+###############################################################################
+# Returns the axles of an N-axle model from the list of axle specifications.
+# Each specification has the elements "lWheels", a list of dictionaries
+# with the mount and spin object names "sObjMount", "sObjSpin", and the
+# optional elements "bSteer" and "fWheelRadius". The wheel radius defaults
+# to the wheel radius of the vehicle.
+def _GetAxles(_lAxleSpecs, _dWheelRadius, *, bAllowSteer=True):
+
+    lAxles = []
+    for dicAxle in _lAxleSpecs:
+        bSteer = dicAxle.get("bSteer", False)
+        if bSteer and not bAllowSteer:
+            raise Exception("Axles of trailers cannot be steered.")
+        # endif
+        lAxles.append(
+            {
+                "bSteer": bSteer,
+                "dWheelRadius": dicAxle.get("fWheelRadius", _dWheelRadius),
+                "lWheels": [(_GetObject("sObjMount", x), _GetObject("sObjSpin", x)) for x in dicAxle["lWheels"]],
+            }
+        )
+    # endfor
+
+    return lAxles
+
+
+# enddef
+
+
+###############################################################################
+# Creates a vehicle with any number of axles from the "lAxles" list of
+# the animation specification, see _GetAxles(). The optional "lTrailers"
+# is a list of trailers with the elements "sObjHitch" and "lAxles",
+# see CPlanarSingleTrackNaxleModel.
+def CreatePlanarSingleTrackNaxleHandler(_objAnim, _dicAnim):
+
+    global dicModels
+
+    sObj = _objAnim.name
+    vZ = mathutils.Vector((0, 0, 1))
+    dWheelRadius = _GetPar("fWheelRadius", _dicAnim, sObj)
+
+    xModel = CPlanarSingleTrackNaxleModel(
+        FixedAxisOrigObj=_GetObject("sObjFAC", _dicAnim),
+        SteerAxisOrigObj=_GetObject("sObjSAC", _dicAnim),
+        Axles=_GetAxles(_GetPar("lAxles", _dicAnim, sObj), dWheelRadius),
+        Trailers=[
+            {"objHitch": _GetObject("sObjHitch", x), "lAxles": _GetAxles(x["lAxles"], dWheelRadius, bAllowSteer=False)}
+            for x in _dicAnim.get("lTrailers", [])
+        ],
+        RotOrigObj=_GetObject("sObjRot", _dicAnim, bDoThrow=False),
+        TerrainObj=_GetObject("sObjTerrain", _dicAnim, bDoThrow=False),
+        LateralOffset=_dicAnim.get("fLateralOffset", 0.0),
+        NurbsCurve=_GetObject("sObjNurbsPath", _dicAnim),
+        VectorUp=vZ,
+        Speed_kmh=_GetPar("fMeanSpeed", _dicAnim, sObj),
+        WheelRadius=dWheelRadius,
+        TimeOffset=_dicAnim.get("fTimeOffset", 0.0),
+        PoseCacheSize=_dicAnim.get("iPoseCacheSize", 256),
+    )
+
+    return _InitModel(sObj, xModel, _dicAnim)
+
+
+# enddef
+
+
+###############################################################################
+# Creates a tracked or skid-steer vehicle with differential drive. The track
+# objects "sObjTL", "sObjTR" mark the centers of the left and right sides.
+# The optional lists "lObjSpinTL", "lObjSpinTR" name the objects, which
+# spin with the sides, and "sObjScrollTL", "sObjScrollTR" the objects,
+# which move with the track surface. See CPlanarDiffDriveModel.
+def CreatePlanarDiffDriveHandler(_objAnim, _dicAnim):
+
+    global dicModels
+
+    sObj = _objAnim.name
+    vZ = mathutils.Vector((0, 0, 1))
+
+    xModel = CPlanarDiffDriveModel(
+        FixedAxisOrigObj=_GetObject("sObjFAC", _dicAnim),
+        TrackLeftObj=_GetObject("sObjTL", _dicAnim),
+        TrackRightObj=_GetObject("sObjTR", _dicAnim),
+        LeftSpinObjs=_GetObjectList("lObjSpinTL", _dicAnim),
+        RightSpinObjs=_GetObjectList("lObjSpinTR", _dicAnim),
+        LeftScrollObj=_GetObject("sObjScrollTL", _dicAnim, bDoThrow=False),
+        RightScrollObj=_GetObject("sObjScrollTR", _dicAnim, bDoThrow=False),
+        ContactLength=_dicAnim.get("fContactLength"),
+        TrackLoopLength=_dicAnim.get("fTrackLoopLength", 0.0),
+        RotOrigObj=_GetObject("sObjRot", _dicAnim, bDoThrow=False),
+        TerrainObj=_GetObject("sObjTerrain", _dicAnim, bDoThrow=False),
+        LateralOffset=_dicAnim.get("fLateralOffset", 0.0),
+        NurbsCurve=_GetObject("sObjNurbsPath", _dicAnim),
+        VectorUp=vZ,
+        Speed_kmh=_GetPar("fMeanSpeed", _dicAnim, sObj),
+        WheelRadius=_GetPar("fWheelRadius", _dicAnim, sObj),
+        TimeOffset=_dicAnim.get("fTimeOffset", 0.0),
+        PoseCacheSize=_dicAnim.get("iPoseCacheSize", 256),
+    )
+
+    return _InitModel(sObj, xModel, _dicAnim)
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the track of a new model and returns its frame change handler.
+# If the animation specification references a pose bake file via
+# "sPoseBakeFile", the track is not evaluated and the poses are replayed
+# from the bake file instead. The optional "lArrivals" set the times at
+# which the vehicle arrives at waypoints, see GetArrivals(). Otherwise, the
+# optional "dicSpeedProfile" limits the speed in curves with the elements
+# "fMaxLateralAcc", "fMaxAcc", "fMaxDec" in m/s^2 and the optional
+# "fStartSpeed", "fEndSpeed" in km/h. The mean speed is then the speed limit.
+def _InitModel(_sObj, _xModel, _dicAnim):
+
+    global dicModels
+
+    sBakeFile = _dicAnim.get("sPoseBakeFile")
+    if sBakeFile is not None:
+        dicModels[_sObj] = _xModel
+        xBake = GetPoseBake(bpy.path.abspath(sBakeFile))
+        sBakeName = _dicAnim.get("sPoseBakeVehicle", _sObj)
+        if not xBake.HasVehicle(sBakeName):
+            raise Exception("Vehicle '{0}' not available in pose bake file '{1}'.".format(sBakeName, sBakeFile))
+        # endif
+        if xBake.GetChannels(sBakeName) != _xModel.lPoseChannels:
+            raise Exception(
+                "Pose channels of vehicle '{0}' in pose bake file '{1}' "
+                "do not match the vehicle model.".format(sBakeName, sBakeFile)
+            )
+        # endif
+        dicBakeReplays[_sObj] = (xBake, sBakeName)
+        _xModel.ClearLastPose()
+        InvalidateMotionIndex()
+        return _CreateBakeReplayHandler(_sObj)
+    # endif
+
+    dicBakeReplays.pop(_sObj, None)
+
+    lArrivals = _dicAnim.get("lArrivals")
+    if lArrivals:
+        _xModel.SetArrivals(GetArrivals(lArrivals, bpy.context.scene), StartTime=_dicAnim.get("fArrivalStartTime"))
+    # endif
+
+    dicProfile = _dicAnim.get("dicSpeedProfile")
+    if dicProfile:
+        dStartSpeed = dicProfile.get("fStartSpeed")
+        dEndSpeed = dicProfile.get("fEndSpeed")
+        _xModel.SetSpeedProfile(
+            MaxLateralAcc=dicProfile["fMaxLateralAcc"],
+            MaxAcc=dicProfile.get("fMaxAcc", 3.0),
+            MaxDec=dicProfile.get("fMaxDec", 6.0),
+            StartSpeed=None if dStartSpeed is None else dStartSpeed / 3.6,
+            EndSpeed=None if dEndSpeed is None else dEndSpeed / 3.6,
+        )
+    # endif
+
+    _EvalModelTrack(_sObj, _xModel, _GetPar("iResolution", _dicAnim, _sObj))
+
+    dicModels[_sObj] = _xModel
+
+    # Optionally hide the vehicle, while it is parked before or after its motion
+    if _dicAnim.get("bHideWhenParked", False):
+        objAnim = bpy.data.objects[_sObj]
+        dicHideObjects[_sObj] = [objAnim, *objAnim.children_recursive]
+    elif _sObj in dicHideObjects:
+        _SetVehiclesHidden([_sObj], False)
+        del dicHideObjects[_sObj]
+    # endif
+
+    InvalidateMotionIndex()
+
+    return _CreateModelHandler(_sObj)
+
+
+# enddef
+
+
+###############################################################################
+def GetPoseBake(_sFilePath):
+
+    global dicPoseBakes
+
+    xBake = dicPoseBakes.get(_sFilePath)
+    if xBake is None:
+        xBake = CPoseBake(_sFilePath)
+        dicPoseBakes[_sFilePath] = xBake
+    # endif
+
+    return xBake
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates dense poses of all vehicles with evaluated tracks within an
+# exposure window or sensor sweep, starting dStartOffset seconds after the
+# current frame of the scene. Returns a dictionary of the results of
+# EvaluateSweepPoses() by vehicle object name. The scene is not changed.
+def EvaluateSweepPoses(_xScene, dDuration, iSampleCount, *, dStartOffset=0.0, lNames=None):
+
+    if lNames is None:
+        lNames = list(dicModels.keys())
+    # endif
+
+    dStartTime = GetSceneTime(_xScene) + dStartOffset
+
+    dicSweeps = {}
+    for sObj in lNames:
+        xModel = dicModels.get(sObj)
+        if xModel is None or not xModel.IsTrackAvailable():
+            continue
+        # endif
+        dicSweeps[sObj] = xModel.EvaluateSweepPoses(dStartTime, dDuration, iSampleCount)
+    # endfor
+
+    return dicSweeps
+
+
+# enddef
+
+
+###############################################################################
+# Writes the poses of all vehicle models with evaluated tracks for the
+# frame range of the scene to a pose bake file. Returns the list of
+# baked vehicle names.
+def BakePoses(_sFilePath, _xScene, *, sEncoding="f32", iChunkSize=64):
+
+    lVehicles = [(sObj, xModel) for sObj, xModel in dicModels.items() if xModel.IsTrackAvailable()]
+
+    dFps = _xScene.render.fps / _xScene.render.fps_base
+    pose_bake.WritePoseBake(
+        _sFilePath,
+        lVehicles,
+        (_xScene.frame_start, _xScene.frame_end),
+        dFps,
+        _sEncoding=sEncoding,
+        _iChunkSize=iChunkSize,
+    )
+
+    # A previously opened bake of the same file is outdated now
+    if _sFilePath in dicPoseBakes:
+        del dicPoseBakes[_sFilePath]
+    # endif
+
+    return [x[0] for x in lVehicles]
+
+
+# enddef
+
+
+###############################################################################
+# Writes per-frame label files with the oriented 3D boxes of all vehicle
+# models with evaluated tracks, for the frame range of the scene. If
+# bProjectToCamera is true, the 2D boxes in the scene's active camera are
+# added, using the camera pose at the current frame. Returns the number
+# of label files written.
+def WriteBoxLabels(_sPath, _xScene, *, bProjectToCamera=True):
+
+    lVehicles = [(sObj, xModel) for sObj, xModel in dicModels.items() if xModel.IsTrackAvailable()]
+
+    dicCameras = {}
+    objCam = _xScene.camera
+    if bProjectToCamera and objCam is not None and objCam.type == "CAMERA":
+        xDepsGraph = bpy.context.evaluated_depsgraph_get()
+        dicCameras[objCam.name] = annotation.GetCameraProjection(objCam, _xScene, xDepsGraph)
+    # endif
+
+    dFps = _xScene.render.fps / _xScene.render.fps_base
+    return annotation.WriteBoxLabels(
+        _sPath, lVehicles, (_xScene.frame_start, _xScene.frame_end), dFps, dicCameras=dicCameras
+    )
+
+
+# enddef
+
+
+###############################################################################
+# Writes BEV occupancy and velocity grids of all vehicle models with
+# evaluated tracks, for the frame range of the scene. If no extent is
+# given, the extent of all vehicle positions enlarged by dMargin is used.
+# Returns the shape of the occupancy grids.
+def WriteBevRasters(_sPath, _xScene, *, dCellSize=0.25, tExtent=None, dMargin=5.0):
+
+    lVehicles = [(sObj, xModel) for sObj, xModel in dicModels.items() if xModel.IsTrackAvailable()]
+
+    lFrames = (_xScene.frame_start, _xScene.frame_end)
+    dFps = _xScene.render.fps / _xScene.render.fps_base
+
+    if tExtent is None:
+        aTimes = np.arange(lFrames[0], lFrames[1] + 1) / dFps
+        tExtent = bev.GetTrackExtent(lVehicles, aTimes, dMargin)
+    # endif
+
+    return bev.WriteBevRasters(_sPath, lVehicles, lFrames, dFps, tExtent, dCellSize)
+
+
+# enddef
+
+
+###############################################################################
+# Finds overlapping footprints of all vehicle models with evaluated tracks,
+# for the frame range of the scene. Vehicles that are hidden when parked
+# are only tested within their motion interval. Returns a dictionary of the
+# lists of overlapping frame intervals by pairs of vehicle names.
+def FindConflicts(_xScene, *, iFrameStep=1):
+
+    lVehicles = [
+        (sObj, xModel, xModel.GetMotionInterval() if sObj in dicHideObjects else None)
+        for sObj, xModel in dicModels.items()
+        if xModel.IsTrackAvailable()
+    ]
+
+    dFps = _xScene.render.fps / _xScene.render.fps_base
+    return conflict.FindConflicts(lVehicles, (_xScene.frame_start, _xScene.frame_end), dFps, iFrameStep=iFrameStep)
+
+
+# enddef
+
+
+###############################################################################
+# Tests the tracks of all vehicle models with evaluated tracks against the
+# meshes of a collection, or of the whole scene, if no collection name is
+# given. The vehicles and their terrains are excluded. Returns a dictionary
+# of the collision spans by vehicle name, for vehicles with collisions only.
+def CheckClearance(_xScene, _sCollection=None, *, dGroundClearance=0.05):
+
+    if _sCollection:
+        clnX = bpy.data.collections.get(_sCollection)
+        if clnX is None:
+            raise Exception("Collection '{}' not found".format(_sCollection))
+        # endif
+    else:
+        clnX = _xScene.collection
+    # endif
+
+    # The vehicles and the terrains they follow are no obstacles
+    setExclude = set()
+    for sObj, xModel in dicModels.items():
+        objX = bpy.data.objects.get(sObj)
+        if objX is not None:
+            setExclude.add(objX.name)
+            setExclude.update(x.name for x in objX.children_recursive)
+        # endif
+        if xModel.objTerrain is not None:
+            setExclude.add(xModel.objTerrain.name)
+        # endif
+    # endfor
+
+    xDepsGraph = bpy.context.evaluated_depsgraph_get()
+    tBvh = clearance.GetCollectionBvh(clnX, xDepsGraph, setExclude=setExclude)
+
+    dicCollisions = {}
+    for sObj, xModel in dicModels.items():
+        if not xModel.IsTrackAvailable():
+            continue
+        # endif
+
+        lSpans = clearance.CheckTrackClearance(xModel, tBvh, dGroundClearance=dGroundClearance)
+        if len(lSpans) > 0:
+            dicCollisions[sObj] = lSpans
+        # endif
+    # endfor
+
+    return dicCollisions
+
+
+# enddef
+
+
+###############################################################################
+# Returns the nearest point index of the track of a vehicle model. The index
+# is built again, if the track or the placement of the curve changed.
+def GetTrackPointIndex(_sObj):
+
+    xModel = dicModels.get(_sObj)
+    if xModel is None:
+        raise Exception("No vehicle model for object '{0}'.".format(_sObj))
+    # endif
+
+    xIndex = dicPointIndices.get(_sObj)
+    if xIndex is None or xIndex.xModel is not xModel or not xIndex.IsValid():
+        xIndex = CTrackPointIndex(xModel)
+        dicPointIndices[_sObj] = xIndex
+    # endif
+
+    return xIndex
+
+
+# enddef
+
+
+###############################################################################
+# Finds the points on the track of a vehicle model nearest to an (M, 3)
+# array of world positions, e.g. to start the vehicle close to a point,
+# or to find where a trigger object sits along the path.
+# See CTrackPointIndex.FindNearest() for the result.
+def FindNearestTrackPoints(_sObj, _aPoints):
+
+    return GetTrackPointIndex(_sObj).FindNearest(_aPoints)
+
+
+# enddef
+
+
+###############################################################################
+# Converts arrival specifications to the arrivals expected by
+# CPlanarSingleTrackModel.SetArrivals(). Each specification is a dictionary
+# with the position given either as "fArcLen" along the path or as waypoint
+# object "sObjWaypoint", and the arrival time given either as "fTime" in
+# seconds or as "fFrame" of the scene.
+def GetArrivals(_lArrivalSpecs, _xScene):
+
+    dFps = _xScene.render.fps / _xScene.render.fps_base
+
+    lArrivals = []
+    for dicArrival in _lArrivalSpecs:
+        if "fArcLen" in dicArrival:
+            xPos = float(dicArrival["fArcLen"])
+        elif "sObjWaypoint" in dicArrival:
+            objX = bpy.data.objects.get(dicArrival["sObjWaypoint"])
+            if objX is None:
+                raise Exception("Waypoint object '{0}' does not exist.".format(dicArrival["sObjWaypoint"]))
+            # endif
+            xPos = tuple(objX.matrix_world.translation)
+        else:
+            raise Exception("Arrival needs an element 'fArcLen' or 'sObjWaypoint'.")
+        # endif
+
+        if "fTime" in dicArrival:
+            dTime = float(dicArrival["fTime"])
+        elif "fFrame" in dicArrival:
+            dTime = float(dicArrival["fFrame"]) / dFps
+        else:
+            raise Exception("Arrival needs an element 'fTime' or 'fFrame'.")
+        # endif
+
+        lArrivals.append((xPos, dTime))
+    # endfor
+
+    return lArrivals
+
+
+# enddef
+
+
+###############################################################################
+# Sets the arrival times of vehicles from a dictionary of arrival
+# specifications by vehicle object name, see GetArrivals(). Vehicles with
+# an empty list of specifications return to moving with constant speed.
+def ScheduleArrivals(_dicArrivalSpecs, _xScene, *, dStartTime=None):
+
+    for sObj, lArrivalSpecs in _dicArrivalSpecs.items():
+        xModel = dicModels.get(sObj)
+        if xModel is None:
+            raise Exception("No vehicle model for object '{0}'.".format(sObj))
+        # endif
+        xModel.SetArrivals(GetArrivals(lArrivalSpecs, _xScene), StartTime=dStartTime)
+        _UpdateTrackError(sObj, xModel)
+    # endfor
+
+    InvalidateMotionIndex()
+
+
+# enddef
+
+
+###############################################################################
+def _CreateBakeReplayHandler(_sId):
+
+    ##############################################
+    def handler(xScene, xDepsGraph):
+
+        global dicModels
+        xModel = dicModels.get(_sId)
+        if xModel is None:
+            raise Exception("Vehicle animation model with '{0}' not available.".format(_sId))
+        # endif
+
+        _DispatchFrame(xScene)
+
+    # enddef
+
+    ##############################################
+    def finalizer():
+
+        global dicModels
+        if dicModels.get(_sId):
+            del dicModels[_sId]
+        # endif
+
+        dicBakeReplays.pop(_sId, None)
+        InvalidateMotionIndex()
+
+    # enddef
+
+    return {"handler": handler, "finalizer": finalizer}
+
+
+# enddef
+
+
+###############################################################################
+def _CreateModelHandler(_sId):
+
+    ##############################################
+    def handler(xScene, xDepsGraph):
+
+        global dicModels
+        xModel = dicModels.get(_sId)
+        if xModel is None:
+            raise Exception(
+                "Vehicle animation model with '{0}' not available.".format(_sId)
+            )
+        # endif
+
+        _DispatchFrame(xScene)
+
+    # enddef
+
+    ##############################################
+    def finalizer():
+
+        global dicModels
+        if dicModels.get(_sId):
+            del dicModels[_sId]
+        # endif
+
+        dicTrackErrors.pop(_sId, None)
+
+        if _sId in dicHideObjects:
+            _SetVehiclesHidden([_sId], False)
+            del dicHideObjects[_sId]
+        # endif
+
+        InvalidateMotionIndex()
+
     # enddef
 
     return {"handler": handler, "finalizer": finalizer}
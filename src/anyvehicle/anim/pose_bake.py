@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \pose_bake.py
+# Created Date: Monday, October 19th 2026, 3:08:44 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Pose bake file format
+#
+# A pose bake file stores the pose records of a number of vehicles for
+# a range of frames. It is laid out such that it can be memory mapped and
+# a single frame of a vehicle can be read without reading other data.
+#
+#   [ 8 bytes] magic "AVPOSE01"
+#   [ 8 bytes] uint64 byte offset of the JSON directory
+#   [ 8 bytes] uint64 byte length of the JSON directory
+#   [   ...  ] data sections of all vehicles, aligned to 16 bytes
+#   [   ...  ] JSON directory
+#
+# The JSON directory describes the frame range, the chunk size and for each
+# vehicle the pose channels, the encoding and the offsets of its data.
+# The following encodings are supported:
+#
+#   "f32":  (frames, channels) float32 array.
+#   "q16":  (frames, channels) int16 array of quantized values,
+#           with value = offset + scale * q.
+#   "q16d": quantized values, delta coded per chunk of frames. For each chunk
+#           the first row is stored as int16 key row, and the differences
+#           of the following rows modulo 2^16 are stored as int8 or int16,
+#           depending on their range. The chunk table holds the byte offset
+#           and the element size of the deltas of each chunk.
+#
+# Spin angle channels grow along the path. They are wrapped to [-pi, pi)
+# for the quantized encodings.
+
+import json
+import math
+import numpy as np
+
+sMagic = b"AVPOSE01"
+iHeaderSize = 24
+lEncodings = ["f32", "q16", "q16d"]
+
+
+###############################################################################
+def IsWrappedChannel(_sChannel):
+    return _sChannel.endswith(".Spin")
+
+
+# enddef
+
+
+###############################################################################
+def _WrapAngle(_aAngle):
+    return np.remainder(_aAngle + math.pi, 2.0 * math.pi) - math.pi
+
+
+# enddef
+
+
+###############################################################################
+def _Align(_xFile, _iAlign=16):
+
+    iPos = _xFile.tell()
+    iPad = (-iPos) % _iAlign
+    if iPad > 0:
+        _xFile.write(b"\0" * iPad)
+    # endif
+    return iPos + iPad
+
+
+# enddef
+
+
+###############################################################################
+# Returns the quantization offset and scale per channel and the
+# quantized int16 array.
+def _Quantize(_aPose, _lWrap):
+
+    aPose = _aPose.astype(np.float64)
+    iChCnt = aPose.shape[1]
+    aOffset = np.zeros(iChCnt)
+    aScale = np.ones(iChCnt)
+
+    for iCh in range(iChCnt):
+        if _lWrap[iCh]:
+            aPose[:, iCh] = _WrapAngle(aPose[:, iCh])
+            aScale[iCh] = math.pi / 32767.0
+        else:
+            dMin = float(np.min(aPose[:, iCh]))
+            dMax = float(np.max(aPose[:, iCh]))
+            aOffset[iCh] = 0.5 * (dMin + dMax)
+            if dMax > dMin:
+                aScale[iCh] = (dMax - dMin) / 65534.0
+            # endif
+        # endif
+    # endfor
+
+    aQ = np.rint((aPose - aOffset) / aScale)
+    aQ = np.clip(aQ, -32767, 32767).astype(np.int16)
+
+    return aOffset, aScale, aQ
+
+
+# enddef
+
+
+###############################################################################
+def _WriteDeltaChunks(_xFile, _aQ, _iChunkSize):
+
+    iFrameCnt = _aQ.shape[0]
+    iChunkCnt = (iFrameCnt + _iChunkSize - 1) // _iChunkSize
+
+    aKeys = _aQ[::_iChunkSize].copy()
+    aChunkOffsets = np.zeros(iChunkCnt, dtype=np.uint64)
+    aChunkItemSize = np.zeros(iChunkCnt, dtype=np.uint8)
+
+    for iChunk in range(iChunkCnt):
+        aRows = _aQ[iChunk * _iChunkSize : (iChunk + 1) * _iChunkSize]
+        # Differences modulo 2^16 reconstruct the values exactly
+        aDelta = np.diff(aRows.astype(np.int32), axis=0)
+        aDelta = ((aDelta + 32768) % 65536 - 32768).astype(np.int16)
+
+        if aDelta.size == 0 or np.all((aDelta >= -128) & (aDelta <= 127)):
+            aDelta = aDelta.astype(np.int8)
+        # endif
+
+        aChunkOffsets[iChunk] = _Align(_xFile, 2)
+        aChunkItemSize[iChunk] = aDelta.dtype.itemsize
+        _xFile.write(aDelta.tobytes())
+    # endfor
+
+    dicData = {"iKeyOffset": _Align(_xFile)}
+    _xFile.write(aKeys.tobytes())
+
+    dicData["iChunkOffsetsOffset"] = _Align(_xFile)
+    _xFile.write(aChunkOffsets.tobytes())
+
+    dicData["iChunkItemSizeOffset"] = _Align(_xFile)
+    _xFile.write(aChunkItemSize.tobytes())
+
+    return dicData
+
+
+# enddef
+
+
+###############################################################################
+# Writes a pose bake file.
+#   _lVehicles: list of tuples (vehicle name, vehicle model)
+#   _lFrames: frame range as (first frame, last frame)
+#   _dFps: frames per second used to convert frames to model time
+#   _sEncoding: one of lEncodings
+def WritePoseBake(_sFilePath, _lVehicles, _lFrames, _dFps, *, _sEncoding="f32", _iChunkSize=64):
+
+    if _sEncoding not in lEncodings:
+        raise Exception("Unsupported pose bake encoding '{0}'.".format(_sEncoding))
+    # endif
+
+    iFrameFirst, iFrameLast = int(_lFrames[0]), int(_lFrames[1])
+    iFrameCnt = iFrameLast - iFrameFirst + 1
+    if iFrameCnt <= 0:
+        raise Exception("Invalid frame range for pose bake.")
+    # endif
+
+    dicDir = {
+        "iVersion": 1,
+        "iFrameFirst": iFrameFirst,
+        "iFrameCount": iFrameCnt,
+        "dFps": _dFps,
+        "iChunkSize": _iChunkSize,
+        "dicVehicles": {},
+    }
+
+    with open(_sFilePath, "wb") as xFile:
+        xFile.write(sMagic)
+        xFile.write(np.zeros(2, dtype=np.uint64).tobytes())
+
+        for sName, xModel in _lVehicles:
+            lChannels = list(xModel.lPoseChannels)
+            aTimes = np.arange(iFrameFirst, iFrameLast + 1) / _dFps
+            if hasattr(xModel, "EvaluatePoseRecords"):
+                aPose = xModel.EvaluatePoseRecords(aTimes)
+            else:
+                aPose = np.array([xModel.EvalPose(x) for x in aTimes])
+            # endif
+
+            dicVehicle = {"sType": type(xModel).__name__, "lChannels": lChannels, "sEncoding": _sEncoding}
+
+            if _sEncoding == "f32":
+                dicVehicle["iDataOffset"] = _Align(xFile)
+                xFile.write(aPose.astype(np.float32).tobytes())
+
+            else:
+                lWrap = [IsWrappedChannel(x) for x in lChannels]
+                aOffset, aScale, aQ = _Quantize(aPose, lWrap)
+                dicVehicle["lOffset"] = aOffset.tolist()
+                dicVehicle["lScale"] = aScale.tolist()
+                dicVehicle["lWrap"] = lWrap
+
+                if _sEncoding == "q16":
+                    dicVehicle["iDataOffset"] = _Align(xFile)
+                    xFile.write(aQ.tobytes())
+                else:
+                    dicVehicle.update(_WriteDeltaChunks(xFile, aQ, _iChunkSize))
+                # endif
+            # endif
+
+            dicDir["dicVehicles"][sName] = dicVehicle
+        # endfor
+
+        iDirOffset = _Align(xFile)
+        xDir = json.dumps(dicDir).encode("utf-8")
+        xFile.write(xDir)
+
+        xFile.seek(len(sMagic))
+        xFile.write(np.array([iDirOffset, len(xDir)], dtype=np.uint64).tobytes())
+    # endwith
+
+
+# enddef
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \schedule.py
+# Created Date: Wednesday, October 21st 2026, 2:20:51 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Time schedules of vehicles along their tracks. A schedule either meets
+# arrival times, given by knots of arc length and time, between which the
+# vehicle moves with constant speed, or follows a speed profile limited by
+# the curvature of the track and the acceleration of the vehicle.
+# The schedules give the time at which each track sample is passed, so that
+# the schedule of a whole fleet is evaluated with a few array operations.
+
+import numpy as np
+
+
+###############################################################################
+# Returns the knots of a schedule, which meets the arrival times at the
+# given arc lengths along a track of length _dLenTotal.
+# Between the arrivals the speed is constant. Before the first arrival,
+# the vehicle starts at dStartTime, if it is given, and otherwise moves with
+# the speed between the first two arrivals. After the last arrival, it
+# keeps the speed between the last two arrivals. With a single arrival,
+# _dSpeed is used instead.
+def SolveArrivalSchedule(_dLenTotal, _aArcLen, _aTime, _dSpeed, *, dStartTime=None):
+
+    aArcLen = np.asarray(_aArcLen, dtype=np.float64)
+    aTime = np.asarray(_aTime, dtype=np.float64)
+    if len(aArcLen) == 0 or len(aArcLen) != len(aTime):
+        raise Exception("Expect an arrival time for each arc length.")
+    # endif
+
+    aSort = np.argsort(aArcLen, kind="stable")
+    aArcLen = np.clip(aArcLen[aSort], 0.0, _dLenTotal)
+    aTime = aTime[aSort]
+
+    if np.any(np.diff(aArcLen) <= 0.0) or np.any(np.diff(aTime) <= 0.0):
+        raise Exception("Arrival times must increase strictly along the path, at distinct positions.")
+    # endif
+
+    if len(aArcLen) > 1:
+        dFirstSpeed = (aArcLen[1] - aArcLen[0]) / (aTime[1] - aTime[0])
+        dLastSpeed = (aArcLen[-1] - aArcLen[-2]) / (aTime[-1] - aTime[-2])
+    else:
+        dFirstSpeed = dLastSpeed = _dSpeed
+    # endif
+
+    lKnotLen = aArcLen.tolist()
+    lKnotTime = aTime.tolist()
+
+    if lKnotLen[0] > 0.0:
+        if dStartTime is None:
+            dStartTime = lKnotTime[0] - lKnotLen[0] / dFirstSpeed
+        elif dStartTime >= lKnotTime[0]:
+            raise Exception("Start time must lie before the first arrival time.")
+        # endif
+        lKnotLen.insert(0, 0.0)
+        lKnotTime.insert(0, dStartTime)
+    # endif
+
+    if lKnotLen[-1] < _dLenTotal:
+        lKnotTime.append(lKnotTime[-1] + (_dLenTotal - lKnotLen[-1]) / dLastSpeed)
+        lKnotLen.append(_dLenTotal)
+    # endif
+
+    return np.array(lKnotLen), np.array(lKnotTime)
+
+
+# enddef
+
+
+###############################################################################
+# Returns the times at which the arc lengths are passed for a schedule.
+def GetScheduleTimes(_aKnotLen, _aKnotTime, _aArcLen):
+    return np.interp(_aArcLen, _aKnotLen, _aKnotTime)
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the speed profile along a track with a forward and a backward
+# pass. The speed is limited by _dMaxSpeed, by the lateral acceleration in
+# curves, and by the acceleration and deceleration between the samples.
+# Optionally, the speeds at the start and at the end are limited as well.
+# Each pass is a recurrence of the squared speed u along the arc length s,
+#   u[i] = min(c[i], u[i-1] + 2 a (s[i] - s[i-1])),
+# which is solved as accumulated minimum of c - 2 a s.
+# Returns the speed per sample.
+def EvalSpeedProfile(
+    _aArcLen, _aCurv, _dMaxSpeed, _dMaxLatAcc, _dMaxAcc, _dMaxDec, *, dStartSpeed=None, dEndSpeed=None
+):
+
+    aArcLen = np.asarray(_aArcLen, dtype=np.float64)
+    aCurv = np.abs(np.asarray(_aCurv, dtype=np.float64))
+
+    # Squared speed limit from the lateral acceleration
+    aLimit = np.full(len(aArcLen), _dMaxSpeed * _dMaxSpeed)
+    aIsCurved = aCurv > 0.0
+    aLimit[aIsCurved] = np.minimum(aLimit[aIsCurved], _dMaxLatAcc / aCurv[aIsCurved])
+
+    if dStartSpeed is not None:
+        aLimit[0] = min(aLimit[0], dStartSpeed * dStartSpeed)
+    # endif
+    if dEndSpeed is not None:
+        aLimit[-1] = min(aLimit[-1], dEndSpeed * dEndSpeed)
+    # endif
+
+    aAcc = 2.0 * _dMaxAcc * aArcLen
+    aSq = aAcc + np.minimum.accumulate(aLimit - aAcc)
+
+    aDec = 2.0 * _dMaxDec * aArcLen
+    aSq = np.minimum.accumulate((aSq + aDec)[::-1])[::-1] - aDec
+
+    return np.sqrt(np.maximum(aSq, 0.0))
+
+
+# enddef
+
+
+###############################################################################
+# Returns the times at which the samples are passed for a speed profile,
+# assuming constant acceleration between the samples.
+def GetProfileTimes(_aArcLen, _aSpeed, _dStartTime):
+
+    aStep = np.diff(_aArcLen)
+    aSpeedSum = _aSpeed[1:] + _aSpeed[:-1]
+    aDelta = np.divide(2.0 * aStep, aSpeedSum, out=np.zeros_like(aStep), where=aSpeedSum > 0.0)
+
+    aTime = np.empty(len(_aArcLen))
+    aTime[0] = _dStartTime
+    np.cumsum(aDelta, out=aTime[1:])
+    aTime[1:] += _dStartTime
+
+    return aTime
+
+
+# enddef
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \terrain.py
+# Created Date: Wednesday, October 21st 2026, 9:12:40 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Sampling of the ground below the wheel contact points of a vehicle track,
+# for vehicles that follow a terrain object instead of the plane of their
+# path. The ground is sampled once, when the track tables are evaluated.
+# The track tables then contain the height, pitch and bank of the vehicle
+# per track sample, so that evaluating a pose needs no ray casts.
+#
+# The ground is sampled along the up vector with a grid of the terrain's
+# triangles in the plane perpendicular to the up vector, see
+# CreateGroundGrid(). The grid is built from plain arrays, so that the
+# terrain is sampled outside of Blender's main thread, together with
+# the evaluation of the other track tables.
+#
+# The track curve is expected to run at the height of the wheel centers,
+# so that on flat ground in the plane of the curve, the vehicle is not lifted.
+
+import threading
+import numpy as np
+from collections import OrderedDict
+
+# Distance above and below the contact points, within which the ground is found
+dGroundRange = 100.0
+
+# Size of the grid cells relative to the mean extent of the triangles
+dGridCellScale = 2.0
+
+# Maximal number of grid cells
+iGridCellMax = 1 << 22
+
+# Number of points that are sampled at once
+iSampleChunkSize = 4096
+
+# Ground grids by mesh key and up vector, which are shared by all vehicles
+# on the same terrain. The grids are built in worker threads, so the cache
+# is guarded by a lock.
+iGroundGridCacheSize = 4
+dicGroundGrids = OrderedDict()
+xGroundGridLock = threading.Lock()
+
+
+###############################################################################
+# Returns the contact points of the wheels with the plane of the curve
+# for all track samples with per sample tables, as dictionary of (N-2, 3)
+# arrays in curve coordinates. The offsets of the wheel centers are given
+# in the frame of the fixed axis center.
+def GetContactPositions(_aFAC_Pos, _aUp, _dicOffsets, _dWheelRadius):
+
+    aZ = np.asarray(_aUp, dtype=np.float64)
+    aD = _aFAC_Pos[1:-1] - _aFAC_Pos[:-2]
+    aX = aD / np.linalg.norm(aD, axis=1)[:, np.newaxis]
+    aY = np.cross(aZ, aX)
+    aP = _aFAC_Pos[:-2]
+
+    dicContacts = {}
+    for sName, tOffset in _dicOffsets.items():
+        dicContacts[sName] = aP + aX * tOffset[0] + aY * tOffset[1] + aZ * (tOffset[2] - _dWheelRadius)
+    # endfor
+
+    return dicContacts
+
+
+# enddef
+
+
+###############################################################################
+# Returns two unit vectors, which span the plane perpendicular to _aZ.
+def _GetPlaneBasis(_aZ):
+
+    aE1 = np.zeros(3)
+    aE1[np.argmin(np.abs(_aZ))] = 1.0
+    aE1 -= (aE1 @ _aZ) * _aZ
+    aE1 /= np.linalg.norm(aE1)
+
+    return aE1, np.cross(_aZ, aE1)
+
+
+# enddef
+
+
+###############################################################################
+# Creates a grid of the (T, 3) triangles of a mesh with (V, 3) vertices,
+# projected along the unit vector _aUp onto the plane perpendicular to it.
+# Each grid cell lists the triangles whose bounding box overlaps the cell.
+# Triangles that are parallel to the up vector, like vertical walls,
+# cannot be hit along the up vector and are left out.
+def CreateGroundGrid(_aVex, _aTri, _aUp):
+
+    aUp = np.asarray(_aUp, dtype=np.float64)
+    aE1, aE2 = _GetPlaneBasis(aUp)
+    aVex = np.asarray(_aVex, dtype=np.float64).reshape(-1, 3)
+    aTri = np.asarray(_aTri, dtype=np.int64).reshape(-1, 3)
+
+    aPos2 = np.stack((aVex @ aE1, aVex @ aE2), axis=1)
+    aTriPos = aPos2[aTri]
+    aTriHeight = (aVex @ aUp)[aTri]
+
+    aEdge1 = aTriPos[:, 1] - aTriPos[:, 0]
+    aEdge2 = aTriPos[:, 2] - aTriPos[:, 0]
+    aDet = aEdge1[:, 0] * aEdge2[:, 1] - aEdge1[:, 1] * aEdge2[:, 0]
+    aValid = aDet != 0.0
+
+    dicGrid = {"aUp": aUp, "aE1": aE1, "aE2": aE2, "iTriCnt": int(np.count_nonzero(aValid))}
+    if dicGrid["iTriCnt"] == 0:
+        return dicGrid
+    # endif
+
+    aTriPos = aTriPos[aValid]
+    aMin = aTriPos.min(axis=1)
+    aMax = aTriPos.max(axis=1)
+    aOrigin = aMin.min(axis=0)
+    aExtent = aMax.max(axis=0) - aOrigin
+
+    dCellSize = dGridCellScale * float(np.mean(np.max(aMax - aMin, axis=1)))
+    dCellSize = max(dCellSize, float(np.sqrt(np.prod(aExtent) / iGridCellMax)), 1e-9)
+    aDim = np.floor(aExtent / dCellSize).astype(np.int64) + 1
+
+    aLo = np.minimum(np.floor((aMin - aOrigin) / dCellSize).astype(np.int64), aDim - 1)
+    aHi = np.minimum(np.floor((aMax - aOrigin) / dCellSize).astype(np.int64), aDim - 1)
+
+    # Cells covered by the bounding boxes of the triangles
+    aWidth = aHi[:, 0] - aLo[:, 0] + 1
+    aCnt = aWidth * (aHi[:, 1] - aLo[:, 1] + 1)
+    aTriIdx = np.repeat(np.arange(len(aCnt)), aCnt)
+    aLocal = np.arange(len(aTriIdx)) - np.repeat(np.cumsum(aCnt) - aCnt, aCnt)
+    aCellX = aLo[aTriIdx, 0] + aLocal % aWidth[aTriIdx]
+    aCellY = aLo[aTriIdx, 1] + aLocal // aWidth[aTriIdx]
+    aCell = aCellX * aDim[1] + aCellY
+
+    iCellCnt = int(aDim[0] * aDim[1])
+    aCellStart = np.zeros(iCellCnt + 1, dtype=np.int64)
+    np.cumsum(np.bincount(aCell, minlength=iCellCnt), out=aCellStart[1:])
+
+    dicGrid.update(
+        {
+            "aOrigin": aOrigin,
+            "dCellSize": dCellSize,
+            "aDim": aDim,
+            "aCellStart": aCellStart,
+            "aCellTri": aTriIdx[np.argsort(aCell, kind="stable")],
+            "aTriOrigin": aTriPos[:, 0],
+            "aTriEdge1": aEdge1[aValid],
+            "aTriEdge2": aEdge2[aValid],
+            "aTriInvDet": 1.0 / aDet[aValid],
+            "aTriHeight": aTriHeight[aValid],
+        }
+    )
+
+    return dicGrid
+
+
+# enddef
+
+
+###############################################################################
+# Returns the ground grid of a mesh given as tuple of its key, vertices and
+# triangles, see clearance.GetWorldMesh(). Grids are cached by the mesh key
+# and the up vector. May be called from any thread.
+def GetGroundGrid(_tMesh, _aUp):
+
+    aUp = np.asarray(_aUp, dtype=np.float64)
+    tKey = (_tMesh[0], aUp.tobytes())
+
+    with xGroundGridLock:
+        dicGrid = dicGroundGrids.get(tKey)
+        if dicGrid is None:
+            dicGrid = CreateGroundGrid(_tMesh[1], _tMesh[2], aUp)
+            dicGroundGrids[tKey] = dicGrid
+            while len(dicGroundGrids) > iGroundGridCacheSize:
+                dicGroundGrids.popitem(last=False)
+            # endwhile
+        else:
+            dicGroundGrids.move_to_end(tKey)
+        # endif
+    # endwith
+
+    return dicGrid
+
+
+# enddef
+
+
+###############################################################################
+# Returns the distances along the negative up vector from the (M, 3) start
+# points to the nearest triangles of the ground grid below them, within
+# _dMaxDist. Where no ground is found, the distance is infinite.
+def SampleGroundDistance(_dicGrid, _aStart, _dMaxDist):
+
+    aStart = np.asarray(_aStart, dtype=np.float64).reshape(-1, 3)
+    aDist = np.full(len(aStart), np.inf)
+    if _dicGrid["iTriCnt"] == 0:
+        return aDist
+    # endif
+
+    aPos2 = np.stack((aStart @ _dicGrid["aE1"], aStart @ _dicGrid["aE2"]), axis=1)
+    aHeight = aStart @ _dicGrid["aUp"]
+
+    aDim = _dicGrid["aDim"]
+    aIdx = np.floor((aPos2 - _dicGrid["aOrigin"]) / _dicGrid["dCellSize"]).astype(np.int64)
+    aInGrid = np.flatnonzero(np.all((aIdx >= 0) & (aIdx < aDim), axis=1))
+    aCell = aIdx[aInGrid, 0] * aDim[1] + aIdx[aInGrid, 1]
+
+    # Pairs of the points and the triangles listed in their cells
+    aCellStart = _dicGrid["aCellStart"]
+    aFirst = aCellStart[aCell]
+    aCnt = aCellStart[aCell + 1] - aFirst
+    aPnt = np.repeat(aInGrid, aCnt)
+    aEntry = np.repeat(aFirst - (np.cumsum(aCnt) - aCnt), aCnt) + np.arange(len(aPnt))
+    aTri = _dicGrid["aCellTri"][aEntry]
+
+    # Barycentric coordinates of the points in the projected triangles
+    aD = aPos2[aPnt] - _dicGrid["aTriOrigin"][aTri]
+    aEdge1 = _dicGrid["aTriEdge1"][aTri]
+    aEdge2 = _dicGrid["aTriEdge2"][aTri]
+    aInvDet = _dicGrid["aTriInvDet"][aTri]
+    aB1 = (aD[:, 0] * aEdge2[:, 1] - aD[:, 1] * aEdge2[:, 0]) * aInvDet
+    aB2 = (aEdge1[:, 0] * aD[:, 1] - aEdge1[:, 1] * aD[:, 0]) * aInvDet
+
+    aTriHeight = _dicGrid["aTriHeight"][aTri]
+    aHit = aHeight[aPnt] - (
+        aTriHeight[:, 0] + aB1 * (aTriHeight[:, 1] - aTriHeight[:, 0]) + aB2 * (aTriHeight[:, 2] - aTriHeight[:, 0])
+    )
+
+    dEps = 1e-9
+    aIsHit = (aB1 >= -dEps) & (aB2 >= -dEps) & (aB1 + aB2 <= 1.0 + dEps) & (aHit >= 0.0) & (aHit <= _dMaxDist)
+    np.minimum.at(aDist, aPnt[aIsHit], aHit[aIsHit])
+
+    return aDist
+
+
+# enddef
+
+
+###############################################################################
+# Samples the ground of a mesh along the up vector below the contact points.
+# The mesh is given as tuple of its key, vertices and triangles in world
+# coordinates, see clearance.GetWorldMesh(). The contact points are given
+# in curve coordinates and are transformed by the curve's world matrix.
+# Returns a dictionary of the distances from the contact points to the
+# ground along the up vector, in curve units. Where no ground is found,
+# the distance is zero. The optional function funcProgress is called with
+# the fraction of sampled points after each chunk of points.
+def SampleGroundLift(_tMesh, _mCurve, _dicContacts, _aUp, *, funcProgress=None):
+
+    mCurve = np.asarray(_mCurve, dtype=np.float64)
+    aUp = mCurve[0:3, 0:3] @ np.asarray(_aUp, dtype=np.float64)
+    dScale = float(np.linalg.norm(aUp))
+    aUp /= dScale
+
+    dicGrid = GetGroundGrid(_tMesh, aUp)
+
+    iTotal = sum(len(x) for x in _dicContacts.values())
+    iDone = 0
+
+    dicLift = {}
+    for sName, aContact in _dicContacts.items():
+        aStart = aContact @ mCurve[0:3, 0:3].T + mCurve[0:3, 3] + dGroundRange * aUp
+        aDist = np.empty(len(aStart))
+        for iIdx in range(0, len(aStart), iSampleChunkSize):
+            aChunk = aStart[iIdx : iIdx + iSampleChunkSize]
+            aDist[iIdx : iIdx + len(aChunk)] = SampleGroundDistance(dicGrid, aChunk, 2.0 * dGroundRange)
+            iDone += len(aChunk)
+            if funcProgress is not None:
+                funcProgress(iDone / iTotal)
+            # endif
+        # endfor
+        dicLift[sName] = np.where(np.isfinite(aDist), (dGroundRange - aDist) / dScale, 0.0)
+    # endfor
+
+    return dicLift
+
+
+# enddef
+
+
+###############################################################################
+# Fits a plane to the lifts of the contact points per track sample.
+# Returns the terrain tables with the lift of the fixed axis center,
+# the pitch angle about the Y-axis with the nose up for positive angles,
+# and the bank angle about the direction with the left side up for
+# positive angles. For contact points on a single line, the bank is zero.
+def EvalTerrainTables(_dicOffsets, _dicLift):
+
+    lNames = sorted(_dicLift)
+    aA = np.array([[1.0, _dicOffsets[x][0], _dicOffsets[x][1]] for x in lNames])
+    aLift = np.stack([_dicLift[x] for x in lNames])
+
+    aCoef = np.linalg.pinv(aA) @ aLift
+
+    return {"aTerrainHeight": aCoef[0], "aTerrainPitch": np.arctan(aCoef[1]), "aTerrainBank": np.arctan(aCoef[2])}
+
+
+# enddef
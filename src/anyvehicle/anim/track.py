@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \track.py
+# Created Date: Monday, October 19th 2026, 10:03:17 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import os
+import hashlib
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from . import terrain
+from . import trailer
+
+# Curvatures below this value are regarded as a straight track
+dCurvEps = 1e-8
+
+
+###############################################################################
+# Calculate the length of each segment and the accumulated length
+# along a sequence of points.
+def GetAccumulatedLength(_aPos):
+
+    aSegLen = np.linalg.norm(_aPos[1:] - _aPos[:-1], axis=1)
+    aLen = np.zeros(len(_aPos))
+    np.cumsum(aSegLen, out=aLen[1:])
+    return aLen
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the positions and accumulated lengths of the tracks of a set of
+# wheels in one batch. The wheel offsets are given in the local frames with
+# origins _aP and axes _aX, _aY, _aZ along the track.
+# Returns two dictionaries of the wheel positions and lengths by wheel id.
+def GetWheelTracks(_aP, _aX, _aY, _aZ, _dicWheelOffsets):
+
+    if len(_dicWheelOffsets) == 0:
+        return {}, {}
+    # endif
+
+    lWheels = list(_dicWheelOffsets.keys())
+    aOffset = np.array([_dicWheelOffsets[x] for x in lWheels], dtype=np.float64)
+
+    # (W, M, 3) positions of all wheels
+    aPos = (
+        _aP[np.newaxis]
+        + aOffset[:, np.newaxis, 0:1] * _aX[np.newaxis]
+        + aOffset[:, np.newaxis, 1:2] * _aY[np.newaxis]
+        + aOffset[:, np.newaxis, 2:3] * _aZ
+    )
+
+    aLen = np.zeros(aPos.shape[0:2])
+    np.cumsum(np.linalg.norm(np.diff(aPos, axis=1), axis=2), axis=1, out=aLen[:, 1:])
+
+    dicPos = {x: aPos[i] for i, x in enumerate(lWheels)}
+    dicLen = {x: aLen[i] for i, x in enumerate(lWheels)}
+    return dicPos, dicLen
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the steering angles of wheels, such that each wheel points
+# perpendicular to the line from the wheel to the rotation center, for
+# the (M,) signed curvatures of the track. The wheel offsets are given in
+# the local frame of the fixed axis center. The rotation center lies on the
+# line perpendicular to the track at _dSteerCenter along the x-axis,
+# which is zero for a vehicle, whose fixed axis does not steer.
+# With the curvature instead of the rotation center itself, straight
+# parts of the track need no special case.
+# Returns a dictionary of the (M,) steering angles by wheel id.
+def EvalWheelSteerAngles(_aCurvSigned, _dicWheelOffsets, _dSteerCenter=0.0):
+
+    dicSteer = {}
+    for sWheel, aOffset in _dicWheelOffsets.items():
+        dicSteer[sWheel] = np.arctan2((aOffset[0] - _dSteerCenter) * _aCurvSigned, 1.0 - aOffset[1] * _aCurvSigned)
+    # endfor
+
+    return dicSteer
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the distances driven by wheels or tracks at lateral offsets from
+# the track, for vehicles that turn by driving their sides at different
+# speeds. The (M,) tables are evaluated from the accumulated lengths and the
+# signed curvatures of the track, so that the distance of an inner side
+# decreases, when it turns backwards in a tight turn.
+# Returns a dictionary of tuples of the (M,) distances and the (M,) ratios
+# of the side's speed to the speed along the track by wheel id.
+def EvalSideLengths(_aFAC_Len, _aCurvSigned, _dicWheelOffsets):
+
+    aStep = np.diff(_aFAC_Len[: len(_aCurvSigned)])
+
+    dicSides = {}
+    for sWheel, aOffset in _dicWheelOffsets.items():
+        aRatio = 1.0 - aOffset[1] * _aCurvSigned
+        aLen = np.zeros(len(_aCurvSigned))
+        np.cumsum(aStep * aRatio[:-1], out=aLen[1:])
+        dicSides[sWheel] = (aLen, aRatio)
+    # endfor
+
+    return dicSides
+
+
+# enddef
+
+
+###############################################################################
+# Hash of all snapshot data the track tables depend on. Used to check
+# whether previously evaluated track tables are still valid.
+def GetSnapshotHash(_dicSnapshot):
+
+    xHash = hashlib.sha1()
+    xHash.update(np.ascontiguousarray(_dicSnapshot["aFAC_Pos"], np.float64).tobytes())
+    xHash.update(np.float64(_dicSnapshot["dAxisSep"]).tobytes())
+    xHash.update(np.asarray(_dicSnapshot["aUp"], np.float64).tobytes())
+
+    dicWheelOffsets = _dicSnapshot.get("dicWheelOffsets", {})
+    for sWheel in sorted(dicWheelOffsets):
+        xHash.update(sWheel.encode("utf-8"))
+        xHash.update(np.asarray(dicWheelOffsets[sWheel], np.float64).tobytes())
+    # endfor
+
+    tGroundMesh = _dicSnapshot.get("tGroundMesh")
+    if tGroundMesh is not None:
+        xHash.update(tGroundMesh[0].encode("utf-8"))
+        xHash.update(np.asarray(_dicSnapshot["mCurve"], np.float64).tobytes())
+        xHash.update(np.float64(_dicSnapshot["dWheelRadius"]).tobytes())
+        dicContactOffsets = _dicSnapshot["dicContactOffsets"]
+        for sName in sorted(dicContactOffsets):
+            xHash.update(sName.encode("utf-8"))
+            xHash.update(np.asarray(dicContactOffsets[sName], np.float64).tobytes())
+        # endfor
+    # endif
+
+    for dicTrailer in _dicSnapshot.get("lTrailers", []):
+        xHash.update(dicTrailer["sName"].encode("utf-8"))
+        xHash.update(np.asarray(dicTrailer["aHitchOffset"], np.float64).tobytes())
+        dicWheelOffsets = dicTrailer["dicWheelOffsets"]
+        for sWheel in sorted(dicWheelOffsets):
+            xHash.update(sWheel.encode("utf-8"))
+            xHash.update(np.asarray(dicWheelOffsets[sWheel], np.float64).tobytes())
+        # endfor
+    # endfor
+
+    return xHash.hexdigest()
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates all track tables of a planar single track model from
+# a track snapshot. The snapshot is a dictionary of plain arrays,
+# so that this function can run outside of Blender's main thread.
+#
+# The snapshot contains:
+#   aFAC_Pos: (N, 3) positions of the fixed axis center along the curve
+#   dAxisSep: distance between fixed axis and steering axis centers
+#   aUp: (3,) up vector
+#   dicWheelOffsets: dictionary of (3,) wheel positions
+#                    in the local frame of the fixed axis center
+#   tGroundMesh: optional terrain mesh in world coordinates, see
+#                clearance.GetWorldMesh(), which is sampled below the
+#                wheels to fit the terrain tables, see terrain.py, with
+#   mCurve: (4, 4) world matrix of the curve
+#   dWheelRadius: radius of the wheels
+#   dicContactOffsets: offsets of the wheel centers above the sampled points
+#   lTrailers: optional list of trailers, see trailer.EvalTrailerTables().
+#
+# All tables that are indexed per curve sample, apart from the
+# positions, lengths and derivatives of the fixed axis center,
+# have N-2 elements.
+#
+# The optional function funcProgress is called with the name of each stage
+# of the evaluation and the fraction of the stage that is done.
+def EvalTrackTables(_dicSnapshot, *, funcProgress=None):
+
+    def Progress(_sStage, _dFraction):
+        if funcProgress is not None:
+            funcProgress(_sStage, _dFraction)
+        # endif
+
+    # enddef
+
+    aFAC_Pos = np.asarray(_dicSnapshot["aFAC_Pos"], dtype=np.float64)
+    dAxisSep = _dicSnapshot["dAxisSep"]
+    aZ = np.asarray(_dicSnapshot["aUp"], dtype=np.float64)
+    dicWheelOffsets = _dicSnapshot.get("dicWheelOffsets", {})
+
+    iPntCnt = len(aFAC_Pos)
+    if iPntCnt < 3:
+        raise Exception("Vehicle path must be sampled with at least 3 points.")
+    # endif
+
+    Progress("Track", 0.0)
+
+    # Evaluate length of curve traced by fixed axis origin
+    # and calculate the derivative of the curve
+    dCurveTimeStep = 1
+    aFAC_Deriv = (aFAC_Pos[1:] - aFAC_Pos[:-1]) / dCurveTimeStep
+    aFAC_Len = GetAccumulatedLength(aFAC_Pos)
+
+    # Calculate the curve's second derivative and curvature
+    aD = aFAC_Deriv[:-1]
+    aFAC_Deriv2 = (aFAC_Deriv[1:] - aD) / dCurveTimeStep
+
+    aA = np.cross(aD, aFAC_Deriv2)
+    aA_Len = np.linalg.norm(aA, axis=1)
+    aDl = np.linalg.norm(aD, axis=1)
+    aFAC_Curv = aA_Len / (aDl * aDl * aDl)
+
+    aIsCurved = aFAC_Curv > dCurvEps
+    aFAC_CurvN = np.zeros_like(aA)
+    aFAC_CurvN[aIsCurved] = aA[aIsCurved] / aA_Len[aIsCurved, np.newaxis]
+
+    # Curvature with the sign of the rotation about the up vector
+    aSign = np.where(aFAC_CurvN @ aZ >= 0.0, 1.0, -1.0)
+    aFAC_CurvSigned = np.where(aIsCurved, aFAC_Curv * aSign, aFAC_Curv)
+
+    # Local frames along the track
+    aX = aD / aDl[:, np.newaxis]
+    aY = np.cross(aZ, aX)
+    aP = aFAC_Pos[:-2]
+
+    aSAC_Pos = aP + dAxisSep * aX
+    aSAC_Len = GetAccumulatedLength(aSAC_Pos)
+
+    # Eval rotation center
+    aR = np.cross(aFAC_CurvN, aX)
+    aRadius = np.zeros_like(aFAC_Curv)
+    aRadius[aIsCurved] = 1.0 / aFAC_Curv[aIsCurved]
+    aRC_Pos = aP + aRadius[:, np.newaxis] * aR
+
+    # Tracks of the wheels
+    dicWheelPos, dicWheelLen = GetWheelTracks(aP, aX, aY, aZ, dicWheelOffsets)
+
+    dicTrack = {
+        "aUp": aZ,
+        "dicWheelOffsets": {x: np.asarray(y, dtype=np.float64) for x, y in dicWheelOffsets.items()},
+        "dCurveTimeStep": dCurveTimeStep,
+        "dCurveTimeTotal": (iPntCnt - 1) * dCurveTimeStep,
+        "dAxisSep": dAxisSep,
+        "aFAC_Pos": aFAC_Pos,
+        "aFAC_Deriv": aFAC_Deriv,
+        "aFAC_Len": aFAC_Len,
+        "dFAC_LenTotal": float(aFAC_Len[-1]),
+        "aFAC_Deriv2": aFAC_Deriv2,
+        "aFAC_Curv": aFAC_Curv,
+        "aFAC_CurvSigned": aFAC_CurvSigned,
+        "aFAC_CurvN": aFAC_CurvN,
+        "aSAC_Pos": aSAC_Pos,
+        "aSAC_Len": aSAC_Len,
+        "aRC_Pos": aRC_Pos,
+        "aRC_Valid": aIsCurved,
+        "dicWheelPos": dicWheelPos,
+        "dicWheelLen": dicWheelLen,
+    }
+
+    tGroundMesh = _dicSnapshot.get("tGroundMesh")
+    if tGroundMesh is not None:
+        Progress("Terrain", 0.0)
+        dicContactOffsets = {x: np.asarray(y, dtype=np.float64) for x, y in _dicSnapshot["dicContactOffsets"].items()}
+        dicContacts = terrain.GetContactPositions(aFAC_Pos, aZ, dicContactOffsets, _dicSnapshot["dWheelRadius"])
+        dicGroundLift = terrain.SampleGroundLift(
+            tGroundMesh, _dicSnapshot["mCurve"], dicContacts, aZ, funcProgress=lambda x: Progress("Terrain", x)
+        )
+        dicTrack["dicContactOffsets"] = dicContactOffsets
+        dicTrack["dicGroundLift"] = dicGroundLift
+        dicTrack.update(terrain.EvalTerrainTables(dicContactOffsets, dicGroundLift))
+    # endif
+
+    # The wheels of trailers are added to the wheel tables of the vehicle
+    lTrailers = _dicSnapshot.get("lTrailers", [])
+    if len(lTrailers) > 0:
+        Progress("Trailers", 0.0)
+        dicTrailers = trailer.EvalTrailerTables(aP, aX, aY, aZ, lTrailers)
+        dicTrack["dicHitchAngle"] = dicTrailers["dicHitchAngle"]
+        for dicTrailer in lTrailers:
+            aH, aXt, aYt = dicTrailers["dicFrames"][dicTrailer["sName"]]
+            dicPos, dicLen = GetWheelTracks(aH, aXt, aYt, aZ, dicTrailer["dicWheelOffsets"])
+            dicWheelPos.update(dicPos)
+            dicWheelLen.update(dicLen)
+        # endfor
+    # endif
+
+    return dicTrack
+
+
+# enddef
+
+
+###############################################################################
+# Updates the track tables for a snapshot, whose curve points differ from
+# the points the tables were evaluated from only in a local span.
+# Since all per sample tables only depend on neighboring curve points,
+# only the tables of the affected span are evaluated again. The accumulated
+# lengths downstream of the span are shifted by the change in length.
+# If the snapshot differs in other parameters, follows a terrain or has
+# trailers, whose paths depend on the whole track before them,
+# the tables are fully evaluated.
+# The given track tables are not modified.
+def UpdateTrackTables(_dicTrack, _dicSnapshot):
+
+    aPosOld = _dicTrack["aFAC_Pos"]
+    aPos = np.asarray(_dicSnapshot["aFAC_Pos"], dtype=np.float64)
+    dicWheelOffsets = _dicSnapshot.get("dicWheelOffsets", {})
+    dicWheelPosOld = _dicTrack["dicWheelPos"]
+
+    iPntCnt = len(aPos)
+    if (
+        iPntCnt != len(aPosOld)
+        or iPntCnt < 8
+        or "tGroundMesh" in _dicSnapshot
+        or "dicGroundLift" in _dicTrack
+        or len(_dicSnapshot.get("lTrailers", [])) > 0
+        or "dicHitchAngle" in _dicTrack
+        or _dicSnapshot["dAxisSep"] != _dicTrack["dAxisSep"]
+        or not np.array_equal(_dicSnapshot["aUp"], _dicTrack["aUp"])
+        or set(dicWheelOffsets) != set(dicWheelPosOld)
+        or any(not np.array_equal(dicWheelOffsets[x], _dicTrack["dicWheelOffsets"][x]) for x in dicWheelOffsets)
+    ):
+        return EvalTrackTables(_dicSnapshot)
+    # endif
+
+    aChanged = np.flatnonzero(np.any(aPos != aPosOld, axis=1))
+    if len(aChanged) == 0:
+        return _dicTrack
+    # endif
+
+    # The tables at sample index k depend on the curve points k to k+2.
+    # The span is chosen, such that the tables at its first and last
+    # sample are unchanged, which allows to re-join the accumulated lengths.
+    iStart = max(0, int(aChanged[0]) - 3)
+    iEnd = min(iPntCnt, int(aChanged[-1]) + 4)
+
+    dicSpan = EvalTrackTables(
+        {
+            "aFAC_Pos": aPos[iStart:iEnd],
+            "dAxisSep": _dicSnapshot["dAxisSep"],
+            "aUp": _dicSnapshot["aUp"],
+            "dicWheelOffsets": dicWheelOffsets,
+        }
+    )
+
+    def UpdateTable(_aTable, _aSpan):
+        aTable = _aTable.copy()
+        aTable[iStart : iStart + len(_aSpan)] = _aSpan
+        return aTable
+
+    # enddef
+
+    def UpdateLength(_aLen, _aSpanLen):
+        aLen = _aLen.copy()
+        iSpanEnd = iStart + len(_aSpanLen)
+        aLen[iStart:iSpanEnd] = _aLen[iStart] + _aSpanLen
+        aLen[iSpanEnd:] += aLen[iSpanEnd - 1] - _aLen[iSpanEnd - 1]
+        return aLen
+
+    # enddef
+
+    dicTrack = dict(_dicTrack)
+    dicTrack["aFAC_Pos"] = aPos
+    for sTable in (
+        "aFAC_Deriv",
+        "aFAC_Deriv2",
+        "aFAC_Curv",
+        "aFAC_CurvSigned",
+        "aFAC_CurvN",
+        "aSAC_Pos",
+        "aRC_Pos",
+        "aRC_Valid",
+    ):
+        dicTrack[sTable] = UpdateTable(_dicTrack[sTable], dicSpan[sTable])
+    # endfor
+
+    dicTrack["aFAC_Len"] = UpdateLength(_dicTrack["aFAC_Len"], dicSpan["aFAC_Len"])
+    dicTrack["dFAC_LenTotal"] = float(dicTrack["aFAC_Len"][-1])
+    dicTrack["aSAC_Len"] = UpdateLength(_dicTrack["aSAC_Len"], dicSpan["aSAC_Len"])
+
+    dicTrack["dicWheelPos"] = {}
+    dicTrack["dicWheelLen"] = {}
+    for sWheel in dicWheelOffsets:
+        dicTrack["dicWheelPos"][sWheel] = UpdateTable(_dicTrack["dicWheelPos"][sWheel], dicSpan["dicWheelPos"][sWheel])
+        dicTrack["dicWheelLen"][sWheel] = UpdateLength(_dicTrack["dicWheelLen"][sWheel], dicSpan["dicWheelLen"][sWheel])
+    # endfor
+
+    return dicTrack
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the track tables for a list of snapshots in a pool of worker threads.
+# The evaluation consists of NumPy array operations, which release the
+# interpreter lock, so that the threads run concurrently.
+def EvalTrackTablesParallel(_lSnapshots, *, iWorkerCount=None):
+
+    if len(_lSnapshots) == 0:
+        return []
+    # endif
+
+    if iWorkerCount is None:
+        iWorkerCount = os.cpu_count() or 1
+    # endif
+    iWorkerCount = max(1, min(iWorkerCount, len(_lSnapshots)))
+
+    if iWorkerCount == 1:
+        return [EvalTrackTables(x) for x in _lSnapshots]
+    # endif
+
+    with ThreadPoolExecutor(max_workers=iWorkerCount) as xPool:
+        lTables = list(xPool.map(EvalTrackTables, _lSnapshots))
+    # endwith
+
+    return lTables
+
+
+# enddef
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \track_store.py
+# Created Date: Monday, October 19th 2026, 5:12:03 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Stores evaluated track tables as custom property of the vehicle's root
+# object, so that they are saved with the Blender file. The tables carry
+# the hash of the curve and rig data they were evaluated from, and are only
+# restored if the hash still matches.
+
+import numpy as np
+
+sTrackStoreKey = "AnyVehicle.Track"
+iTrackStoreVersion = 1
+
+
+###############################################################################
+def _AddArray(_xGroup, _sKey, _aData):
+
+    aData = np.asarray(_aData)
+    _xGroup["dicArrays"][_sKey] = aData.astype(np.float64).ravel().tolist()
+    _xGroup["dicShapes"][_sKey] = list(aData.shape)
+    _xGroup["dicTypes"][_sKey] = aData.dtype.str
+
+
+# enddef
+
+
+###############################################################################
+def _GetArray(_xGroup, _sKey):
+
+    aData = np.array(_xGroup["dicArrays"][_sKey], dtype=np.float64)
+    tShape = tuple(_xGroup["dicShapes"][_sKey])
+    return aData.reshape(tShape).astype(np.dtype(_xGroup["dicTypes"][_sKey]))
+
+
+# enddef
+
+
+###############################################################################
+def GetStoredHash(_objRoot):
+
+    xStore = _objRoot.get(sTrackStoreKey)
+    if xStore is None or xStore.get("iVersion") != iTrackStoreVersion:
+        return None
+    # endif
+
+    return xStore.get("sSourceHash")
+
+
+# enddef
+
+
+###############################################################################
+# Stores the track tables at the root object, unless tables with the same
+# source hash are already stored. Objects from linked libraries are skipped.
+def StoreTrack(_objRoot, _sSourceHash, _dicTrack):
+
+    if _objRoot.library is not None or GetStoredHash(_objRoot) == _sSourceHash:
+        return False
+    # endif
+
+    xGroup = {"dicScalars": {}, "dicArrays": {}, "dicShapes": {}, "dicTypes": {}}
+
+    for sKey, xValue in _dicTrack.items():
+        if isinstance(xValue, dict):
+            for sSubKey, aData in xValue.items():
+                _AddArray(xGroup, "{0}/{1}".format(sKey, sSubKey), aData)
+            # endfor
+        elif isinstance(xValue, np.ndarray):
+            _AddArray(xGroup, sKey, xValue)
+        else:
+            if isinstance(xValue, np.generic):
+                xValue = xValue.item()
+            # endif
+            xGroup["dicScalars"][sKey] = xValue
+        # endif
+    # endfor
+
+    xGroup["iVersion"] = iTrackStoreVersion
+    xGroup["sSourceHash"] = _sSourceHash
+    _objRoot[sTrackStoreKey] = xGroup
+
+    return True
+
+
+# enddef
+
+
+###############################################################################
+# Returns the stored track tables, if they were evaluated from data with
+# the given source hash. Otherwise returns None.
+def LoadTrack(_objRoot, _sSourceHash):
+
+    if GetStoredHash(_objRoot) != _sSourceHash:
+        return None
+    # endif
+
+    xStore = _objRoot[sTrackStoreKey]
+
+    dicTrack = {}
+    for sKey, dValue in xStore["dicScalars"].items():
+        dicTrack[sKey] = dValue
+    # endfor
+
+    for sKey in xStore["dicArrays"].keys():
+        aData = _GetArray(xStore, sKey)
+        sMain, sSep, sSubKey = sKey.partition("/")
+        if sSep:
+            dicTrack.setdefault(sMain, {})[sSubKey] = aData
+        else:
+            dicTrack[sKey] = aData
+        # endif
+    # endfor
+
+    # Models without wheel tables still expect the wheel dictionaries
+    for sKey in ("dicWheelOffsets", "dicWheelPos", "dicWheelLen"):
+        dicTrack.setdefault(sKey, {})
+    # endfor
+
+    return dicTrack
+
+
+# enddef
+
+
+###############################################################################
+def ClearTrack(_objRoot):
+
+    if _objRoot.library is None and sTrackStoreKey in _objRoot:
+        del _objRoot[sTrackStoreKey]
+    # endif
+
+
+# enddef
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \trailer.py
+# Created Date: Wednesday, October 21st 2026, 2:47:18 pm
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Paths of trailers, which are pulled by a vehicle along its track.
+# A trailer is hitched to the vehicle, or to the preceding trailer, at a
+# hitch point. Its axles do not steer, so that the center of its axles
+# follows a tractrix of the hitch path: it always moves towards the hitch,
+# at the fixed distance of the drawbar length.
+#
+# Along a straight segment of the hitch path with direction psi and length
+# ds, the angle a = theta - psi between the trailer heading theta and the
+# hitch direction evolves as tan(a/2) -> exp(-ds / L) * tan(a/2). As map of
+# the unit complex heading, this is a Moebius transformation. The headings
+# along the whole track are therefore obtained from the prefix products of
+# the 2x2 matrices of all segments, which are evaluated in log2(N)
+# vectorized steps, instead of stepping through the samples.
+
+import numpy as np
+
+
+###############################################################################
+# Returns two unit vectors, which span the plane perpendicular to _aZ.
+def _GetPlaneBasis(_aZ):
+
+    aE1 = np.zeros(3)
+    aE1[np.argmin(np.abs(_aZ))] = 1.0
+    aE1 -= (aE1 @ _aZ) * _aZ
+    aE1 /= np.linalg.norm(aE1)
+
+    return aE1, np.cross(_aZ, aE1)
+
+
+# enddef
+
+
+###############################################################################
+# The Moebius matrices of the segments have the form [[A, B], [B*, A*]].
+# This form is kept by matrix products, so each matrix is stored as the
+# pair of complex numbers A, B. Returns the pairs of the products
+# P[k] = M[k-1] @ ... @ M[0] of the _aA, _aB pairs, with P[0] the identity.
+# Since Moebius matrices only matter up to a scale, the products are
+# normalized to avoid overflows.
+def _GetPrefixProducts(_aA, _aB):
+
+    aA = np.concatenate(([1.0 + 0.0j], _aA))
+    aB = np.concatenate(([0.0j], _aB))
+
+    iStep = 1
+    while iStep < len(aA):
+        aA1, aB1 = aA[iStep:], aB[iStep:]
+        aA2, aB2 = aA[:-iStep], aB[:-iStep]
+        aProdA = aA1 * aA2 + aB1 * np.conj(aB2)
+        aProdB = aA1 * aB2 + aB1 * np.conj(aA2)
+        aScale = np.maximum(np.abs(aProdA), np.abs(aProdB))
+        aA[iStep:] = aProdA / aScale
+        aB[iStep:] = aProdB / aScale
+        iStep *= 2
+    # endwhile
+
+    return aA, aB
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the headings of a trailer with drawbar length _dLength, whose
+# hitch moves along the (M, 3) positions _aHitchPos. The headings are
+# returned as (M,) unit complex numbers in the basis _aE1, _aE2.
+# The trailer starts with the heading _cStart.
+def EvalTractrix(_aHitchPos, _aE1, _aE2, _dLength, _cStart):
+
+    aStep = np.diff(_aHitchPos, axis=0)
+    aC = aStep @ _aE1 + 1j * (aStep @ _aE2)
+    aDelta = np.abs(aC)
+    aU = np.divide(aC, aDelta, out=np.ones_like(aC), where=aDelta > 0.0)
+    aK = np.exp(-aDelta / _dLength)
+
+    aA, aB = _GetPrefixProducts((1.0 + aK).astype(np.complex128), (1.0 - aK) * aU)
+    aHead = (aA * _cStart + aB) / (np.conj(aB) * _cStart + np.conj(aA))
+
+    return aHead / np.abs(aHead)
+
+
+# enddef
+
+
+###############################################################################
+# Evaluates the tables of a chain of trailers along the track with the
+# (M, 3) origins _aP and axes _aX, _aY of the vehicle frames and the up
+# vector _aZ. Each trailer in _lTrailers is a dictionary with the elements:
+#   sName: name of the trailer's hitch
+#   aHitchOffset: (3,) position of the hitch in the frame of the vehicle,
+#       for the first trailer, or in the hitch frame of the preceding trailer.
+#   dicWheelOffsets: dictionary of (3,) wheel positions in the hitch frame,
+#       whose x-axis is the heading of the trailer.
+# The drawbar length is the distance of the mean wheel position behind the
+# hitch. At the start of the track, all trailers are aligned with the vehicle.
+#
+# Returns a dictionary with the elements:
+#   dicHitchAngle: (M,) angles of the trailers relative to the preceding
+#       trailer or the vehicle by trailer name
+#   dicFrames: tuple of the (M, 3) origins and x- and y-axes of the hitch
+#       frames by trailer name
+def EvalTrailerTables(_aP, _aX, _aY, _aZ, _lTrailers):
+
+    aE1, aE2 = _GetPlaneBasis(_aZ)
+
+    dicHitchAngle = {}
+    dicFrames = {}
+    aP, aX, aY = _aP, _aX, _aY
+
+    for dicTrailer in _lTrailers:
+        sName = dicTrailer["sName"]
+        aOffset = np.asarray(dicTrailer["aHitchOffset"], dtype=np.float64)
+        aHitchPos = aP + aX * aOffset[0] + aY * aOffset[1] + _aZ * aOffset[2]
+
+        lWheelX = [x[0] for x in dicTrailer["dicWheelOffsets"].values()]
+        dLength = -float(np.mean(lWheelX)) if len(lWheelX) > 0 else 0.0
+        if dLength <= 0.0:
+            raise Exception("The axles of trailer '{0}' must be behind its hitch.".format(sName))
+        # endif
+
+        aParentHead = aX @ aE1 + 1j * (aX @ aE2)
+        aParentHead /= np.abs(aParentHead)
+        aHead = EvalTractrix(aHitchPos, aE1, aE2, dLength, aParentHead[0])
+
+        aX = aHead.real[:, np.newaxis] * aE1 + aHead.imag[:, np.newaxis] * aE2
+        aY = np.cross(_aZ, aX)
+        aP = aHitchPos
+
+        dicHitchAngle[sName] = np.angle(aHead * np.conj(aParentHead))
+        dicFrames[sName] = (aP, aX, aY)
+    # endfor
+
+    return {"dicHitchAngle": dicHitchAngle, "dicFrames": dicFrames}
+
+
+# enddef
@@ -27,3 +27,9 @@
 ###
 
 dicVehicleModels = {}
+
+# Version of the vehicle rig data layout stored in Blender files.
+# Increase this value whenever the load handler has to convert
+# the rig data of older files.
+iRigSchemaVersion = 1
+sRigSchemaVersionKey = "AnyVehicle.SchemaVersion"
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \av_index.py
+# Created Date: Monday, October 19th 2026, 9:12:40 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+import bpy
+from bpy.app.handlers import persistent
+import pyjson5 as json
+
+# Index of vehicle root objects. Maps the root object's name to a dictionary
+# with the root object, the specification string the entry was created from,
+# the parsed specification and the resolved rig part objects.
+dicVehicles = {}
+
+# Maps the pointer of a rig part object to the name of its vehicle root.
+dicPartOwners = {}
+
+# The index is built lazily on first access after a file has been loaded.
+bIndexValid = False
+
+
+###############################################################################
+def _IsAlive(_objX):
+    try:
+        _objX.name
+    except ReferenceError:
+        return False
+    # endtry
+    return True
+
+
+# enddef
+
+
+###############################################################################
+# Removes the part pointers of a vehicle entry from the map of part owners
+def _RemovePartOwners(_dicEntry):
+
+    sRoot = _dicEntry["sRootName"]
+    for iPointer in _dicEntry["setPartPointers"]:
+        if dicPartOwners.get(iPointer) == sRoot:
+            del dicPartOwners[iPointer]
+        # endif
+    # endfor
+    _dicEntry["setPartPointers"] = set()
+
+
+# enddef
+
+
+###############################################################################
+def _AddPartOwner(_dicEntry, _objX):
+
+    iPointer = _objX.as_pointer()
+    dicPartOwners[iPointer] = _dicEntry["sRootName"]
+    _dicEntry["setPartPointers"].add(iPointer)
+
+
+# enddef
+
+
+###############################################################################
+# Returns True, if the object is a live rig part of the vehicle entry.
+def _IsPartOf(_dicEntry, _objX):
+
+    iPointer = _objX.as_pointer()
+    for objPart in _dicEntry["dicParts"].values():
+        if objPart is not None and _IsAlive(objPart) and objPart.as_pointer() == iPointer:
+            return True
+        # endif
+    # endfor
+
+    return False
+
+
+# enddef
+
+
+###############################################################################
+def _ResolveParts(_dicEntry):
+
+    # The previous parts may have been renamed, replaced or deleted
+    _RemovePartOwners(_dicEntry)
+    _dicEntry["sRootName"] = _dicEntry["objRoot"].name
+
+    dicParts = {}
+    for sKey, xValue in _dicEntry["dicSpec"].items():
+        if not sKey.startswith("sObj") or not isinstance(xValue, str):
+            continue
+        # endif
+
+        if xValue == "":
+            continue
+        # endif
+
+        objX = bpy.data.objects.get(xValue)
+        dicParts[sKey] = objX
+        if objX is not None:
+            _AddPartOwner(_dicEntry, objX)
+        # endif
+    # endfor
+
+    _dicEntry["dicParts"] = dicParts
+
+
+# enddef
+
+
+###############################################################################
+def _CreateEntry(_objRoot):
+
+    sSpec = _objRoot.get("AnyVehicle")
+    try:
+        dicSpec = json.loads(sSpec)
+    except Exception:
+        dicSpec = {}
+    # endtry
+
+    dicEntry = {
+        "objRoot": _objRoot,
+        "sRootName": _objRoot.name,
+        "sSpec": sSpec,
+        "dicSpec": dicSpec,
+        "dicParts": {},
+        "setPartPointers": set(),
+    }
+    _ResolveParts(dicEntry)
+
+    return dicEntry
+
+
+# enddef
+
+
+###############################################################################
+def Invalidate():
+    global bIndexValid
+
+    dicVehicles.clear()
+    dicPartOwners.clear()
+    bIndexValid = False
+
+
+# enddef
+
+
+###############################################################################
+def Rebuild():
+    global bIndexValid
+
+    dicVehicles.clear()
+    dicPartOwners.clear()
+
+    for objX in bpy.data.objects:
+        if objX.type == "EMPTY" and "AnyVehicle" in objX:
+            dicVehicles[objX.name] = _CreateEntry(objX)
+        # endif
+    # endfor
+
+    bIndexValid = True
+
+
+# enddef
+
+
+###############################################################################
+def _EnsureIndex():
+    if not bIndexValid:
+        Rebuild()
+    # endif
+
+
+# enddef
+
+
+###############################################################################
+def AddVehicle(_objRoot):
+
+    _EnsureIndex()
+    dicVehicles[_objRoot.name] = _CreateEntry(_objRoot)
+
+
+# enddef
+
+
+###############################################################################
+def RemoveVehicle(_objRoot):
+
+    _EnsureIndex()
+    for sName, dicEntry in list(dicVehicles.items()):
+        if dicEntry["objRoot"] == _objRoot:
+            _RemovePartOwners(dicEntry)
+            del dicVehicles[sName]
+        # endif
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+def _Validate():
+
+    # Removes entries whose root object was deleted or lost its vehicle
+    # specification, and re-keys entries of renamed root objects.
+    lRenamed = []
+    for sName, dicEntry in list(dicVehicles.items()):
+        objRoot = dicEntry["objRoot"]
+        if not _IsAlive(objRoot) or "AnyVehicle" not in objRoot:
+            _RemovePartOwners(dicEntry)
+            del dicVehicles[sName]
+        elif objRoot.name != sName:
+            del dicVehicles[sName]
+            lRenamed.append(dicEntry)
+        # endif
+    # endfor
+
+    for dicEntry in lRenamed:
+        # The part owners are stored by root name
+        _ResolveParts(dicEntry)
+        dicVehicles[dicEntry["objRoot"].name] = dicEntry
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+def _GetEntry(_objRoot):
+
+    _EnsureIndex()
+    if not _IsAlive(_objRoot) or "AnyVehicle" not in _objRoot:
+        return None
+    # endif
+
+    dicEntry = dicVehicles.get(_objRoot.name)
+    if dicEntry is None or dicEntry["objRoot"] != _objRoot:
+        if dicEntry is not None:
+            _RemovePartOwners(dicEntry)
+        # endif
+        dicEntry = _CreateEntry(_objRoot)
+        dicVehicles[_objRoot.name] = dicEntry
+
+    elif dicEntry["sSpec"] != _objRoot["AnyVehicle"]:
+        _RemovePartOwners(dicEntry)
+        dicEntry.update(_CreateEntry(_objRoot))
+
+    # endif
+
+    return dicEntry
+
+
+# enddef
+
+
+###############################################################################
+def GetVehicleRoots():
+
+    _EnsureIndex()
+    _Validate()
+    return [x["objRoot"] for x in dicVehicles.values()]
+
+
+# enddef
+
+
+###############################################################################
+# Returns the parsed "AnyVehicle" specification of a vehicle root object,
+# or None if the object is no vehicle root. Do not modify the returned
+# dictionary.
+def GetSpec(_objRoot):
+
+    dicEntry = _GetEntry(_objRoot)
+    if dicEntry is None:
+        return None
+    # endif
+
+    return dicEntry["dicSpec"]
+
+
+# enddef
+
+
+###############################################################################
+# Returns a dictionary that maps the "sObj..." keys of the vehicle specification
+# to the resolved Blender objects. Objects that do not exist map to None.
+# Rig parts that have been renamed since the specification was written
+# are updated in the specification, unless the root is linked from a library.
+def GetRigParts(_objRoot):
+
+    dicEntry = _GetEntry(_objRoot)
+    if dicEntry is None:
+        return None
+    # endif
+
+    dicParts = dicEntry["dicParts"]
+    dicSpec = dicEntry["dicSpec"]
+    bRenamed = False
+    for sKey, objX in dicParts.items():
+        if objX is None:
+            continue
+        # endif
+
+        if not _IsAlive(objX):
+            objX = bpy.data.objects.get(dicSpec[sKey])
+            dicParts[sKey] = objX
+            if objX is not None:
+                _AddPartOwner(dicEntry, objX)
+            # endif
+            continue
+        # endif
+
+        if objX.name != dicSpec[sKey]:
+            dicSpec[sKey] = objX.name
+            bRenamed = True
+        # endif
+    # endfor
+
+    # Linked roots cannot be changed, so their renamed parts are only
+    # updated in the index.
+    if bRenamed and _objRoot.library is None:
+        sSpec = json.dumps(dicSpec)
+        _objRoot["AnyVehicle"] = sSpec
+        dicEntry["sSpec"] = sSpec
+    # endif
+
+    return dicParts
+
+
+# enddef
+
+
+###############################################################################
+# Handler
+@persistent
+def AnyVehicle_UpdateIndexOnLoad(_xScene):
+    Invalidate()
+
+
+# enddef
+
+
+###############################################################################
+# Handler
+@persistent
+def AnyVehicle_UpdateIndex(_xScene, _xDepsGraph):
+
+    if not bIndexValid:
+        return
+    # endif
+
+    _Validate()
+
+    for xUpdate in _xDepsGraph.updates:
+        xId = xUpdate.id
+        if not isinstance(xId, bpy.types.Object):
+            continue
+        # endif
+
+        objX = xId.original
+        if objX.type == "EMPTY" and "AnyVehicle" in objX:
+            dicEntry = dicVehicles.get(objX.name)
+            if dicEntry is None or dicEntry["objRoot"] != objX:
+                if dicEntry is not None:
+                    _RemovePartOwners(dicEntry)
+                # endif
+                dicVehicles[objX.name] = _CreateEntry(objX)
+            # endif
+        # endif
+
+        # Update the specification of a vehicle if one of its parts was renamed.
+        # The pointer of a deleted part may have been reused by another object,
+        # so the owner is checked again.
+        sRoot = dicPartOwners.get(objX.as_pointer())
+        if sRoot is not None:
+            dicEntry = dicVehicles.get(sRoot)
+            if dicEntry is not None and _IsPartOf(dicEntry, objX):
+                GetRigParts(dicEntry["objRoot"])
+            else:
+                del dicPartOwners[objX.as_pointer()]
+            # endif
+        # endif
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+# Register
+def register():
+    Invalidate()
+
+    if AnyVehicle_UpdateIndexOnLoad not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(AnyVehicle_UpdateIndexOnLoad)
+    # endif
+
+    if AnyVehicle_UpdateIndex not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(AnyVehicle_UpdateIndex)
+    # endif
+
+
+# enddef
+
+
+def unregister():
+    if AnyVehicle_UpdateIndex in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(AnyVehicle_UpdateIndex)
+    # endif
+
+    if AnyVehicle_UpdateIndexOnLoad in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(AnyVehicle_UpdateIndexOnLoad)
+    # endif
+
+    Invalidate()
+
+
+# enddef
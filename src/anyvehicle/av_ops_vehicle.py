@@ -32,7 +32,9 @@ from bpy.app.handlers import persistent
 import mathutils
 import pyjson5 as json
 from . import av_global
+from . import av_index
 from .anim import path as animpath
+from .anim import track_store
 import anyblend
 
 #######################################################################################
@@ -67,6 +69,7 @@ class AV_OP_Vehicle_CreateModel_4w(bpy.types.Operator):
             }
 
             objSel["AnyVehicle"] = json.dumps(dicData)
+            av_index.AddVehicle(objSel)
         # endif
 
         return {"FINISHED"}
@@ -106,6 +109,7 @@ class AV_OP_Vehicle_CreateModel_2w(bpy.types.Operator):
             }
 
             objSel["AnyVehicle"] = json.dumps(dicData)
+            av_index.AddVehicle(objSel)
         # endif
 
         return {"FINISHED"}
@@ -126,6 +130,7 @@ class AV_OP_Vehicle_RemoveModel(bpy.types.Operator):
         objSel = bpy.context.active_object
         if objSel is not None and objSel.get("AnyVehicle") is not None:
             del objSel["AnyVehicle"]
+            av_index.RemoveVehicle(objSel)
         # endif
 
         return {"FINISHED"}
@@ -184,6 +189,7 @@ class AV_OP_Vehicle_EvalModelPath(bpy.types.Operator):
         anyblend.anim.util.RegisterAnimObject(
             sName, dicModel, animpath.CreateAnimHandler
         )
+        _ReportTrackErrors([objSel], self.report)
 
         return {"FINISHED"}
 
@@ -193,6 +199,47 @@ class AV_OP_Vehicle_EvalModelPath(bpy.types.Operator):
 # endclass
 
 
+#######################################################################################
+# Reports the errors of the tracks of the given vehicle root objects, e.g.
+# schedules that cannot be met, after their tracks have been evaluated.
+def _ReportTrackErrors(_lRoots, _funcReport):
+
+    dicErrors = animpath.GetTrackErrors()
+    for objRoot in _lRoots:
+        sError = dicErrors.get(objRoot.name)
+        if sError is not None:
+            _funcReport({"WARNING"}, "Vehicle '{0}': {1}".format(objRoot.name, sError))
+        # endif
+    # endfor
+
+
+# enddef
+
+
+#######################################################################################
+# Registers the animation handlers of the given vehicle root objects.
+# Returns False, if a vehicle has invalid animation data.
+def _RegisterVehicleAnims(_lRoots, _funcReport):
+
+    for objSel in _lRoots:
+
+        sName = objSel.name
+        dicModel = dict(av_index.GetSpec(objSel))
+        sModelType = dicModel.get("sType")
+        if sModelType is None:
+            _funcReport({"ERROR"}, "Object '{0}' has invalid vehicle animation data.".format(sName))
+            return False
+        # endif
+
+        anyblend.anim.util.RegisterAnimObject(sName, dicModel, animpath.CreateAnimHandler)
+    # endfor
+
+    return True
+
+
+# enddef
+
+
 #######################################################################################
 class AV_OP_Vehicle_EvalAllModelPaths(bpy.types.Operator):
 
@@ -202,31 +249,341 @@ class AV_OP_Vehicle_EvalAllModelPaths(bpy.types.Operator):
 
     def execute(self, context):
 
-        for objSel in bpy.data.objects:
+        # Register all vehicles first, reading the Blender data for each track
+        # on the main thread, and then evaluate all tracks in parallel.
+        lRoots = av_index.GetVehicleRoots()
+        animpath.StartDeferredTrackEval()
+        try:
+            _RegisterVehicleAnims(lRoots, self.report)
+        finally:
+            animpath.FinishDeferredTrackEval()
+        # endtry
 
-            if objSel.type != "EMPTY":
-                continue
-            # endif
+        _ReportTrackErrors(lRoots, self.report)
 
-            sModelData = objSel.get("AnyVehicle")
-            if sModelData is None:
-                continue
-            # endif
+        return {"FINISHED"}
 
-            sName = objSel.name
-            dicModel = json.loads(sModelData)
-            sModelType = dicModel.get("sType")
-            if sModelType is None:
-                self.report(
-                    {"ERROR"},
-                    "Object '{0}' has invalid vehicle animation data.".format(sName),
-                )
+    # enddef
+
+
+# endclass
+
+
+#######################################################################################
+# Registers the animation handlers of the vehicles and evaluates
+# their tracks in a background thread.
+def _StartBackgroundEval(_lRoots, _funcReport):
+
+    if animpath.IsBackgroundTrackEvalRunning():
+        _funcReport({"ERROR"}, "Vehicle track evaluation is already running.")
+        return
+    # endif
+
+    animpath.StartDeferredTrackEval()
+    try:
+        _RegisterVehicleAnims(_lRoots, _funcReport)
+    finally:
+        lTracks = animpath.TakeDeferredTracks()
+    # endtry
+
+    animpath.StartBackgroundTrackEval(lTracks)
+
+
+# enddef
+
+
+#######################################################################################
+class AV_OP_Vehicle_EvalModelPathsBackground(bpy.types.Operator):
+
+    bl_idname = "av.vehicle_eval_model_paths_background"
+    bl_label = "Evaluate in background"
+    bl_description = "Click to evaluate model paths in the background, while you continue working."
+
+    bAllVehicles: bpy.props.BoolProperty(default=True, description="Evaluate all vehicles or only the active vehicle")
+
+    def execute(self, context):
+
+        if self.bAllVehicles:
+            lRoots = av_index.GetVehicleRoots()
+        else:
+            objSel = bpy.context.active_object
+            if objSel is None or av_index.GetSpec(objSel) is None:
                 return {"FINISHED"}
             # endif
+            lRoots = [objSel]
+        # endif
+
+        _StartBackgroundEval(lRoots, self.report)
+
+        return {"FINISHED"}
+
+    # enddef
+
 
-            anyblend.anim.util.RegisterAnimObject(
-                sName, dicModel, animpath.CreateAnimHandler
+# endclass
+
+
+#######################################################################################
+class AV_OP_Vehicle_CancelModelPathEval(bpy.types.Operator):
+
+    bl_idname = "av.vehicle_cancel_model_path_eval"
+    bl_label = "Cancel"
+    bl_description = "Click to cancel the background evaluation of model paths."
+
+    def execute(self, context):
+        animpath.CancelBackgroundTrackEval()
+        return {"FINISHED"}
+
+    # enddef
+
+
+# endclass
+
+
+#######################################################################################
+class AV_OP_Vehicle_BakePoses(bpy.types.Operator):
+
+    bl_idname = "av.vehicle_bake_poses"
+    bl_label = "Bake poses"
+    bl_description = (
+        "Click to write the poses of all evaluated vehicles for the scene frame "
+        "range to a pose bake file, which can be replayed on render nodes."
+    )
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.avpose", options={"HIDDEN"})
+
+    sEncoding: bpy.props.EnumProperty(
+        name="Encoding",
+        items=[
+            ("f32", "Float", "Store poses as 32-bit floats"),
+            ("q16", "Quantized", "Store poses as quantized 16-bit values"),
+            ("q16d", "Quantized delta", "Store poses as quantized and delta coded values"),
+        ],
+        default="f32",
+    )
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = bpy.path.ensure_ext(bpy.path.abspath("//vehicle_poses"), ".avpose")
+        # endif
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    # enddef
+
+    def execute(self, context):
+
+        try:
+            lNames = animpath.BakePoses(self.filepath, context.scene, sEncoding=self.sEncoding)
+        except Exception as xEx:
+            self.report({"ERROR"}, str(xEx))
+            return {"CANCELLED"}
+        # endtry
+
+        if len(lNames) == 0:
+            self.report({"WARNING"}, "No evaluated vehicle paths available to bake")
+        else:
+            self.report({"INFO"}, "Baked poses of {0} vehicles".format(len(lNames)))
+        # endif
+
+        return {"FINISHED"}
+
+    # enddef
+
+
+# endclass
+
+
+#######################################################################################
+class AV_OP_Vehicle_WriteBoxLabels(bpy.types.Operator):
+
+    bl_idname = "av.vehicle_write_box_labels"
+    bl_label = "Write box labels"
+    bl_description = (
+        "Click to write the oriented 3D bounding boxes of all evaluated vehicles "
+        "for the scene frame range to one label file per frame."
+    )
+
+    directory: bpy.props.StringProperty(subtype="DIR_PATH")
+
+    bProjectToCamera: bpy.props.BoolProperty(
+        name="Project to camera", default=True, description="Add the 2D boxes in the active camera at the current frame"
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    # enddef
+
+    def execute(self, context):
+
+        try:
+            iFileCnt = animpath.WriteBoxLabels(self.directory, context.scene, bProjectToCamera=self.bProjectToCamera)
+        except Exception as xEx:
+            self.report({"ERROR"}, str(xEx))
+            return {"CANCELLED"}
+        # endtry
+
+        self.report({"INFO"}, "Wrote {0} label files".format(iFileCnt))
+
+        return {"FINISHED"}
+
+    # enddef
+
+
+# endclass
+
+
+#######################################################################################
+class AV_OP_Vehicle_WriteBevRasters(bpy.types.Operator):
+
+    bl_idname = "av.vehicle_write_bev_rasters"
+    bl_label = "Write BEV rasters"
+    bl_description = (
+        "Click to write bird's-eye-view occupancy and velocity grids of all "
+        "evaluated vehicles for the scene frame range."
+    )
+
+    directory: bpy.props.StringProperty(subtype="DIR_PATH")
+
+    fCellSize: bpy.props.FloatProperty(
+        name="Cell size", default=0.25, min=0.01, subtype="DISTANCE", description="Size of a grid cell"
+    )
+
+    fMargin: bpy.props.FloatProperty(
+        name="Margin",
+        default=5.0,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Margin of the grid about the vehicle tracks",
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    # enddef
+
+    def execute(self, context):
+
+        try:
+            tShape = animpath.WriteBevRasters(
+                self.directory, context.scene, dCellSize=self.fCellSize, dMargin=self.fMargin
             )
+        except Exception as xEx:
+            self.report({"ERROR"}, str(xEx))
+            return {"CANCELLED"}
+        # endtry
+
+        self.report({"INFO"}, "Wrote {0} BEV frames of {2} x {1} cells".format(*tShape))
+
+        return {"FINISHED"}
+
+    # enddef
+
+
+# endclass
+
+
+#######################################################################################
+class AV_OP_Vehicle_CheckConflicts(bpy.types.Operator):
+
+    bl_idname = "av.vehicle_check_conflicts"
+    bl_label = "Check conflicts"
+    bl_description = "Click to check whether the footprints of evaluated vehicles overlap within the scene frame range."
+
+    iFrameStep: bpy.props.IntProperty(
+        name="Frame step", default=1, min=1, description="Step between the checked frames"
+    )
+
+    def execute(self, context):
+
+        try:
+            dicConflicts = animpath.FindConflicts(context.scene, iFrameStep=self.iFrameStep)
+        except Exception as xEx:
+            self.report({"ERROR"}, str(xEx))
+            return {"CANCELLED"}
+        # endtry
+
+        if len(dicConflicts) == 0:
+            self.report({"INFO"}, "No vehicle conflicts found")
+            return {"FINISHED"}
+        # endif
+
+        for (sObjA, sObjB), lIntervals in sorted(dicConflicts.items()):
+            sFrames = ", ".join("{0}-{1}".format(*x) for x in lIntervals)
+            self.report({"WARNING"}, "Vehicles '{0}' and '{1}' overlap at frames {2}".format(sObjA, sObjB, sFrames))
+        # endfor
+
+        return {"FINISHED"}
+
+    # enddef
+
+
+# endclass
+
+
+#######################################################################################
+class AV_OP_Vehicle_CheckClearance(bpy.types.Operator):
+
+    bl_idname = "av.vehicle_check_clearance"
+    bl_label = "Check clearance"
+    bl_description = (
+        "Click to check whether evaluated vehicles collide with the static "
+        "objects of a collection along their paths."
+    )
+
+    sCollection: bpy.props.StringProperty(
+        name="Collection", description="Collection of static objects, or the whole scene if empty"
+    )
+
+    fGroundClearance: bpy.props.FloatProperty(
+        name="Ground clearance",
+        default=0.05,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Height above the ground, below which nothing is checked",
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    # enddef
+
+    def draw(self, context):
+        self.layout.prop_search(self, "sCollection", bpy.data, "collections")
+        self.layout.prop(self, "fGroundClearance")
+
+    # enddef
+
+    def execute(self, context):
+
+        try:
+            dicCollisions = animpath.CheckClearance(
+                context.scene, self.sCollection, dGroundClearance=self.fGroundClearance
+            )
+        except Exception as xEx:
+            self.report({"ERROR"}, str(xEx))
+            return {"CANCELLED"}
+        # endtry
+
+        if len(dicCollisions) == 0:
+            self.report({"INFO"}, "No collisions with static objects found")
+            return {"FINISHED"}
+        # endif
+
+        for sObj, lSpans in sorted(dicCollisions.items()):
+            for dicSpan in lSpans:
+                self.report(
+                    {"WARNING"},
+                    "Vehicle '{0}' ({1}) hits '{2}' at {3:.2f}-{4:.2f} m, "
+                    "{5:.2f}-{6:.2f} s".format(
+                        sObj, dicSpan["sPart"], dicSpan["sObject"], *dicSpan["lArcLen"], *dicSpan["lTime"]
+                    ),
+                )
+            # endfor
         # endfor
 
         return {"FINISHED"}
@@ -237,34 +594,158 @@ class AV_OP_Vehicle_EvalAllModelPaths(bpy.types.Operator):
 # endclass
 
 
+###################################################################################
+# Stores the evaluated vehicle tracks in the file, or removes stored tracks,
+# depending on the scene setting.
+@persistent
+def AnyVehicle_StoreTracksOnSave(_xScene):
+
+    xScene = bpy.context.scene
+    if xScene is None:
+        return
+    # endif
+
+    if xScene.AnyVehicleStoreTracks:
+        animpath.StoreModelTracks()
+    else:
+        for objRoot in av_index.GetVehicleRoots():
+            track_store.ClearTrack(objRoot)
+        # endfor
+    # endif
+
+
+# enddef
+
+
+###################################################################################
+# Timer function to pre-warm the vehicle tracks after a file has been loaded.
+# Errors are shown with the track errors in the vehicle panel.
+def _PrewarmTracks():
+
+    def Report(_setType, _sText):
+        animpath.SetTrackError("Pre-warm", _sText)
+
+    # enddef
+
+    animpath.SetTrackError("Pre-warm", None)
+    _StartBackgroundEval(av_index.GetVehicleRoots(), Report)
+    return None
+
+
+# enddef
+
+
 ###################################################################################
 # Handler
 @persistent
-def AnyVehicle_UpdateRigs(_xScene):
+def AnyVehicle_PrewarmTracksOnLoad(_xScene):
 
-    # Update vehicle rig data to new version
-    for objX in bpy.data.objects:
-        if objX.get("AnyBlend.Vehicle") is not None:
-            objX["AnyVehicle"] = objX["AnyBlend.Vehicle"]
-            del objX["AnyBlend.Vehicle"]
+    xScene = bpy.context.scene
+    if xScene is None or not xScene.AnyVehiclePrewarmTracks:
+        return
+    # endif
 
-            dicData = json.loads(objX["AnyVehicle"])
-            sType = dicData.get("sType")
-            if sType == "vehicle.path.4w.singletrack.planar.v1":
-                dicData[
-                    "sType"
-                ] = "/catharsys/blender/animate/vehicle/path/4w/singletrack/planar:1.0"
+    # Start the evaluation after loading has finished
+    if not bpy.app.timers.is_registered(_PrewarmTracks):
+        bpy.app.timers.register(_PrewarmTracks, first_interval=0.0)
+    # endif
 
-            elif sType == "vehicle.path.2w.singletrack.planar.v1":
-                dicData[
-                    "sType"
-                ] = "/catharsys/blender/animate/vehicle/path/2w/singletrack/planar:1.0"
 
-            # endif
-            objX["AnyVehicle"] = json.dumps(dicData)
+# enddef
+
+
+###################################################################################
+def _IsRigSchemaCurrent():
+
+    # The schema version is stored with the local scenes of a file. The
+    # migration covers all objects of a file at once, so a single local
+    # scene with the current version marks the whole file as migrated,
+    # also if scenes have been added since. Linked scenes cannot be
+    # stamped, so they are not checked.
+    for xScene in bpy.data.scenes:
+        if xScene.library is None and xScene.get(av_global.sRigSchemaVersionKey, 0) >= av_global.iRigSchemaVersion:
+            return True
+        # endif
+    # endfor
+
+    return False
+
+
+# enddef
+
+
+###################################################################################
+def _SetRigSchemaCurrent():
+
+    for xScene in bpy.data.scenes:
+        # Scenes linked from libraries cannot be changed
+        if xScene.library is not None:
+            continue
+        # endif
+        xScene[av_global.sRigSchemaVersionKey] = av_global.iRigSchemaVersion
+    # endfor
+
+
+# enddef
+
+
+###################################################################################
+def _UpdateLegacyRig(_objX):
+
+    _objX["AnyVehicle"] = _objX["AnyBlend.Vehicle"]
+    del _objX["AnyBlend.Vehicle"]
+
+    dicData = json.loads(_objX["AnyVehicle"])
+    sType = dicData.get("sType")
+    if sType == "vehicle.path.4w.singletrack.planar.v1":
+        dicData["sType"] = "/catharsys/blender/animate/vehicle/path/4w/singletrack/planar:1.0"
+
+    elif sType == "vehicle.path.2w.singletrack.planar.v1":
+        dicData["sType"] = "/catharsys/blender/animate/vehicle/path/2w/singletrack/planar:1.0"
+
+    # endif
+    _objX["AnyVehicle"] = json.dumps(dicData)
+
+
+# enddef
+
+
+###################################################################################
+# Stamps the current rig schema version on save, also on scenes added
+# since the file was loaded. Legacy rigs have been migrated on load, so
+# only legacy files are scanned by AnyVehicle_UpdateRigs().
+@persistent
+def AnyVehicle_StampRigSchemaOnSave(_xScene):
+
+    _SetRigSchemaCurrent()
+
+
+# enddef
+
+
+###################################################################################
+# Handler
+@persistent
+def AnyVehicle_UpdateRigs(_xScene):
+
+    # Files that have already been migrated need no scan at all
+    if _IsRigSchemaCurrent():
+        return
+    # endif
+
+    # Update vehicle rig data to new version. Only objects that carry
+    # the legacy property are parsed and rewritten.
+    lLegacyObjects = [objX for objX in bpy.data.objects if "AnyBlend.Vehicle" in objX]
+    for objX in lLegacyObjects:
+        if objX.library is not None:
+            continue
         # endif
+        _UpdateLegacyRig(objX)
     # endfor
 
+    _SetRigSchemaCurrent()
+    av_index.Invalidate()
+
 
 # enddef
 
@@ -272,15 +753,89 @@ def AnyVehicle_UpdateRigs(_xScene):
 #######################################################################################
 # Register
 def register():
+    bpy.types.Scene.AnyVehiclePrewarmTracks = bpy.props.BoolProperty(
+        name="Pre-warm tracks on load",
+        default=False,
+        description="Evaluate all vehicle tracks in the background, when the file is loaded",
+    )
+
+    bpy.types.Scene.AnyVehicleStoreTracks = bpy.props.BoolProperty(
+        name="Store tracks in file",
+        default=False,
+        description="Store the evaluated vehicle tracks in the Blender file, "
+        "so that they need not be evaluated again when the file is loaded",
+    )
+
+    bpy.types.Scene.AnyVehicleCullEnabled = bpy.props.BoolProperty(
+        name="Cull vehicle updates",
+        default=False,
+        description="Only update the root transform of vehicles far from the "
+        "active camera, and do not update vehicles outside of its view. "
+        "Shadows and reflections of culled vehicles may be outdated",
+    )
+    bpy.types.Scene.AnyVehicleCullDistance = bpy.props.FloatProperty(
+        name="Distance",
+        default=150.0,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Vehicles further away from the active camera only get their root transform updated",
+    )
+    bpy.types.Scene.AnyVehicleCullMargin = bpy.props.FloatProperty(
+        name="Margin",
+        default=2.0,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Margin about the camera view, within which vehicles are still updated",
+    )
+
     # add handler if not in app.handlers
     if AnyVehicle_UpdateRigs not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(AnyVehicle_UpdateRigs)
     # endif
 
+    if AnyVehicle_PrewarmTracksOnLoad not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(AnyVehicle_PrewarmTracksOnLoad)
+    # endif
+
+    if animpath.AnyVehicle_UpdateTracks not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(animpath.AnyVehicle_UpdateTracks)
+    # endif
+
+    for lHandlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if animpath.AnyVehicle_ResetPoses not in lHandlers:
+            lHandlers.append(animpath.AnyVehicle_ResetPoses)
+        # endif
+    # endfor
+
+    if AnyVehicle_StoreTracksOnSave not in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.append(AnyVehicle_StoreTracksOnSave)
+    # endif
+
+    if AnyVehicle_StampRigSchemaOnSave not in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.append(AnyVehicle_StampRigSchemaOnSave)
+    # endif
+
+    for lHandlers, funcHandler in (
+        (bpy.app.handlers.save_pre, animpath.AnyVehicle_ShowVehiclesOnSave),
+        (bpy.app.handlers.save_post, animpath.AnyVehicle_HideVehiclesAfterSave),
+        (bpy.app.handlers.load_pre, animpath.AnyVehicle_ShowVehiclesOnLoad),
+    ):
+        if funcHandler not in lHandlers:
+            lHandlers.append(funcHandler)
+        # endif
+    # endfor
+
     bpy.utils.register_class(AV_OP_Vehicle_CreateModel_2w)
     bpy.utils.register_class(AV_OP_Vehicle_CreateModel_4w)
     bpy.utils.register_class(AV_OP_Vehicle_EvalModelPath)
     bpy.utils.register_class(AV_OP_Vehicle_EvalAllModelPaths)
+    bpy.utils.register_class(AV_OP_Vehicle_EvalModelPathsBackground)
+    bpy.utils.register_class(AV_OP_Vehicle_CancelModelPathEval)
+    bpy.utils.register_class(AV_OP_Vehicle_BakePoses)
+    bpy.utils.register_class(AV_OP_Vehicle_WriteBoxLabels)
+    bpy.utils.register_class(AV_OP_Vehicle_WriteBevRasters)
+    bpy.utils.register_class(AV_OP_Vehicle_CheckConflicts)
+    bpy.utils.register_class(AV_OP_Vehicle_CheckClearance)
     bpy.utils.register_class(AV_OP_Vehicle_RemoveModel)
 
 
@@ -294,11 +849,60 @@ def unregister():
         bpy.app.handlers.load_post.remove(AnyVehicle_UpdateRigs)
     # endif
 
+    if AnyVehicle_PrewarmTracksOnLoad in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(AnyVehicle_PrewarmTracksOnLoad)
+    # endif
+
+    if animpath.AnyVehicle_UpdateTracks in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(animpath.AnyVehicle_UpdateTracks)
+    # endif
+
+    for lHandlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if animpath.AnyVehicle_ResetPoses in lHandlers:
+            lHandlers.remove(animpath.AnyVehicle_ResetPoses)
+        # endif
+    # endfor
+
+    if AnyVehicle_StoreTracksOnSave in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(AnyVehicle_StoreTracksOnSave)
+    # endif
+
+    if AnyVehicle_StampRigSchemaOnSave in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(AnyVehicle_StampRigSchemaOnSave)
+    # endif
+
+    for lHandlers, funcHandler in (
+        (bpy.app.handlers.save_pre, animpath.AnyVehicle_ShowVehiclesOnSave),
+        (bpy.app.handlers.save_post, animpath.AnyVehicle_HideVehiclesAfterSave),
+        (bpy.app.handlers.load_pre, animpath.AnyVehicle_ShowVehiclesOnLoad),
+    ):
+        if funcHandler in lHandlers:
+            lHandlers.remove(funcHandler)
+        # endif
+    # endfor
+
+    animpath.ShowHiddenVehicles()
+
+    animpath.CancelBackgroundTrackEval()
+
     bpy.utils.unregister_class(AV_OP_Vehicle_CreateModel_2w)
     bpy.utils.unregister_class(AV_OP_Vehicle_CreateModel_4w)
     bpy.utils.unregister_class(AV_OP_Vehicle_EvalModelPath)
     bpy.utils.unregister_class(AV_OP_Vehicle_EvalAllModelPaths)
+    bpy.utils.unregister_class(AV_OP_Vehicle_EvalModelPathsBackground)
+    bpy.utils.unregister_class(AV_OP_Vehicle_CancelModelPathEval)
+    bpy.utils.unregister_class(AV_OP_Vehicle_BakePoses)
+    bpy.utils.unregister_class(AV_OP_Vehicle_WriteBoxLabels)
+    bpy.utils.unregister_class(AV_OP_Vehicle_WriteBevRasters)
+    bpy.utils.unregister_class(AV_OP_Vehicle_CheckConflicts)
+    bpy.utils.unregister_class(AV_OP_Vehicle_CheckClearance)
     bpy.utils.unregister_class(AV_OP_Vehicle_RemoveModel)
 
+    del bpy.types.Scene.AnyVehiclePrewarmTracks
+    del bpy.types.Scene.AnyVehicleStoreTracks
+    del bpy.types.Scene.AnyVehicleCullEnabled
+    del bpy.types.Scene.AnyVehicleCullDistance
+    del bpy.types.Scene.AnyVehicleCullMargin
+
 
 # enddef
@@ -29,6 +29,9 @@
 import bpy
 import pyjson5 as json
 
+from . import av_index
+
+
 ###########################################################################
 def LoadModelData(self, context):
 
@@ -45,8 +48,11 @@ def LoadModelData(self, context):
         return
     # endif
 
+    # Resolving the rig parts updates the specification with the names of
+    # renamed parts, so it has to be done before the specification is read.
+    dicParts = av_index.GetRigParts(xAbProps.objFAC)
     sData = xAbProps.objFAC.get("AnyVehicle")
-    if sData is None:
+    if dicParts is None or sData is None:
         xAbProps.bLockLoad = False
         return
     # endif
@@ -87,7 +93,7 @@ def LoadModelData(self, context):
 
     for tProp in lProps:
         sName = dicData.get(tProp[1], "")
-        objX = bpy.context.scene.objects.get(sName)
+        objX = dicParts.get(tProp[1])
         if objX is None and sName != "" and sName is not None:
             dicData[tProp[1]] = ""
             bUpdateData = True
@@ -149,6 +155,9 @@ def LoadModelData(self, context):
     xAbProps.iResolution = dicData.get("iResolution", 10)
     xAbProps.fWheelRadius = dicData.get("fWheelRadius", 1.0)
     xAbProps.fTimeOffset = dicData.get("fTimeOffset", 0.0)
+    xAbProps.fLateralOffset = dicData.get("fLateralOffset", 0.0)
+    xAbProps.bHideWhenParked = dicData.get("bHideWhenParked", False)
+    xAbProps.objTerrain = bpy.data.objects.get(dicData.get("sObjTerrain") or "")
     xAbProps.fMeanSpeed = dicData.get("fMeanSpeed", 1.0)
 
     xAbProps.bLockSave = False
@@ -210,6 +219,13 @@ def SaveModelData(self, context):
     dicData["fWheelRadius"] = xAbProps.fWheelRadius
     dicData["fMeanSpeed"] = xAbProps.fMeanSpeed
     dicData["fTimeOffset"] = xAbProps.fTimeOffset
+    dicData["fLateralOffset"] = xAbProps.fLateralOffset
+    dicData["bHideWhenParked"] = xAbProps.bHideWhenParked
+    if xAbProps.objTerrain is not None:
+        dicData["sObjTerrain"] = xAbProps.objTerrain.name
+    else:
+        dicData["sObjTerrain"] = ""
+    # endif
 
     xAbProps.objFAC["AnyVehicle"] = json.dumps(dicData)
     xAbProps.bLockSave = False
@@ -224,6 +240,14 @@ def PollObjectTypeCurve(self, object):
     return object.type == "CURVE" and object.data.splines[0].type == "NURBS"
 
 
+# enddef
+
+
+###########################################################################
+def PollObjectTypeMesh(self, object):
+    return object.type == "MESH"
+
+
 # enddef
 
 ###########################################################################
@@ -360,6 +384,14 @@ class AV_PG_Vehicle_2w(bpy.types.PropertyGroup):
         update=SaveModelData,
     )
 
+    objTerrain: bpy.props.PointerProperty(
+        type=bpy.types.Object,
+        name="Terrain",
+        description="If defined, the vehicle follows the surface of this mesh object.",
+        poll=PollObjectTypeMesh,
+        update=SaveModelData,
+    )
+
     iResolution: bpy.props.IntProperty(
         default=10,
         update=SaveModelData,
@@ -396,6 +428,18 @@ class AV_PG_Vehicle_2w(bpy.types.PropertyGroup):
         description="Time offset in seconds for start of path",
     )
 
+    fLateralOffset: bpy.props.FloatProperty(
+        default=0.0,
+        update=SaveModelData,
+        description="Offset in meters of the vehicle's path to the left of the curve, e.g. to drive in another lane",
+    )
+
+    bHideWhenParked: bpy.props.BoolProperty(
+        default=False,
+        update=SaveModelData,
+        description="Hide the vehicle before it starts and after it reaches the end of its path",
+    )
+
     ##########################################################################
     def clear(self):
         self.bIsValid = False
@@ -415,11 +459,14 @@ class AV_PG_Vehicle_2w(bpy.types.PropertyGroup):
 
         self.objRot = None
         self.objNurbsPath = None
+        self.objTerrain = None
 
         self.iResolution = 10
         self.fWheelRadius = 1.0
         self.fMeanSpeed = 1.0
         self.fTimeOffset = 0.0
+        self.fLateralOffset = 0.0
+        self.bHideWhenParked = False
 
         self.bLockLoad = False
         self.bLockSave = False
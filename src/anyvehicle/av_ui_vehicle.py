@@ -27,10 +27,12 @@
 ###
 
 import bpy
-import pyjson5 as json
 
 import anyblend
 
+from . import av_index
+from .anim import path as animpath
+
 # from . import av_global
 
 
@@ -70,8 +72,7 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
         objSel = bpy.context.active_object
 
         # layout.row().box().label(text="Hello World")
-        yRow = layout.row()
-        yRow.operator("av.vehicle_eval_all_model_paths", icon="FILE_REFRESH")
+        self.draw_track_eval(context)
 
         yRow = layout.row()
         yRow.label(text="Fixed-Axis Center")
@@ -87,8 +88,8 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
 
         sObjFAC = objSel.name
         yBox.label(text="{0}".format(sObjFAC))
-        sModelData = objSel.get("AnyVehicle")
-        if sModelData is None:
+        dicModel = av_index.GetSpec(objSel)
+        if dicModel is None:
             yRow = layout.row()
             yRow.operator("av.vehicle_create_model_4w", icon="PLUS")
             yRow = layout.row()
@@ -98,8 +99,6 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
             return
         # endif
 
-        # Convert model data string to dictionary
-        dicModel = json.loads(sModelData)
         sModelType = dicModel.get("sType")
         if (
             sModelType
@@ -116,6 +115,12 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
         ):
             self.draw_4w(context, objSel)
 
+        elif (
+            sModelType == "/catharsys/blender/animate/vehicle/path/naxle/singletrack/planar:1.0"
+            or sModelType == "/catharsys/blender/animate/vehicle/path/diffdrive/planar:1.0"
+        ):
+            self.draw_spec_model(context, dicModel)
+
         else:
             yRow = layout.row()
             yRow.alert = True
@@ -130,6 +135,54 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
 
     # enddef
 
+    ##########################################################################
+    def draw_track_eval(self, context):
+        layout = self.layout
+
+        if animpath.IsBackgroundTrackEvalRunning():
+            iDone, iTotal = animpath.GetBackgroundTrackEvalProgress()
+            yRow = layout.row()
+            yRow.label(text="Evaluating tracks: {0} / {1}".format(iDone, iTotal), icon="TIME")
+            yRow.operator("av.vehicle_cancel_model_path_eval", icon="CANCEL")
+            for sObj, tStage in sorted(animpath.GetBackgroundTrackEvalStages().items()):
+                yRow = layout.row()
+                yRow.label(text="{0}: {1} {2:.0%}".format(sObj, tStage[0], tStage[1]))
+            # endfor
+            return
+        # endif
+
+        for sObj, sError in sorted(animpath.GetTrackErrors().items()):
+            yRow = layout.row()
+            yRow.label(text="{0}: {1}".format(sObj, sError), icon="ERROR")
+        # endfor
+
+        yRow = layout.row()
+        yRow.operator("av.vehicle_eval_all_model_paths", icon="FILE_REFRESH")
+        yRow = layout.row()
+        xOp = yRow.operator("av.vehicle_eval_model_paths_background", icon="TIME")
+        xOp.bAllVehicles = True
+        yRow = layout.row()
+        yRow.prop(context.scene, "AnyVehiclePrewarmTracks")
+        yRow = layout.row()
+        yRow.prop(context.scene, "AnyVehicleStoreTracks")
+        yRow = layout.row()
+        yRow.prop(context.scene, "AnyVehicleCullEnabled")
+        if context.scene.AnyVehicleCullEnabled:
+            yRow = layout.row()
+            yRow.prop(context.scene, "AnyVehicleCullDistance")
+            yRow.prop(context.scene, "AnyVehicleCullMargin")
+        # endif
+        yRow = layout.row()
+        yRow.operator("av.vehicle_bake_poses", icon="EXPORT")
+        yRow.operator("av.vehicle_write_box_labels", icon="MESH_CUBE")
+        yRow = layout.row()
+        yRow.operator("av.vehicle_write_bev_rasters", icon="TEXTURE")
+        yRow = layout.row()
+        yRow.operator("av.vehicle_check_conflicts", icon="ERROR")
+        yRow.operator("av.vehicle_check_clearance", icon="MOD_PHYSICS")
+
+    # enddef
+
     ##########################################################################
     def draw_2w(self, context, objSel):
         layout = self.layout
@@ -162,6 +215,8 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
         yRow.prop(xAbProps, "objRot", text="Rot")
         yRow = layout.row()
         yRow.prop(xAbProps, "objNurbsPath", text="Path", icon="MOD_CURVE")
+        yRow = layout.row()
+        yRow.prop(xAbProps, "objTerrain", text="Terrain", icon="MESH_GRID")
 
         yRow = layout.row()
         yRow.prop(xAbProps, "iResolution", text="Resolution")
@@ -171,6 +226,10 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
         yRow.prop(xAbProps, "fMeanSpeed", text="Mean Speed")
         yRow = layout.row()
         yRow.prop(xAbProps, "fTimeOffset", text="Time Offset")
+        yRow = layout.row()
+        yRow.prop(xAbProps, "fLateralOffset", text="Lateral Offset")
+        yRow = layout.row()
+        yRow.prop(xAbProps, "bHideWhenParked", text="Hide When Parked")
 
         xAbProps.bIsValid = True
 
@@ -180,6 +239,8 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
 
         yRow = layout.row()
         yRow.operator("av.vehicle_eval_model_path")
+        xOp = yRow.operator("av.vehicle_eval_model_paths_background", text="", icon="TIME")
+        xOp.bAllVehicles = False
 
     # enddef
 
@@ -220,6 +281,8 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
         yRow.prop(xAbProps, "objRot", text="Rot")
         yRow = layout.row()
         yRow.prop(xAbProps, "objNurbsPath", text="Path", icon="MOD_CURVE")
+        yRow = layout.row()
+        yRow.prop(xAbProps, "objTerrain", text="Terrain", icon="MESH_GRID")
 
         yRow = layout.row()
         yRow.prop(xAbProps, "iResolution", text="Resolution")
@@ -229,6 +292,16 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
         yRow.prop(xAbProps, "fMeanSpeed", text="Mean Speed")
         yRow = layout.row()
         yRow.prop(xAbProps, "fTimeOffset", text="Time Offset")
+        yRow = layout.row()
+        yRow.prop(xAbProps, "fLateralOffset", text="Lateral Offset")
+        yRow = layout.row()
+        yRow.prop(xAbProps, "bHideWhenParked", text="Hide When Parked")
+        yRow = layout.row()
+        yRow.prop(xAbProps, "bAckermannSteer", text="Ackermann Steering")
+        if xAbProps.bAckermannSteer:
+            yRow = layout.row()
+            yRow.prop(xAbProps, "fRearSteerCenter", text="Rear Steer Center")
+        # endif
 
         xAbProps.bIsValid = True
 
@@ -238,6 +311,38 @@ class AV_PT_CreateVehicleModel(bpy.types.Panel):
 
         yRow = layout.row()
         yRow.operator("av.vehicle_eval_model_path")
+        xOp = yRow.operator("av.vehicle_eval_model_paths_background", text="", icon="TIME")
+        xOp.bAllVehicles = False
+
+    # enddef
+
+    ##########################################################################
+    # The rig of N-axle and differential drive vehicles is only described
+    # by the animation specification, so it is shown here but not edited.
+    def draw_spec_model(self, context, dicModel):
+        layout = self.layout
+
+        yRow = layout.row()
+        yRow.label(text="Path: {0}".format(dicModel.get("sObjNurbsPath")))
+        for sKey, sLabel in (("lAxles", "Axles"), ("lTrailers", "Trailers")):
+            if sKey in dicModel:
+                yRow = layout.row()
+                yRow.label(text="{0}: {1}".format(sLabel, len(dicModel[sKey])))
+            # endif
+        # endfor
+        for sKey, sLabel in (("sObjTL", "Left Side"), ("sObjTR", "Right Side")):
+            if sKey in dicModel:
+                yRow = layout.row()
+                yRow.label(text="{0}: {1}".format(sLabel, dicModel[sKey]))
+            # endif
+        # endfor
+
+        yRow = layout.row()
+        yRow.operator("av.vehicle_eval_model_path")
+        xOp = yRow.operator("av.vehicle_eval_model_paths_background", text="", icon="TIME")
+        xOp.bAllVehicles = False
+        yRow = layout.row()
+        yRow.operator("av.vehicle_remove_model", icon="CANCEL")
 
     # enddef
 
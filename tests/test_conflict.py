@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_conflict.py
+# Created Date: Monday, October 19th 2026, 10:15:00 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Regression tests of the broad and narrow phase of the conflict detection
+
+import itertools
+import numpy as np
+import pytest
+
+from anyvehicle.anim import conflict
+
+
+###############################################################################
+@pytest.mark.parametrize("iCnt, dCellSize", [(0, 1.0), (1, 1.0), (300, 5.0), (300, 0.5), (50, 100.0)])
+def test_candidate_pairs(iCnt, dCellSize):
+
+    xRandom = np.random.default_rng(iCnt)
+    aPos = xRandom.uniform(-30.0, 30.0, (iCnt, 2))
+    # Footprints at the same position and on cell borders
+    if iCnt > 10:
+        aPos[1] = aPos[0]
+        aPos[2] = np.round(aPos[2] / dCellSize) * dCellSize
+    # endif
+
+    aIdxA, aIdxB = conflict._GetCandidatePairs(aPos, dCellSize)
+    lPairs = [tuple(sorted(x)) for x in zip(aIdxA.tolist(), aIdxB.tolist())]
+
+    # Each pair is returned once, and no footprint is paired with itself
+    assert len(lPairs) == len(set(lPairs))
+    assert all(iA != iB for iA, iB in lPairs)
+
+    # The pairs are exactly those with centers in the same or neighboring cells
+    aCell = np.floor(aPos / dCellSize).astype(np.int64)
+    setExpect = set()
+    for iA, iB in itertools.combinations(range(iCnt), 2):
+        if np.all(np.abs(aCell[iA] - aCell[iB]) <= 1):
+            setExpect.add((iA, iB))
+        # endif
+    # endfor
+    assert set(lPairs) == setExpect
+
+    # In particular, all footprints closer than the cell size are candidates
+    for iA, iB in itertools.combinations(range(iCnt), 2):
+        if np.linalg.norm(aPos[iA] - aPos[iB]) < dCellSize:
+            assert (iA, iB) in setExpect
+        # endif
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+def _GetRectangles(_lRects):
+
+    aPos = np.array([x[0] for x in _lRects], dtype=np.float64)
+    aAngle = np.array([x[1] for x in _lRects], dtype=np.float64)
+    aAxisX = np.stack([np.cos(aAngle), np.sin(aAngle)], axis=1)
+    aAxisY = np.stack([-np.sin(aAngle), np.cos(aAngle)], axis=1)
+    aHalf = np.array([x[2] for x in _lRects], dtype=np.float64)
+
+    return aPos, aAxisX, aAxisY, aHalf
+
+
+# enddef
+
+
+###############################################################################
+def test_overlap():
+
+    lRects = [
+        ((0.0, 0.0), 0.0, (2.0, 1.0)),
+        # Overlaps the first rectangle at its front
+        ((3.5, 0.0), 0.0, (2.0, 1.0)),
+        # Separated from the first rectangle in y
+        ((0.0, 2.5), 0.0, (2.0, 1.0)),
+        # Rotated, with an overlapping bounding box, but separated from
+        # the first rectangle along its own axis
+        ((3.2, 2.2), 0.75 * np.pi, (2.0, 0.3)),
+        # Rotated into the first rectangle
+        ((2.2, 1.6), np.pi / 4.0, (1.0, 0.5)),
+    ]
+    aPos, aAxisX, aAxisY, aHalf = _GetRectangles(lRects)
+    aIdxA = np.zeros(4, dtype=np.int64)
+    aIdxB = np.arange(1, 5)
+
+    aOverlap = conflict._TestOverlap(aPos, aAxisX, aAxisY, aHalf, aIdxA, aIdxB)
+    assert aOverlap.tolist() == [True, False, False, True]
+
+    # The test is symmetric in the rectangles
+    assert conflict._TestOverlap(aPos, aAxisX, aAxisY, aHalf, aIdxB, aIdxA).tolist() == aOverlap.tolist()
+
+
+# enddef
+
+
+###############################################################################
+def test_overlap_matches_sampling():
+
+    # Compares the separating axis test with a test of sample points
+    # inside of the rectangles
+    xRandom = np.random.default_rng(7)
+    iCnt = 200
+    aPos = xRandom.uniform(-4.0, 4.0, (iCnt, 2))
+    aAngle = xRandom.uniform(0.0, np.pi, iCnt)
+    aHalf = xRandom.uniform(0.3, 2.0, (iCnt, 2))
+    aPos, aAxisX, aAxisY, aHalf = _GetRectangles(list(zip(aPos, aAngle, aHalf)))
+
+    aIdxA, aIdxB = np.array(list(itertools.combinations(range(iCnt), 2))).T
+    aOverlap = conflict._TestOverlap(aPos, aAxisX, aAxisY, aHalf, aIdxA, aIdxB)
+
+    aGrid = np.linspace(-1.0, 1.0, 41)
+    aUnit = np.stack(np.meshgrid(aGrid, aGrid), axis=-1).reshape(-1, 2)
+
+    def IsInside(_iRect, _aPnt):
+        aD = _aPnt - aPos[_iRect]
+        return (np.abs(aD @ aAxisX[_iRect]) <= aHalf[_iRect, 0]) & (np.abs(aD @ aAxisY[_iRect]) <= aHalf[_iRect, 1])
+
+    # enddef
+
+    for iA, iB, bOverlap in zip(aIdxA, aIdxB, aOverlap):
+        aPntA = aPos[iA] + (aUnit * aHalf[iA]) @ np.stack([aAxisX[iA], aAxisY[iA]])
+        bSampled = np.any(IsInside(iB, aPntA))
+        # Sampled overlaps are always detected. Detected overlaps may
+        # be missed by the samples, if they are small.
+        if bSampled:
+            assert bOverlap, (iA, iB)
+        # endif
+    # endfor
+
+    assert np.count_nonzero(aOverlap) > 0
+
+
+# enddef
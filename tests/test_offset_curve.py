@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_offset_curve.py
+# Created Date: Monday, October 19th 2026, 10:15:00 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Regression tests of the centerline tables and the offset curves
+
+import numpy as np
+
+from anyvehicle.anim import offset_curve
+
+aUp = np.array([0.0, 0.0, 1.0])
+
+
+###############################################################################
+# A straight segment along the y-axis, followed by a half circle of radius 10
+# about the origin, which turns to the left.
+def _GetCenterline():
+
+    aAngle = np.linspace(0.0, np.pi, 500)
+    aArc = np.stack([10.0 * np.cos(aAngle), 10.0 * np.sin(aAngle), np.zeros_like(aAngle)], axis=1)
+    aLine = np.stack([np.full(100, 10.0), np.linspace(-20.0, -0.2, 100), np.zeros(100)], axis=1)
+
+    return offset_curve.EvalCenterlineTables(np.vstack([aLine, aArc]), aUp)
+
+
+# enddef
+
+
+###############################################################################
+def _CountReversals(_aPos, _aCenter):
+
+    aStep = np.diff(_aPos, axis=0)
+    aTangent = np.diff(_aCenter, axis=0)
+    return int(np.count_nonzero(np.einsum("ij,ij->i", aStep, aTangent) <= 0.0))
+
+
+# enddef
+
+
+###############################################################################
+def test_centerline_tables():
+
+    dicCenterline = _GetCenterline()
+
+    assert dicCenterline["aCurvSigned"][50] == 0.0
+    assert np.allclose(dicCenterline["aNormal"][50], [-1.0, 0.0, 0.0])
+    assert np.allclose(dicCenterline["aCurvSigned"][150:590], 0.1, rtol=1e-3)
+    assert np.allclose(np.linalg.norm(dicCenterline["aNormal"], axis=1), 1.0)
+
+
+# enddef
+
+
+###############################################################################
+def test_offset_curve_keeps_distance():
+
+    dicCenterline = _GetCenterline()
+    aCenter = dicCenterline["aPos"]
+
+    for dOffset, dRadius in ((3.0, 7.0), (-3.0, 13.0)):
+        aPos = offset_curve.EvalOffsetCurve(dicCenterline, dOffset)
+
+        assert np.allclose(np.linalg.norm(aPos - aCenter, axis=1), abs(dOffset))
+        assert np.allclose(np.linalg.norm(aPos[150:590, 0:2], axis=1), dRadius)
+        assert _CountReversals(aPos, aCenter) == 0
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+def test_offset_curve_limits_inner_offset():
+
+    dicCenterline = _GetCenterline()
+    aCenter = dicCenterline["aPos"]
+    dOffset = 12.0
+    aPos = offset_curve.EvalOffsetCurve(dicCenterline, dOffset)
+
+    # The full offset is kept on the straight segment, away from the curve
+    assert np.allclose(aPos[0], [-2.0, -20.0, 0.0])
+
+    # In the curve, the offset is limited to the maximal ratio of the radius
+    dLimit = offset_curve.dMaxOffsetRatio * 10.0
+    aDist = np.linalg.norm(aPos - aCenter, axis=1)
+    assert aDist[150:590].max() <= dLimit + 1e-6
+    assert np.allclose(aDist[200:500], dLimit)
+
+    # The limited offset changes with bounded slope and forms no loops
+    aLen = np.zeros(len(aCenter))
+    np.cumsum(np.linalg.norm(np.diff(aCenter, axis=0), axis=1), out=aLen[1:])
+    aSlope = np.abs(np.diff(aDist)) / np.diff(aLen)
+    assert aSlope.max() <= offset_curve.dMaxOffsetSlope + 1e-6
+    assert _CountReversals(aPos, aCenter) == 0
+
+
+# enddef
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_pose_bake.py
+# Created Date: Monday, October 19th 2026, 10:15:00 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Regression tests of writing and reading pose bake files
+
+import math
+import numpy as np
+import pytest
+
+from anyvehicle.anim import pose_bake
+from anyvehicle.anim.cls_pose_bake import CPoseBake
+
+dFps = 24.0
+tFrames = (1, 250)
+
+
+####################################################################
+# Model with analytic poses, which has a position channel with a large
+# range, a steering angle, a growing spin angle and a jump in one channel,
+# so that the delta coding needs 16 bit deltas.
+class CTestModel:
+
+    lPoseChannels = ["FAC.Pos.x", "Steer", "FAS.Spin", "Jump"]
+
+    def __init__(self, _dScale):
+        self.dScale = _dScale
+
+    # enddef
+
+    def EvalPose(self, dT):
+        return (
+            self.dScale * 100.0 * math.sin(dT),
+            0.3 * math.sin(3.0 * dT),
+            20.0 * self.dScale * dT,
+            0.0 if dT < 5.0 else 50.0,
+        )
+
+    # enddef
+
+
+# endclass
+
+
+###############################################################################
+def _GetPoseError(_aPose, _aExpect):
+
+    aDiff = np.asarray(_aPose) - np.asarray(_aExpect)
+    aDiff[2] = np.remainder(aDiff[2] + math.pi, 2.0 * math.pi) - math.pi
+    return np.abs(aDiff)
+
+
+# enddef
+
+
+###############################################################################
+def _WriteBake(_sFilePath, _sEncoding):
+
+    lVehicles = [("a", CTestModel(1.0)), ("b", CTestModel(7.0))]
+    pose_bake.WritePoseBake(_sFilePath, lVehicles, tFrames, dFps, _sEncoding=_sEncoding, _iChunkSize=16)
+    return CPoseBake(_sFilePath)
+
+
+# enddef
+
+
+###############################################################################
+@pytest.mark.parametrize("sEncoding", pose_bake.lEncodings)
+def test_round_trip(tmp_path, sEncoding):
+
+    xBake = _WriteBake(str(tmp_path / "poses.avpose"), sEncoding)
+
+    for sName, dScale in (("a", 1.0), ("b", 7.0)):
+        assert xBake.HasVehicle(sName)
+        assert xBake.GetChannels(sName) == CTestModel.lPoseChannels
+
+        xModel = CTestModel(dScale)
+        aExpect = np.array([xModel.EvalPose(iFrame / dFps) for iFrame in range(tFrames[0], tFrames[1] + 1)])
+        aRange = aExpect.max(axis=0) - aExpect.min(axis=0)
+
+        if sEncoding == "f32":
+            aTol = 1e-6 * np.abs(aExpect).max(axis=0) + 1e-9
+        else:
+            # Half a quantization step, and pi / 32767 for the spin angle
+            aTol = 0.5 * aRange / 65534.0 + 1e-9
+            aTol[2] = 0.5 * math.pi / 32767.0 + 1e-9
+        # endif
+
+        for iIdx, iFrame in enumerate(range(tFrames[0], tFrames[1] + 1)):
+            aError = _GetPoseError(xBake.GetPose(sName, iFrame), aExpect[iIdx])
+            assert np.all(aError <= aTol), (sName, iFrame, aError)
+        # endfor
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+def test_delta_coding_is_lossless(tmp_path):
+
+    xBakeQ16 = _WriteBake(str(tmp_path / "q16.avpose"), "q16")
+    xBakeQ16d = _WriteBake(str(tmp_path / "q16d.avpose"), "q16d")
+
+    for sName in ("a", "b"):
+        for dFrame in np.arange(tFrames[0], tFrames[1] + 0.25, 0.25):
+            assert xBakeQ16d.GetPose(sName, dFrame) == xBakeQ16.GetPose(sName, dFrame)
+        # endfor
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+@pytest.mark.parametrize("sEncoding", pose_bake.lEncodings)
+def test_interpolation_and_clamping(tmp_path, sEncoding):
+
+    xBake = _WriteBake(str(tmp_path / "poses.avpose"), sEncoding)
+
+    # Fractional frames interpolate the neighboring frames. The wrapped
+    # spin angles of the quantized encodings along the shorter arc.
+    for dFrame in (10.5, 100.25, 249.75):
+        aPose1 = np.array(xBake.GetPose("b", math.floor(dFrame)))
+        aPose2 = np.array(xBake.GetPose("b", math.floor(dFrame) + 1))
+        aPose = np.array(xBake.GetPose("b", dFrame))
+        dFac2 = dFrame - math.floor(dFrame)
+
+        aDelta = aPose2 - aPose1
+        if sEncoding != "f32":
+            aDelta[2] = np.remainder(aDelta[2] + math.pi, 2.0 * math.pi) - math.pi
+        # endif
+        assert np.all(_GetPoseError(aPose, aPose1 + dFac2 * aDelta) < 1e-9)
+    # endfor
+
+    # Frames outside of the range are clamped
+    assert xBake.GetPose("a", tFrames[0] - 10) == xBake.GetPose("a", tFrames[0])
+    assert xBake.GetPose("a", tFrames[1] + 10) == xBake.GetPose("a", tFrames[1])
+
+
+# enddef
+
+
+###############################################################################
+def test_invalid_encoding(tmp_path):
+
+    with pytest.raises(Exception):
+        _WriteBake(str(tmp_path / "poses.avpose"), "f16")
+    # endwith
+
+
+# enddef
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_schedule.py
+# Created Date: Monday, October 19th 2026, 10:15:00 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Regression tests of the vehicle schedules
+
+import numpy as np
+import pytest
+
+from anyvehicle.anim import schedule
+
+
+###############################################################################
+def test_arrival_schedule():
+
+    # Arrivals at 100 m after 10 s and at 300 m after 30 s on a 500 m track
+    aKnotLen, aKnotTime = schedule.SolveArrivalSchedule(500.0, [300.0, 100.0], [30.0, 10.0], 5.0)
+
+    assert np.allclose(aKnotLen, [0.0, 100.0, 300.0, 500.0])
+    assert np.allclose(aKnotTime, [0.0, 10.0, 30.0, 50.0])
+
+    aTime = schedule.GetScheduleTimes(aKnotLen, aKnotTime, [0.0, 50.0, 100.0, 200.0, 300.0, 500.0])
+    assert np.allclose(aTime, [0.0, 5.0, 10.0, 20.0, 30.0, 50.0])
+
+
+# enddef
+
+
+###############################################################################
+def test_arrival_schedule_with_start_time():
+
+    aKnotLen, aKnotTime = schedule.SolveArrivalSchedule(400.0, [100.0, 200.0], [20.0, 40.0], 5.0, dStartTime=15.0)
+
+    assert np.allclose(aKnotLen, [0.0, 100.0, 200.0, 400.0])
+    assert np.allclose(aKnotTime, [15.0, 20.0, 40.0, 80.0])
+
+    with pytest.raises(Exception):
+        schedule.SolveArrivalSchedule(400.0, [100.0, 200.0], [20.0, 40.0], 5.0, dStartTime=20.0)
+    # endwith
+
+
+# enddef
+
+
+###############################################################################
+def test_single_arrival():
+
+    # With a single arrival, the vehicle moves with the given speed
+    aKnotLen, aKnotTime = schedule.SolveArrivalSchedule(100.0, [40.0], [10.0], 4.0)
+
+    assert np.allclose(aKnotLen, [0.0, 40.0, 100.0])
+    assert np.allclose(aKnotTime, [0.0, 10.0, 25.0])
+
+    # Arrivals at the ends of the track need no extrapolation, and positions
+    # beyond the track are clamped to its ends
+    aKnotLen, aKnotTime = schedule.SolveArrivalSchedule(100.0, [-5.0, 120.0], [2.0, 12.0], 4.0)
+
+    assert np.allclose(aKnotLen, [0.0, 100.0])
+    assert np.allclose(aKnotTime, [2.0, 12.0])
+
+
+# enddef
+
+
+###############################################################################
+@pytest.mark.parametrize(
+    "lArcLen, lTime",
+    [
+        ([], []),
+        ([10.0, 20.0], [5.0]),
+        ([10.0, 20.0], [5.0, 5.0]),
+        ([10.0, 20.0], [6.0, 5.0]),
+        ([10.0, 10.0], [5.0, 6.0]),
+    ],
+)
+def test_invalid_arrivals(lArcLen, lTime):
+
+    with pytest.raises(Exception):
+        schedule.SolveArrivalSchedule(100.0, lArcLen, lTime, 5.0)
+    # endwith
+
+
+# enddef
+
+
+###############################################################################
+# Sequential forward and backward pass over the squared speeds, which the
+# accumulated minimum in EvalSpeedProfile() replaces.
+def _EvalSpeedProfileLoop(_aArcLen, _aCurv, _dMaxSpeed, _dMaxLatAcc, _dMaxAcc, _dMaxDec, _dStartSpeed, _dEndSpeed):
+
+    iCnt = len(_aArcLen)
+    aSq = np.empty(iCnt)
+    for i in range(iCnt):
+        aSq[i] = _dMaxSpeed**2
+        if _aCurv[i] != 0.0:
+            aSq[i] = min(aSq[i], _dMaxLatAcc / abs(_aCurv[i]))
+        # endif
+    # endfor
+    aSq[0] = min(aSq[0], _dStartSpeed**2)
+    aSq[-1] = min(aSq[-1], _dEndSpeed**2)
+
+    for i in range(1, iCnt):
+        aSq[i] = min(aSq[i], aSq[i - 1] + 2.0 * _dMaxAcc * (_aArcLen[i] - _aArcLen[i - 1]))
+    # endfor
+    for i in range(iCnt - 2, -1, -1):
+        aSq[i] = min(aSq[i], aSq[i + 1] + 2.0 * _dMaxDec * (_aArcLen[i + 1] - _aArcLen[i]))
+    # endfor
+
+    return np.sqrt(aSq)
+
+
+# enddef
+
+
+###############################################################################
+def test_speed_profile():
+
+    xRandom = np.random.default_rng(3)
+    aArcLen = np.cumsum(xRandom.uniform(0.5, 2.0, 2000))
+    aCurv = 0.05 * np.sin(aArcLen / 40.0) * (xRandom.uniform(size=2000) > 0.3)
+
+    aSpeed = schedule.EvalSpeedProfile(aArcLen, aCurv, 20.0, 3.0, 2.0, 4.0, dStartSpeed=0.0, dEndSpeed=1.0)
+    aExpect = _EvalSpeedProfileLoop(aArcLen, aCurv, 20.0, 3.0, 2.0, 4.0, 0.0, 1.0)
+    assert np.allclose(aSpeed, aExpect, rtol=1e-9, atol=1e-9)
+
+    # The speed meets the limits
+    assert aSpeed[0] == 0.0
+    assert np.isclose(aSpeed[-1], 1.0)
+    assert aSpeed.max() <= 20.0 + 1e-9
+    assert np.all(aSpeed * aSpeed * np.abs(aCurv) <= 3.0 + 1e-9)
+
+    aAcc = np.diff(aSpeed * aSpeed) / (2.0 * np.diff(aArcLen))
+    assert aAcc.max() <= 2.0 + 1e-9
+    assert aAcc.min() >= -4.0 - 1e-9
+
+
+# enddef
+
+
+###############################################################################
+def test_profile_times():
+
+    # Constant speed
+    aArcLen = np.linspace(0.0, 100.0, 11)
+    aTime = schedule.GetProfileTimes(aArcLen, np.full(11, 5.0), 2.0)
+    assert np.allclose(aTime, 2.0 + aArcLen / 5.0)
+
+    # Constant acceleration from standstill, s = a t^2 / 2
+    dAcc = 2.0
+    aSpeed = np.sqrt(2.0 * dAcc * aArcLen)
+    aTime = schedule.GetProfileTimes(aArcLen, aSpeed, 0.0)
+    assert np.allclose(aTime, np.sqrt(2.0 * aArcLen / dAcc))
+
+    # Samples at standstill are passed at the same time
+    aTime = schedule.GetProfileTimes(np.array([0.0, 0.0, 1.0]), np.array([0.0, 0.0, 2.0]), 1.0)
+    assert np.allclose(aTime, [1.0, 1.0, 2.0])
+
+
+# enddef
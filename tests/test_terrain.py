@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_terrain.py
+# Created Date: Monday, October 19th 2026, 10:15:00 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Regression tests of the ground sampling of the terrain-following mode
+
+import numpy as np
+
+from anyvehicle.anim import terrain
+
+aUp = np.array([0.0, 0.0, 1.0])
+
+
+###############################################################################
+# Triangulated height field z = f(x, y) on the square [-_dSize, _dSize]^2,
+# optionally shifted in height.
+def _GetHeightField(_iCnt=40, _dSize=50.0, _dHeight=0.0):
+
+    aX, aY = np.meshgrid(np.linspace(-_dSize, _dSize, _iCnt), np.linspace(-_dSize, _dSize, _iCnt), indexing="ij")
+    aZ = 3.0 * np.sin(aX / 7.0) * np.cos(aY / 5.0) + _dHeight
+    aVex = np.stack([aX.ravel(), aY.ravel(), aZ.ravel()], axis=1)
+
+    aIdx = np.arange(_iCnt * _iCnt).reshape(_iCnt, _iCnt)
+    aA, aB = aIdx[:-1, :-1].ravel(), aIdx[1:, :-1].ravel()
+    aC, aD = aIdx[1:, 1:].ravel(), aIdx[:-1, 1:].ravel()
+    aTri = np.concatenate([np.stack([aA, aB, aC], axis=1), np.stack([aA, aC, aD], axis=1)])
+
+    return aVex, aTri
+
+
+# enddef
+
+
+###############################################################################
+# Distances from the points down to the nearest triangle below them,
+# tested against all triangles.
+def _GetDistanceBruteForce(_aVex, _aTri, _aStart, _dMaxDist):
+
+    aT = _aVex[_aTri]
+    aE1 = aT[:, 1, 0:2] - aT[:, 0, 0:2]
+    aE2 = aT[:, 2, 0:2] - aT[:, 0, 0:2]
+    aDet = aE1[:, 0] * aE2[:, 1] - aE1[:, 1] * aE2[:, 0]
+
+    aDist = np.full(len(_aStart), np.inf)
+    for iPnt, aPnt in enumerate(_aStart):
+        aD = aPnt[0:2] - aT[:, 0, 0:2]
+        aB1 = (aD[:, 0] * aE2[:, 1] - aD[:, 1] * aE2[:, 0]) / aDet
+        aB2 = (aE1[:, 0] * aD[:, 1] - aE1[:, 1] * aD[:, 0]) / aDet
+        aZ = aT[:, 0, 2] + aB1 * (aT[:, 1, 2] - aT[:, 0, 2]) + aB2 * (aT[:, 2, 2] - aT[:, 0, 2])
+        aHit = aPnt[2] - aZ
+        aIsHit = (aB1 >= -1e-9) & (aB2 >= -1e-9) & (aB1 + aB2 <= 1.0 + 1e-9) & (aHit >= 0.0) & (aHit <= _dMaxDist)
+        if np.any(aIsHit):
+            aDist[iPnt] = aHit[aIsHit].min()
+        # endif
+    # endfor
+
+    return aDist
+
+
+# enddef
+
+
+###############################################################################
+def test_ground_distance_matches_brute_force():
+
+    aVex, aTri = _GetHeightField()
+    # A second, elevated layer over part of the field, like a bridge
+    aVexTop, aTriTop = _GetHeightField(_iCnt=10, _dSize=20.0, _dHeight=10.0)
+    aVex = np.concatenate([aVex, aVexTop])
+    aTri = np.concatenate([aTri, aTriTop + len(aVex) - len(aVexTop)])
+
+    xRandom = np.random.default_rng(5)
+    aStart = np.concatenate([xRandom.uniform(-60.0, 60.0, (500, 2)), xRandom.uniform(-5.0, 20.0, (500, 1))], axis=1)
+
+    dicGrid = terrain.CreateGroundGrid(aVex, aTri, aUp)
+    for dMaxDist in (100.0, 4.0):
+        aDist = terrain.SampleGroundDistance(dicGrid, aStart, dMaxDist)
+        aExpect = _GetDistanceBruteForce(aVex, aTri, aStart, dMaxDist)
+
+        assert np.array_equal(np.isfinite(aDist), np.isfinite(aExpect))
+        assert np.allclose(aDist[np.isfinite(aDist)], aExpect[np.isfinite(aExpect)], atol=1e-9)
+    # endfor
+
+    # Points outside of the mesh find no ground
+    aDist = terrain.SampleGroundDistance(dicGrid, [[70.0, 0.0, 10.0], [0.0, -55.0, 10.0]], 100.0)
+    assert np.all(np.isinf(aDist))
+
+
+# enddef
+
+
+###############################################################################
+def test_ground_distance_of_empty_mesh():
+
+    dicGrid = terrain.CreateGroundGrid(np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64), aUp)
+    assert np.all(np.isinf(terrain.SampleGroundDistance(dicGrid, np.zeros((3, 3)), 1.0)))
+
+    # Triangles parallel to the up vector are no ground
+    dicGrid = terrain.CreateGroundGrid(
+        np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 1.0], [1.0, 0.0, 0.0]]), np.array([[0, 1, 2]]), aUp
+    )
+    assert dicGrid["iTriCnt"] == 0
+
+
+# enddef
+
+
+###############################################################################
+def test_ground_lift():
+
+    aVex, aTri = _GetHeightField()
+    tMesh = ("test_ground_lift", aVex, aTri)
+
+    # The curve is scaled by 2 and lifted by 1 in world space
+    mCurve = np.diag([2.0, 2.0, 2.0, 1.0])
+    mCurve[2, 3] = 1.0
+
+    xRandom = np.random.default_rng(9)
+    aContact = np.concatenate([xRandom.uniform(-20.0, 20.0, (300, 2)), np.zeros((300, 1))], axis=1)
+
+    lFractions = []
+    dicLift = terrain.SampleGroundLift(tMesh, mCurve, {"A": aContact}, aUp, funcProgress=lFractions.append)
+
+    aWorld = aContact * 2.0 + np.array([0.0, 0.0, 1.0])
+    aGround = aWorld[:, 2] - _GetDistanceBruteForce(aVex, aTri, aWorld + 50.0 * aUp, 200.0) + 50.0
+    assert np.allclose(dicLift["A"], (aGround - 1.0) / 2.0, atol=1e-9)
+
+    assert lFractions[-1] == 1.0
+    assert all(x <= y for x, y in zip(lFractions[:-1], lFractions[1:]))
+
+    # The grid is cached by the mesh key
+    assert terrain.GetGroundGrid(tMesh, aUp) is terrain.GetGroundGrid(tMesh, aUp)
+
+
+# enddef
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_track.py
+# Created Date: Monday, October 19th 2026, 10:15:00 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Regression tests of the incremental update of the track tables
+
+import numpy as np
+import pytest
+
+from anyvehicle.anim import track
+
+aUp = np.array([0.0, 0.0, 1.0])
+dicWheelOffsets = {"FL": (2.7, 0.8, 0.0), "FR": (2.7, -0.8, 0.0), "SL": (0.0, 0.8, 0.0), "SR": (0.0, -0.8, 0.0)}
+
+
+###############################################################################
+def _GetSnapshot(_aPos, **kwargs):
+
+    dicSnapshot = {"aFAC_Pos": _aPos, "dAxisSep": 2.7, "aUp": aUp, "dicWheelOffsets": dicWheelOffsets}
+    dicSnapshot.update(kwargs)
+    return dicSnapshot
+
+
+# enddef
+
+
+###############################################################################
+def _GetCurve(_iPntCnt=400):
+
+    aT = np.linspace(0.0, 6.0, _iPntCnt)
+    return np.stack([40.0 * np.cos(aT) + 8.0 * aT, 25.0 * np.sin(1.3 * aT), np.zeros_like(aT)], axis=1)
+
+
+# enddef
+
+
+###############################################################################
+def _AssertTracksEqual(_dicTrack, _dicExpect):
+
+    for sKey, xExpect in _dicExpect.items():
+        xValue = _dicTrack[sKey]
+        if isinstance(xExpect, dict):
+            assert set(xValue) == set(xExpect), sKey
+            for sSub in xExpect:
+                assert np.allclose(xValue[sSub], xExpect[sSub], rtol=1e-12, atol=1e-9), (sKey, sSub)
+            # endfor
+        else:
+            assert np.allclose(xValue, xExpect, rtol=1e-12, atol=1e-9), sKey
+        # endif
+    # endfor
+
+
+# enddef
+
+
+###############################################################################
+@pytest.mark.parametrize("iFirst, iLast", [(0, 2), (150, 170), (200, 200), (390, 400)])
+def test_update_matches_full_eval(iFirst, iLast):
+
+    aPos = _GetCurve()
+    dicTrack = track.EvalTrackTables(_GetSnapshot(aPos))
+
+    aEdit = aPos.copy()
+    aEdit[iFirst : iLast + 1] += np.array([0.7, -1.3, 0.2])
+    dicSnapshot = _GetSnapshot(aEdit)
+
+    _AssertTracksEqual(track.UpdateTrackTables(dicTrack, dicSnapshot), track.EvalTrackTables(dicSnapshot))
+
+    # The original tables are not modified
+    assert np.array_equal(dicTrack["aFAC_Pos"], aPos)
+
+
+# enddef
+
+
+###############################################################################
+def test_update_of_unchanged_curve():
+
+    aPos = _GetCurve()
+    dicTrack = track.EvalTrackTables(_GetSnapshot(aPos))
+
+    assert track.UpdateTrackTables(dicTrack, _GetSnapshot(aPos.copy())) is dicTrack
+
+
+# enddef
+
+
+###############################################################################
+def test_update_with_changed_parameters():
+
+    aPos = _GetCurve()
+    dicTrack = track.EvalTrackTables(_GetSnapshot(aPos))
+
+    aEdit = aPos.copy()
+    aEdit[100] += np.array([0.0, 0.5, 0.0])
+    lSnapshots = [
+        _GetSnapshot(aEdit, dAxisSep=3.1),
+        _GetSnapshot(aEdit, dicWheelOffsets={"FL": (2.7, 1.0, 0.0)}),
+        _GetSnapshot(aEdit[:-10]),
+        _GetSnapshot(
+            aEdit,
+            lTrailers=[{"sName": "H1", "aHitchOffset": (-1.0, 0.0, 0.5), "dicWheelOffsets": {"T1L": (-6.0, 1.0, 0.0)}}],
+        ),
+    ]
+
+    for dicSnapshot in lSnapshots:
+        _AssertTracksEqual(track.UpdateTrackTables(dicTrack, dicSnapshot), track.EvalTrackTables(dicSnapshot))
+    # endfor
+
+
+# enddef
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_track_precompute.py
+# Created Date: Monday, October 19th 2026, 10:15:00 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Regression tests of the background evaluation of vehicle tracks
+
+import time
+import numpy as np
+
+from anyvehicle.anim.cls_track_precompute import CTrackPrecompute
+
+
+####################################################################
+# Simulates a worker thread, which appends its last result and stops
+# right after the first call of either IsRunning() or PopResults().
+class CStoppingPrecompute(CTrackPrecompute):
+
+    def __init__(self):
+        super().__init__()
+        self.bAlive = True
+
+    # enddef
+
+    def _Finish(self):
+        if self.bAlive:
+            self.bAlive = False
+            self._lResults.append(("Car", {}))
+        # endif
+
+    # enddef
+
+    def IsRunning(self):
+        bRunning = self.bAlive
+        self._Finish()
+        return bRunning
+
+    # enddef
+
+    def PopResults(self):
+        lResults = super().PopResults()
+        self._Finish()
+        return lResults
+
+    # enddef
+
+
+# endclass
+
+
+###############################################################################
+# Polls the results like the timer function that applies them, until
+# the evaluation is reported as stopped.
+def _PollResults(_xPrecompute):
+
+    lResults = []
+    while True:
+        bRunning, lPopped = _xPrecompute.PopResultsAndState()
+        lResults.extend(lPopped)
+        if not bRunning:
+            return lResults
+        # endif
+    # endwhile
+
+
+# enddef
+
+
+###############################################################################
+def test_results_of_stopping_thread_are_not_lost():
+
+    assert _PollResults(CStoppingPrecompute()) == [("Car", {})]
+
+
+# enddef
+
+
+###############################################################################
+def test_background_evaluation():
+
+    aT = np.linspace(0.0, 3.0, 200)
+    aPos = np.stack([10.0 * np.cos(aT), 10.0 * np.sin(aT), np.zeros_like(aT)], axis=1)
+    dicSnapshot = {"aFAC_Pos": aPos, "dAxisSep": 2.5, "aUp": np.array([0.0, 0.0, 1.0])}
+    lJobs = [("Car{0}".format(i), dicSnapshot) for i in range(8)] + [("Bad", {"aFAC_Pos": aPos[:2]})]
+
+    xPrecompute = CTrackPrecompute()
+    xPrecompute.Start(lJobs, iWorkerCount=3)
+    dicResults = {}
+    while True:
+        bRunning, lPopped = xPrecompute.PopResultsAndState()
+        dicResults.update(lPopped)
+        if not bRunning:
+            break
+        # endif
+        time.sleep(0.001)
+    # endwhile
+
+    assert set(dicResults) == {x[0] for x in lJobs}
+    assert isinstance(dicResults["Bad"], Exception)
+    assert np.allclose(dicResults["Car0"]["aFAC_Pos"], aPos)
+    assert xPrecompute.GetProgress() == (9, 9)
+
+
+# enddef
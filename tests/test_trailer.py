@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_trailer.py
+# Created Date: Monday, October 19th 2026, 10:15:00 am
+# Author: Christian Perwass (CR/AEC5)
+# <LICENSE id="GPL-3.0">
+#
+#   Image-Render Blender Vehicle Animation add-on module
+#   Copyright (C) 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#
+# </LICENSE>
+###
+
+
+# Regression tests of the trailer paths, which compare the tractrix
+# evaluated from prefix products with a stepwise integration
+
+import numpy as np
+import pytest
+
+from anyvehicle.anim import trailer
+
+aE1 = np.array([1.0, 0.0, 0.0])
+aE2 = np.array([0.0, 1.0, 0.0])
+aUp = np.array([0.0, 0.0, 1.0])
+
+
+###############################################################################
+def _GetHitchPath(_iPntCnt, _dEnd=9.0):
+
+    aT = np.linspace(0.0, _dEnd, _iPntCnt)
+    return np.stack([60.0 * np.cos(aT) + 5.0 * aT, 30.0 * np.sin(1.3 * aT), np.zeros_like(aT)], axis=1)
+
+
+# enddef
+
+
+###############################################################################
+# Steps the trailer heading through the segments of the hitch path
+# with the closed form solution of the tractrix along a straight segment.
+def _EvalTractrixSteps(_aHitchPos, _dLength, _dStartAngle):
+
+    lAngle = [_dStartAngle]
+    for aStep in np.diff(_aHitchPos, axis=0):
+        dDelta = np.hypot(aStep[0], aStep[1])
+        if dDelta == 0.0:
+            lAngle.append(lAngle[-1])
+            continue
+        # endif
+
+        dPsi = np.arctan2(aStep[1], aStep[0])
+        dRel = 2.0 * np.arctan(np.tan(0.5 * (lAngle[-1] - dPsi)) * np.exp(-dDelta / _dLength))
+        lAngle.append(dPsi + dRel)
+    # endfor
+
+    return np.array(lAngle)
+
+
+# enddef
+
+
+###############################################################################
+def _GetAngleError(_aHead, _aAngle):
+    return np.abs(np.angle(_aHead * np.exp(-1j * _aAngle)))
+
+
+# enddef
+
+
+###############################################################################
+def test_tractrix_matches_steps():
+
+    aHitchPos = _GetHitchPath(4000)
+    # A hitch that stands still for a few samples
+    aHitchPos = np.insert(aHitchPos, 1000, aHitchPos[1000], axis=0)
+
+    dStartAngle = 0.4
+    aHead = trailer.EvalTractrix(aHitchPos, aE1, aE2, 6.4, np.exp(1j * dStartAngle))
+
+    assert np.allclose(np.abs(aHead), 1.0)
+    assert np.isclose(np.angle(aHead[0]), dStartAngle)
+    assert _GetAngleError(aHead, _EvalTractrixSteps(aHitchPos, 6.4, dStartAngle)).max() < 1e-9
+
+
+# enddef
+
+
+###############################################################################
+def test_tractrix_of_long_track():
+
+    # The normalized prefix products stay accurate over many samples
+    aHitchPos = _GetHitchPath(200000, _dEnd=900.0)
+    aHead = trailer.EvalTractrix(aHitchPos, aE1, aE2, 6.4, 1.0 + 0.0j)
+
+    assert np.all(np.isfinite(aHead))
+    assert _GetAngleError(aHead, _EvalTractrixSteps(aHitchPos, 6.4, 0.0)).max() < 1e-6
+
+
+# enddef
+
+
+###############################################################################
+def test_tractrix_matches_pursuit():
+
+    # Integrates the trailer axle with small steps, in which the axle is
+    # pulled towards the hitch at the drawbar length.
+    aHitchPos = _GetHitchPath(2000)
+    dLength = 6.4
+    aHead = trailer.EvalTractrix(aHitchPos, aE1, aE2, dLength, 1.0 + 0.0j)
+
+    aAxle = aHitchPos[0] - dLength * aE1
+    lAngle = [0.0]
+    for aPos1, aPos2 in zip(aHitchPos[:-1], aHitchPos[1:]):
+        for dFac in np.linspace(0.0, 1.0, 41)[1:]:
+            aDir = aPos1 + dFac * (aPos2 - aPos1) - aAxle
+            aAxle = aAxle + aDir - dLength * aDir / np.linalg.norm(aDir)
+        # endfor
+        aDir = aPos2 - aAxle
+        lAngle.append(np.arctan2(aDir[1], aDir[0]))
+    # endfor
+
+    assert _GetAngleError(aHead, np.array(lAngle)).max() < 1e-3
+
+
+# enddef
+
+
+###############################################################################
+def test_trailer_tables():
+
+    # A vehicle drives straight, then along a quarter circle of radius 20
+    aT = np.linspace(0.0, 0.5 * np.pi, 400)
+    aArc = np.stack([20.0 * np.sin(aT), 20.0 - 20.0 * np.cos(aT), np.zeros_like(aT)], axis=1)
+    aLine = np.stack([np.linspace(-50.0, -0.1, 500), np.zeros(500), np.zeros(500)], axis=1)
+    aP = np.vstack([aLine, aArc])
+    aX = np.gradient(aP, axis=0)
+    aX /= np.linalg.norm(aX, axis=1)[:, np.newaxis]
+    aY = np.cross(aUp, aX)
+
+    lTrailers = [
+        {
+            "sName": "H1",
+            "aHitchOffset": (-1.0, 0.0, 0.5),
+            "dicWheelOffsets": {"L": (-6.0, 1.0, 0.0), "R": (-6.0, -1.0, 0.0)},
+        },
+        {"sName": "H2", "aHitchOffset": (-8.0, 0.0, 0.0), "dicWheelOffsets": {"A": (-5.0, 0.0, 0.0)}},
+    ]
+    dicTables = trailer.EvalTrailerTables(aP, aX, aY, aUp, lTrailers)
+
+    # On the straight segment, the trailers stay aligned with the vehicle
+    for sName in ("H1", "H2"):
+        assert np.abs(dicTables["dicHitchAngle"][sName][:500]).max() < 1e-9
+    # endfor
+
+    # In the left turn, the trailers lag behind, turned to the right
+    assert np.all(dicTables["dicHitchAngle"]["H1"][600:] < 0.0)
+
+    # The hitch of the second trailer is attached to the frame of the first
+    aP1, aX1, aY1 = dicTables["dicFrames"]["H1"]
+    aP2, aX2, aY2 = dicTables["dicFrames"]["H2"]
+    assert np.allclose(aP1, aP - aX + 0.5 * aUp)
+    assert np.allclose(aP2, aP1 - 8.0 * aX1)
+    assert np.allclose(np.einsum("ij,ij->i", aX2, aY2), 0.0)
+
+
+# enddef
+
+
+###############################################################################
+def test_trailer_axles_before_hitch():
+
+    aP = np.stack([np.linspace(0.0, 10.0, 20), np.zeros(20), np.zeros(20)], axis=1)
+    aX = np.tile(aE1, (20, 1))
+    aY = np.tile(aE2, (20, 1))
+    lTrailers = [{"sName": "H1", "aHitchOffset": (-1.0, 0.0, 0.0), "dicWheelOffsets": {"A": (2.0, 0.0, 0.0)}}]
+
+    with pytest.raises(Exception):
+        trailer.EvalTrailerTables(aP, aX, aY, aUp, lTrailers)
+    # endwith
+
+
+# enddef